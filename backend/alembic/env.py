@@ -76,7 +76,14 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # Migrations with autocommit blocks (e.g. concurrent index builds)
+            # commit whatever precedes them, so keep each file in its own
+            # transaction
+            transaction_per_migration=True,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
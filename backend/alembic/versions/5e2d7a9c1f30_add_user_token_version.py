@@ -0,0 +1,27 @@
+"""Add token version to users for stateless token checks
+
+Revision ID: 5e2d7a9c1f30
+Revises: b3f08a6c4e17
+Create Date: 2026-10-17 11:26:03.518342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2d7a9c1f30'
+down_revision = 'b3f08a6c4e17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
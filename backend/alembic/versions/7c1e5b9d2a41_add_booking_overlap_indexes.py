@@ -0,0 +1,77 @@
+"""Add composite indexes for booking overlap and tutor listing queries
+
+Revision ID: 7c1e5b9d2a41
+Revises: 02ce3a95022b
+Create Date: 2026-10-17 09:12:37.418250
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e5b9d2a41'
+down_revision = '02ce3a95022b'
+branch_labels = None
+depends_on = None
+
+ACTIVE_BOOKING_PREDICATE = sa.text("status IN ('CONFIRMED', 'PENDING')")
+
+
+def upgrade() -> None:
+    # Build indexes without blocking writes on Postgres
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_bookings_tutor_active_time',
+            'bookings',
+            ['tutor_id', 'start_time', 'end_time'],
+            unique=False,
+            postgresql_where=ACTIVE_BOOKING_PREDICATE,
+            sqlite_where=ACTIVE_BOOKING_PREDICATE,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_bookings_tutor_start',
+            'bookings',
+            ['tutor_id', 'start_time'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_bookings_student_start',
+            'bookings',
+            ['student_id', 'start_time'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_tutors_verified_rate',
+            'tutors',
+            ['is_verified', 'hourly_rate'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tutors_verified_rate',
+            table_name='tutors',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_bookings_student_start',
+            table_name='bookings',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_bookings_tutor_start',
+            table_name='bookings',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_bookings_tutor_active_time',
+            table_name='bookings',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,77 @@
+"""Add normalized tutor_subjects table for indexed subject search
+
+Revision ID: 9a4c2e7b5d18
+Revises: 5e2d7a9c1f30
+Create Date: 2026-10-17 13:02:44.906115
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4c2e7b5d18'
+down_revision = '5e2d7a9c1f30'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def _subject_keys(subjects_json):
+    """Same normalization as app.models.user.subject_keys, frozen here."""
+    try:
+        subjects = json.loads(subjects_json or '[]')
+    except (ValueError, TypeError):
+        return []
+    if not isinstance(subjects, list):
+        return []
+    keys = (' '.join(str(subject).split()).lower()[:100] for subject in subjects)
+    return list(dict.fromkeys(key for key in keys if key))
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tutor_subjects',
+        sa.Column('tutor_id', sa.UUID(), nullable=False),
+        sa.Column('subject', sa.String(length=100), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['tutor_id'], ['tutors.user_id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('tutor_id', 'subject'),
+    )
+    op.create_index(
+        'ix_tutor_subjects_subject',
+        'tutor_subjects',
+        ['subject', 'tutor_id'],
+        unique=False,
+    )
+
+    # Backfill from the JSON subject lists
+    tutors = sa.table('tutors', sa.column('user_id', sa.UUID()), sa.column('subjects'))
+    tutor_subjects = sa.table(
+        'tutor_subjects',
+        sa.column('tutor_id', sa.UUID()),
+        sa.column('subject', sa.String()),
+    )
+    connection = op.get_bind()
+    rows = []
+    for tutor_id, subjects_json in connection.execute(
+        sa.select(tutors.c.user_id, tutors.c.subjects)
+    ):
+        rows.extend(
+            {'tutor_id': tutor_id, 'subject': key}
+            for key in _subject_keys(subjects_json)
+        )
+        if len(rows) >= BATCH_SIZE:
+            connection.execute(tutor_subjects.insert(), rows)
+            rows = []
+    if rows:
+        connection.execute(tutor_subjects.insert(), rows)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tutor_subjects_subject', table_name='tutor_subjects')
+    op.drop_table('tutor_subjects')
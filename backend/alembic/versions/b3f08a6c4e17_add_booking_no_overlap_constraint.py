@@ -0,0 +1,116 @@
+"""Enforce non-overlapping active bookings per tutor in the database
+
+Revision ID: b3f08a6c4e17
+Revises: 7c1e5b9d2a41
+Create Date: 2026-10-17 10:04:51.226083
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f08a6c4e17'
+down_revision = '7c1e5b9d2a41'
+branch_labels = None
+depends_on = None
+
+# Frozen copies of app.models.user.BOOKING_OVERLAP_CONSTRAINT, the booking
+# buffer and the SQLite triggers, so later model edits cannot change this
+# revision
+CONSTRAINT = 'bookings_no_overlap'
+BUFFER_MINUTES = 15
+ACTIVE = "('CONFIRMED', 'PENDING')"
+
+
+def _sqlite_shifted(moment, minutes):
+    """SQLite expression for ``moment`` plus ``minutes``, in stored format."""
+    return (
+        f"strftime('%Y-%m-%d %H:%M:%f', {moment}, '{minutes:+d} minutes') "
+        "|| '000'"
+    )
+
+
+SQLITE_CHECK = f"""
+    WHEN NEW.status IN {ACTIVE} AND EXISTS (
+        SELECT 1 FROM bookings
+        WHERE bookings.tutor_id = NEW.tutor_id
+          AND bookings.status IN {ACTIVE}
+          AND bookings.start_time < {_sqlite_shifted('NEW.end_time', BUFFER_MINUTES)}
+          AND bookings.end_time > {_sqlite_shifted('NEW.start_time', -BUFFER_MINUTES)}
+          AND bookings.id IS NOT NEW.id
+    )
+    BEGIN
+        SELECT RAISE(ABORT, '{CONSTRAINT}');
+    END
+"""
+SQLITE_TRIGGERS = (
+    f"CREATE TRIGGER {CONSTRAINT}_insert "
+    f"BEFORE INSERT ON bookings {SQLITE_CHECK}",
+    f"CREATE TRIGGER {CONSTRAINT}_update "
+    "BEFORE UPDATE OF tutor_id, start_time, end_time, status ON bookings "
+    f"{SQLITE_CHECK}",
+)
+
+# Pairs of active bookings the new rule would reject. The old
+# check-then-insert path could let them in, and the constraint cannot be
+# added while they exist.
+CONFLICTS = {
+    'postgresql': f"""
+        SELECT a.id, b.id FROM bookings a JOIN bookings b
+          ON b.tutor_id = a.tutor_id AND b.id > a.id
+         AND b.start_time < a.end_time + interval '{BUFFER_MINUTES} minutes'
+         AND a.start_time < b.end_time + interval '{BUFFER_MINUTES} minutes'
+        WHERE a.status IN {ACTIVE} AND b.status IN {ACTIVE}
+        ORDER BY a.id, b.id LIMIT 20
+    """,
+    'sqlite': f"""
+        SELECT a.id, b.id FROM bookings a JOIN bookings b
+          ON b.tutor_id = a.tutor_id AND b.id > a.id
+         AND b.start_time < {_sqlite_shifted('a.end_time', BUFFER_MINUTES)}
+         AND a.start_time < {_sqlite_shifted('b.end_time', BUFFER_MINUTES)}
+        WHERE a.status IN {ACTIVE} AND b.status IN {ACTIVE}
+        ORDER BY a.id, b.id LIMIT 20
+    """,
+}
+
+
+def _check_conflicts(dialect):
+    """Abort if existing active bookings already break the rule."""
+    rows = op.get_bind().execute(sa.text(CONFLICTS[dialect])).all()
+    if rows:
+        pairs = ', '.join(f'{first}/{second}' for first, second in rows)
+        raise RuntimeError(
+            f'Cannot add {CONSTRAINT}: active bookings of the same tutor '
+            f'overlap or are less than {BUFFER_MINUTES} minutes apart '
+            f'(booking IDs {pairs}). Cancel or reschedule one booking of '
+            'each pair, then run the migration again.'
+        )
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        _check_conflicts(dialect)
+        op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        op.execute(
+            f"ALTER TABLE bookings ADD CONSTRAINT {CONSTRAINT} "
+            "EXCLUDE USING gist (tutor_id WITH =, tsrange(start_time, "
+            f"end_time + interval '{BUFFER_MINUTES} minutes') WITH &&) "
+            f"WHERE (status IN {ACTIVE})"
+        )
+    elif dialect == 'sqlite':
+        _check_conflicts(dialect)
+        for trigger in SQLITE_TRIGGERS:
+            op.execute(sa.text(trigger))
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(
+            f'ALTER TABLE bookings DROP CONSTRAINT IF EXISTS {CONSTRAINT}'
+        )
+    elif dialect == 'sqlite':
+        op.execute(f'DROP TRIGGER IF EXISTS {CONSTRAINT}_update')
+        op.execute(f'DROP TRIGGER IF EXISTS {CONSTRAINT}_insert')
@@ -0,0 +1,70 @@
+"""Add full-text search documents for tutors
+
+Revision ID: d6f1b3a8c2e9
+Revises: 9a4c2e7b5d18
+Create Date: 2026-10-17 14:21:09.562871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6f1b3a8c2e9'
+down_revision = '9a4c2e7b5d18'
+branch_labels = None
+depends_on = None
+
+POSTGRES_UPGRADE = (
+    """
+    CREATE TABLE tutor_search_documents (
+        tutor_id UUID PRIMARY KEY REFERENCES tutors (user_id) ON DELETE CASCADE,
+        search_vector TSVECTOR NOT NULL
+    )
+    """,
+    """
+    INSERT INTO tutor_search_documents (tutor_id, search_vector)
+    SELECT t.user_id,
+           setweight(to_tsvector('english'::regconfig,
+                                 coalesce(p.first_name, '') || ' '
+                                 || coalesce(p.last_name, '')), 'A')
+           || setweight(to_tsvector('english'::regconfig,
+                                    coalesce(t.subjects, '')), 'A')
+           || setweight(to_tsvector('english'::regconfig,
+                                    coalesce(p.bio, '')), 'B')
+    FROM tutors t LEFT JOIN user_profiles p ON p.user_id = t.user_id
+    """,
+    "CREATE INDEX ix_tutor_search_documents_vector "
+    "ON tutor_search_documents USING gin (search_vector)",
+)
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE tutor_search_fts "
+    "USING fts5(tutor_id UNINDEXED, name, subjects, bio, "
+    "tokenize = 'porter unicode61')",
+    """
+    INSERT INTO tutor_search_fts (tutor_id, name, subjects, bio)
+    SELECT t.user_id,
+           coalesce(p.first_name, '') || ' ' || coalesce(p.last_name, ''),
+           coalesce(t.subjects, ''),
+           coalesce(p.bio, '')
+    FROM tutors t LEFT JOIN user_profiles p ON p.user_id = t.user_id
+    """,
+    "CREATE TRIGGER tutor_search_fts_delete AFTER DELETE ON tutors "
+    "BEGIN DELETE FROM tutor_search_fts WHERE tutor_id = OLD.user_id; END",
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    statements = {'postgresql': POSTGRES_UPGRADE, 'sqlite': SQLITE_UPGRADE}
+    for statement in statements.get(dialect, ()):
+        op.execute(sa.text(statement))
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute('DROP TABLE tutor_search_documents')
+    elif dialect == 'sqlite':
+        op.execute('DROP TRIGGER tutor_search_fts_delete')
+        op.execute('DROP TABLE tutor_search_fts')
@@ -0,0 +1,36 @@
+"""Add indexes for keyset pagination of users, tutors and bookings
+
+Revision ID: e3a7c5f9b1d4
+Revises: d6f1b3a8c2e9
+Create Date: 2026-10-17 15:08:51.274630
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a7c5f9b1d4'
+down_revision = 'd6f1b3a8c2e9'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_users_created_id', 'users', ['created_at', 'id']),
+    ('ix_tutors_created_user', 'tutors', ['created_at', 'user_id']),
+    ('ix_bookings_start_id', 'bookings', ['start_time', 'id']),
+)
+
+
+def upgrade() -> None:
+    # Build indexes without blocking writes on Postgres
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,49 @@
+"""Add trigram indexes for admin user search
+
+Revision ID: f4c9a2e6b8d1
+Revises: e3a7c5f9b1d4
+Create Date: 2026-10-17 16:42:17.903518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4c9a2e6b8d1'
+down_revision = 'e3a7c5f9b1d4'
+branch_labels = None
+depends_on = None
+
+# SQLite searches by scanning, so only Postgres gets indexes
+INDEXES = (
+    ('ix_users_email_trgm', 'users', 'email gin_trgm_ops'),
+    (
+        'ix_user_profiles_name_trgm',
+        'user_profiles',
+        "(first_name || ' ' || last_name) gin_trgm_ops",
+    ),
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Build indexes without blocking writes
+    with op.get_context().autocommit_block():
+        for name, table, expression in INDEXES:
+            op.execute(
+                sa.text(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                    f'ON {table} USING gin ({expression})'
+                )
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS {name}'))
@@ -4,6 +4,6 @@ API v1 package for TutorFlow backend.
 This package contains version 1 of the API endpoints.
 """
 
-from . import auth, users, bookings
+from . import admin, auth, users, bookings
 
-__all__ = ["auth", "users", "bookings"]
+__all__ = ["admin", "auth", "users", "bookings"]
@@ -0,0 +1,49 @@
+"""
+Admin API endpoints.
+
+This module contains admin-only diagnostics endpoints.
+"""
+
+from dataclasses import asdict
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.auth import get_current_user, require_roles
+from app.core.principals import Principal
+from app.core.query_budget import query_budget
+from app.core.query_stats import ORDER_FIELDS, query_stats
+from app.models.user import UserRole
+from app.schemas.admin import QueryStatsEntry
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/queries", response_model=List[QueryStatsEntry])
+@require_roles([UserRole.ADMIN])
+@query_budget(1)
+async def list_query_stats(
+    limit: int = Query(20, ge=1, le=500, description="Number of queries to return"),
+    order_by: str = Query(
+        "total_seconds",
+        pattern=f"^({'|'.join(ORDER_FIELDS)})$",
+        description="Statistic the queries are ranked by",
+    ),
+    current_user: Principal = Depends(get_current_user),
+) -> List[QueryStatsEntry]:
+    """
+    List the SQL statements that cost the most (admin only).
+
+    Statements are grouped by fingerprint, their SQL with literals and
+    parameters replaced by ``?``, so each entry is one query in the code.
+    Counts cover this process since it started; percentiles cover recent runs.
+
+    Args:
+        limit: Maximum number of fingerprints to return
+        order_by: Statistic to rank by, e.g. ``total_seconds`` or ``p95_seconds``
+        current_user: Current authenticated user (must be admin)
+
+    Returns:
+        List[QueryStatsEntry]: Fingerprint statistics, most expensive first
+    """
+    return [asdict(stats) for stats in query_stats.top(limit, order_by)]
@@ -5,24 +5,34 @@ This module contains all authentication-related endpoints including
 registration, login, logout, and token refresh.
 """
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 
 from app.core.auth import (
     authenticate_user,
     create_access_token,
     create_refresh_token,
+    decode_access_token,
     get_current_user,
-    get_password_hash,
-    verify_password,
+    revoke_token,
+    token_claims,
 )
+from app.core.conditional import ConditionalGet
+from app.core.principals import Principal
+from app.core.query_budget import query_budget
+from app.core.hashing import password_hasher
+from app.core.revocation import revocation_store
 from app.database import get_db
 from app.models.user import User, UserProfile, UserRole
 from app.schemas.auth import (
     LoginRequest,
     LoginResponse,
+    LogoutRequest,
     RegisterRequest,
     RegisterResponse,
     TokenRefreshRequest,
@@ -37,7 +47,7 @@ security = HTTPBearer()
 
 @router.post("/register", response_model=LoginResponse)
 async def register(
-    request: RegisterRequest, db: Session = Depends(get_db)
+    request: RegisterRequest, db: AsyncSession = Depends(get_db)
 ) -> LoginResponse:
     """
     Register a new user.
@@ -53,14 +63,14 @@ async def register(
         HTTPException: If email already exists or validation fails
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == request.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == request.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
     # Create new user
-    hashed_password = get_password_hash(request.password)
+    hashed_password = await password_hasher.hash(request.password)
     user = User(
         email=request.email,
         password_hash=hashed_password,
@@ -68,7 +78,7 @@ async def register(
     )
 
     db.add(user)
-    db.flush()  # Get the user ID without committing
+    await db.flush()  # Get the user ID without committing
 
     # Create user profile
     user_profile = UserProfile(
@@ -78,17 +88,13 @@ async def register(
     )
 
     db.add(user_profile)
-    db.commit()
-    db.refresh(user)
-    db.refresh(user_profile)
+    await db.commit()
+    await db.refresh(user)
+    await db.refresh(user_profile)
 
     # Create tokens for the new user
-    access_token = create_access_token(
-        data={"sub": user.email, "role": user.role.value}
-    )
-    refresh_token = create_refresh_token(
-        data={"sub": user.email, "role": user.role.value}
-    )
+    access_token = create_access_token(data=token_claims(user))
+    refresh_token = create_refresh_token(data=token_claims(user))
 
     return LoginResponse(
         access_token=access_token,
@@ -103,7 +109,10 @@ async def register(
 
 
 @router.post("/login", response_model=LoginResponse)
-async def login(request: LoginRequest, db: Session = Depends(get_db)) -> LoginResponse:
+@query_budget(2)
+async def login(
+    request: LoginRequest, db: AsyncSession = Depends(get_db)
+) -> LoginResponse:
     """
     Authenticate user and return access tokens.
 
@@ -117,7 +126,7 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)) -> LoginRe
     Raises:
         HTTPException: If credentials are invalid
     """
-    user = authenticate_user(db, request.email, request.password)
+    user = await authenticate_user(db, request.email, request.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -125,15 +134,11 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)) -> LoginRe
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = create_access_token(
-        data={"sub": user.email, "role": user.role.value}
-    )
-    refresh_token = create_refresh_token(
-        data={"sub": user.email, "role": user.role.value}
-    )
+    access_token = create_access_token(data=token_claims(user))
+    refresh_token = create_refresh_token(data=token_claims(user))
 
-    # Get user profile for first_name and last_name
-    user_profile = db.query(UserProfile).filter(UserProfile.user_id == user.id).first()
+    # Loaded with the user by authenticate_user
+    user_profile = user.profile
     first_name = user_profile.first_name if user_profile else ""
     last_name = user_profile.last_name if user_profile else ""
 
@@ -151,7 +156,7 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)) -> LoginRe
 
 @router.post("/refresh", response_model=TokenRefreshResponse)
 async def refresh_token(
-    request: TokenRefreshRequest, db: Session = Depends(get_db)
+    request: TokenRefreshRequest, db: AsyncSession = Depends(get_db)
 ) -> TokenRefreshResponse:
     """
     Refresh access token using refresh token.
@@ -182,46 +187,99 @@ async def refresh_token(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+    if "jti" in payload and await revocation_store.is_revoked(payload["jti"]):
+        raise credentials_exception
+
+    # Reload the user so the new token carries the current role and version
+    user = await db.scalar(select(User).where(User.email == email))
+    if user is None or not user.is_active:
+        raise credentials_exception
+    if "ver" in payload and payload["ver"] != (user.token_version or 0):
+        raise credentials_exception
 
-    access_token = create_access_token(data={"sub": email})
+    access_token = create_access_token(data=token_claims(user))
     return TokenRefreshResponse(access_token=access_token, token_type="bearer")
 
 
 @router.post("/logout")
-async def logout(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+async def logout(
+    request: Optional[LogoutRequest] = None,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> dict:
     """
     Logout user (invalidate tokens).
 
+    The access token, and the refresh token if one is sent, are revoked
+    until they expire. Tokens that no longer verify are already unusable and
+    are ignored.
+
     Args:
+        request: Optional logout request carrying the refresh token
         credentials: HTTP Bearer token credentials
 
     Returns:
         dict: Logout confirmation message
     """
-    # In a real implementation, you might want to blacklist the token
-    # For now, we'll just return a success message
+    try:
+        await revoke_token(decode_access_token(credentials.credentials))
+    except JWTError:
+        pass
+    if request is not None and request.refresh_token:
+        try:
+            await revoke_token(
+                jwt.decode(
+                    request.refresh_token,
+                    settings.secret_key,
+                    algorithms=[settings.algorithm],
+                )
+            )
+        except JWTError:
+            pass
     return {"message": "Successfully logged out"}
 
 
 @router.get("/me", response_model=CurrentUserResponse)
+@query_budget(2)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    conditional: ConditionalGet = Depends(),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> CurrentUserResponse:
     """
     Get current user information.
 
+    Supports ``If-None-Match`` and ``If-Modified-Since``; unchanged
+    information is answered with 304 after reading only its versions.
+
     Args:
+        conditional: Conditional request handling
         current_user: Current authenticated user
         db: Database session
 
     Returns:
         CurrentUserResponse: Current user information
+
+    Raises:
+        HTTPException: 304 if the client's copy is current
     """
-    user_profile = (
-        db.query(UserProfile).filter(UserProfile.user_id == current_user.id).first()
+    # User fields come from the principal, whose token version changes with
+    # them; only the profile row is versioned in the database. Its names are
+    # short, so they are read with the version rather than in a second query
+    profile = (
+        await db.execute(
+            select(
+                UserProfile.updated_at, UserProfile.first_name, UserProfile.last_name
+            ).where(UserProfile.user_id == current_user.id)
+        )
+    ).first()
+    conditional.check(
+        f"me:{current_user.id}:{current_user.token_version}:"
+        f"{current_user.role.value}:{current_user.is_active}",
+        profile.updated_at if profile else None,
     )
-    first_name = user_profile.first_name if user_profile else ""
-    last_name = user_profile.last_name if user_profile else ""
+
+    first_name = profile.first_name if profile else ""
+    last_name = profile.last_name if profile else ""
     return CurrentUserResponse(
         id=str(current_user.id),
         email=current_user.email,
@@ -236,7 +294,7 @@ async def get_current_user_info(
 async def create_admin(
     admin_data: dict,
     secret_key: str = Query(..., description="Secret key required to create admin"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> dict:
     """
     Create an admin user (protected by secret key).
@@ -273,7 +331,9 @@ async def create_admin(
             )
 
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == admin_data["email"]).first()
+    existing_user = await db.scalar(
+        select(User).where(User.email == admin_data["email"])
+    )
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -284,14 +344,14 @@ async def create_admin(
     admin_user = User(
         id=str(uuid.uuid4()),
         email=admin_data["email"],
-        password_hash=get_password_hash(admin_data["password"]),
+        password_hash=await password_hasher.hash(admin_data["password"]),
         role=UserRole.ADMIN,
         is_active=True,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow(),
     )
     db.add(admin_user)
-    db.flush()  # Get the user ID
+    await db.flush()  # Get the user ID
 
     # Create user profile
     admin_profile = UserProfile(
@@ -303,7 +363,7 @@ async def create_admin(
     )
     db.add(admin_profile)
 
-    db.commit()
+    await db.commit()
 
     return {
         "message": "Admin user created successfully",
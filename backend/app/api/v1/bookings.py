@@ -7,15 +7,38 @@ booking creation, management, and availability checking.
 
 from typing import List, Optional
 from datetime import datetime, date, time, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
 import json
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.config import settings
 from app.core.auth import get_current_user, require_roles
-from app.database import get_db
-from app.models.user import User, UserRole
-from app.models.user import Booking, BookingStatus
+from app.core.conditional import ConditionalGet
+from app.core.principals import Principal
+from app.core.query_budget import query_budget
+from app.database import get_db, get_read_db, get_session_factory
+from app.models.user import UserRole
+from app.models.user import (
+    Booking,
+    BookingStatus,
+    active_booking_filter,
+    booking_conflict_filter,
+)
 from app.models.user import Tutor
+from app.services.booking_export import (
+    EXPORT_MEDIA_TYPES,
+    booking_export_query,
+    stream_booking_export,
+)
+from app.services.booking_service import BookingConflictError, async_save_booking
+from app.services.slot_engine import (
+    AvailabilityGrid,
+    BOOKING_BUFFER,
+    iter_available_slots,
+)
 from app.schemas.booking import (
     BookingCreate,
     BookingResponse,
@@ -24,17 +47,32 @@ from app.schemas.booking import (
     AvailabilityRequest,
     AvailabilityResponse,
 )
+from app.utils.pagination import NEXT_CURSOR_HEADER, paginate, split_page
+from app.utils.projection import projection, row_dicts
+from app.utils.serialization import ORJSONResponse
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
+# Columns of a booking list item, selected without loading Booking entities
+BOOKING_LIST_FIELDS = {
+    "id": Booking.id,
+    "student_id": Booking.student_id,
+    "tutor_id": Booking.tutor_id,
+    "subject": Booking.subject,
+    "start_time": Booking.start_time,
+    "end_time": Booking.end_time,
+    "status": Booking.status,
+    "created_at": Booking.created_at,
+}
+
 
 @router.post("/", response_model=BookingResponse)
 @router.post("", response_model=BookingResponse)
 @require_roles([UserRole.STUDENT])
 async def create_booking(
     booking_data: BookingCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> BookingResponse:
     """
     Create a new booking.
@@ -51,32 +89,14 @@ async def create_booking(
         HTTPException: If validation fails or conflicts exist
     """
     # Verify tutor exists and is active
-    tutor = db.query(Tutor).filter(Tutor.user_id == booking_data.tutor_id).first()
+    tutor = await db.get(Tutor, booking_data.tutor_id)
 
     if not tutor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Tutor not found or inactive"
         )
 
-    # Check for booking conflicts
-    existing_booking = (
-        db.query(Booking)
-        .filter(
-            Booking.tutor_id == booking_data.tutor_id,
-            Booking.start_time < booking_data.end_time,
-            Booking.end_time > booking_data.start_time,
-            Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
-        )
-        .first()
-    )
-
-    if existing_booking:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Booking time conflicts with existing booking",
-        )
-
-    # Create booking
+    # Insert optimistically; the database rejects overlapping bookings
     booking = Booking(
         student_id=current_user.id,
         tutor_id=booking_data.tutor_id,
@@ -87,9 +107,10 @@ async def create_booking(
         status=BookingStatus.PENDING,
     )
 
-    db.add(booking)
-    db.commit()
-    db.refresh(booking)
+    try:
+        await async_save_booking(db, booking)
+    except BookingConflictError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
 
     return BookingResponse(
         id=booking.id,
@@ -106,35 +127,51 @@ async def create_booking(
 
 @router.get("/", response_model=List[BookingList])
 @router.get("", response_model=List[BookingList])
+@query_budget(2)
 async def list_bookings(
-    status: Optional[BookingStatus] = Query(
-        None, description="Filter by booking status"
+    status_filter: Optional[BookingStatus] = Query(
+        None, alias="status", description="Filter by booking status"
     ),
     start_date: Optional[date] = Query(None, description="Filter by start date"),
     end_date: Optional[date] = Query(None, description="Filter by end date"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> List[BookingList]:
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    skip: Optional[int] = Query(
+        None, ge=0, description="Number of bookings to skip (legacy offset mode)"
+    ),
+    limit: int = Query(100, ge=1, le=1000, description="Number of bookings to return"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """
-    List user's bookings.
+    List user's bookings, latest first.
+
+    Pages are keyed on ``(start_time, id)``; the cursor for the next page is
+    returned in the ``X-Next-Cursor`` header. The projected rows are
+    serialized directly, without a second pass through the response model.
 
     Args:
-        status: Filter by booking status
+        status_filter: Filter by booking status
         start_date: Filter by start date
         end_date: Filter by end date
+        cursor: Cursor returned with the previous page
+        skip: Number of bookings to skip for legacy offset pagination
+        limit: Maximum number of bookings to return
         current_user: Current authenticated user
         db: Database session
 
     Returns:
-        List[BookingList]: List of user's bookings
+        Response: JSON list of the user's bookings
+
+    Raises:
+        HTTPException: If the role may not list bookings or the cursor is invalid
     """
-    query = db.query(Booking)
+    query = projection(BOOKING_LIST_FIELDS, BookingList)
 
     # Filter by user role
     if current_user.role == UserRole.TUTOR:
-        query = query.filter(Booking.tutor_id == current_user.id)
+        query = query.where(Booking.tutor_id == current_user.id)
     elif current_user.role == UserRole.STUDENT:
-        query = query.filter(Booking.student_id == current_user.id)
+        query = query.where(Booking.student_id == current_user.id)
     elif current_user.role == UserRole.ADMIN:
         # Admins can see all bookings
         pass
@@ -144,43 +181,99 @@ async def list_bookings(
         )
 
     # Apply filters
-    if status:
-        query = query.filter(Booking.status == status)
+    if status_filter:
+        query = query.where(Booking.status == status_filter)
 
     if start_date:
-        query = query.filter(Booking.start_time >= start_date)
+        query = query.where(Booking.start_time >= start_date)
 
     if end_date:
-        query = query.filter(Booking.end_time <= end_date)
-
-    bookings = query.order_by(Booking.start_time.desc()).all()
-
-    return [
-        BookingList(
-            id=booking.id,
-            student_id=booking.student_id,
-            tutor_id=booking.tutor_id,
-            subject=booking.subject,
-            start_time=booking.start_time,
-            end_time=booking.end_time,
-            status=booking.status,
-            created_at=booking.created_at,
+        query = query.where(Booking.end_time <= end_date)
+
+    try:
+        query = paginate(
+            query,
+            (Booking.start_time, Booking.id),
+            (datetime, int),
+            limit,
+            cursor=cursor,
+            skip=skip,
+            descending=True,
         )
-        for booking in bookings
-    ]
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    rows, next_cursor = split_page(
+        (await db.execute(query)).all(),
+        limit,
+        lambda row: (row.start_time, row.id),
+    )
+    return ORJSONResponse(
+        row_dicts(rows),
+        headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None,
+    )
+
+
+@router.get("/export")
+@require_roles([UserRole.ADMIN])
+@query_budget(2)
+async def export_bookings(
+    export_format: str = Query(
+        "ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"
+    ),
+    status_filter: Optional[BookingStatus] = Query(
+        None, alias="status", description="Filter by booking status"
+    ),
+    start_date: Optional[date] = Query(None, description="Filter by start date"),
+    end_date: Optional[date] = Query(None, description="Filter by end date"),
+    current_user: Principal = Depends(get_current_user),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+) -> StreamingResponse:
+    """
+    Export all bookings as newline-delimited JSON or CSV (admin only).
+
+    Rows are streamed from a server-side cursor as they are read, so the
+    export runs in constant memory however many bookings there are.
+
+    Args:
+        export_format: Output format, ``ndjson`` or ``csv``
+        status_filter: Filter by booking status
+        start_date: Filter by start date
+        end_date: Filter by end date
+        current_user: Current authenticated user
+        session_factory: Factory of the session the stream reads from
+
+    Returns:
+        StreamingResponse: One booking per line, ordered by booking ID
+    """
+    query = booking_export_query(status_filter, start_date, end_date)
+    return StreamingResponse(
+        stream_booking_export(
+            session_factory, query, export_format, settings.export_batch_size
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="bookings.{export_format}"'
+        },
+    )
 
 
 @router.get("/{booking_id}", response_model=BookingResponse)
+@query_budget(3)
 async def get_booking(
     booking_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    conditional: ConditionalGet = Depends(),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> BookingResponse:
     """
     Get booking details.
 
+    Supports ``If-None-Match`` and ``If-Modified-Since``; an unchanged
+    booking is answered with 304 after reading only its version.
+
     Args:
         booking_id: ID of the booking to retrieve
+        conditional: Conditional request handling
         current_user: Current authenticated user
         db: Database session
 
@@ -188,11 +281,18 @@ async def get_booking(
         BookingResponse: Booking details
 
     Raises:
-        HTTPException: If booking not found or access denied
+        HTTPException: If booking not found or access denied, or 304 if the
+        client's copy is current
     """
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    version = (
+        await db.execute(
+            select(Booking.student_id, Booking.tutor_id, Booking.updated_at).where(
+                Booking.id == booking_id
+            )
+        )
+    ).first()
 
-    if not booking:
+    if not version:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found"
         )
@@ -200,13 +300,16 @@ async def get_booking(
     # Check access permissions
     if (
         current_user.role != UserRole.ADMIN
-        and booking.student_id != current_user.id
-        and booking.tutor_id != current_user.id
+        and version.student_id != current_user.id
+        and version.tutor_id != current_user.id
     ):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
         )
 
+    conditional.check(f"booking:{booking_id}", version.updated_at)
+    booking = await db.get(Booking, booking_id)
+
     return BookingResponse(
         id=booking.id,
         student_id=str(booking.student_id),
@@ -224,8 +327,8 @@ async def get_booking(
 async def update_booking(
     booking_id: int,
     booking_update: BookingUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> BookingResponse:
     """
     Update booking details.
@@ -242,7 +345,7 @@ async def update_booking(
     Raises:
         HTTPException: If booking not found or access denied
     """
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = await db.get(Booking, booking_id)
 
     if not booking:
         raise HTTPException(
@@ -272,8 +375,8 @@ async def update_booking(
             )
         booking.status = booking_update.status
 
-    db.commit()
-    db.refresh(booking)
+    await db.commit()
+    await db.refresh(booking)
 
     return BookingResponse(
         id=booking.id,
@@ -291,8 +394,8 @@ async def update_booking(
 @router.delete("/{booking_id}")
 async def cancel_booking(
     booking_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> dict:
     """
     Cancel a booking.
@@ -308,7 +411,7 @@ async def cancel_booking(
     Raises:
         HTTPException: If booking not found or access denied
     """
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = await db.get(Booking, booking_id)
 
     if not booking:
         raise HTTPException(
@@ -333,21 +436,24 @@ async def cancel_booking(
         )
 
     booking.status = BookingStatus.CANCELLED
-    db.commit()
+    await db.commit()
 
     return {"message": "Booking cancelled successfully"}
 
 
 @router.post("/availability/{tutor_id}", response_model=AvailabilityResponse)
 async def check_availability(
-    tutor_id: int,
+    tutor_id: UUID,
     availability_request: AvailabilityRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> AvailabilityResponse:
     """
     Check tutor availability for a specific time period.
 
+    Active bookings less than the booking buffer before or after the period
+    conflict with it, the same rule the database enforces on booking.
+
     Args:
         tutor_id: ID of the tutor to check
         availability_request: Time period to check
@@ -361,7 +467,7 @@ async def check_availability(
         HTTPException: If tutor not found
     """
     # Verify tutor exists
-    tutor = db.query(Tutor).filter(Tutor.user_id == tutor_id).first()
+    tutor = await db.get(Tutor, tutor_id)
 
     if not tutor:
         raise HTTPException(
@@ -370,20 +476,20 @@ async def check_availability(
 
     # Check for conflicting bookings
     conflicting_bookings = (
-        db.query(Booking)
-        .filter(
-            Booking.tutor_id == tutor_id,
-            Booking.start_time < availability_request.end_time,
-            Booking.end_time > availability_request.start_time,
-            Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
+        await db.scalars(
+            select(Booking).where(
+                Booking.tutor_id == tutor_id,
+                booking_conflict_filter(
+                    availability_request.start_time, availability_request.end_time
+                ),
+            )
         )
-        .all()
-    )
+    ).all()
 
     is_available = len(conflicting_bookings) == 0
 
     return AvailabilityResponse(
-        tutor_id=tutor_id,
+        tutor_id=str(tutor_id),
         start_time=availability_request.start_time,
         end_time=availability_request.end_time,
         is_available=is_available,
@@ -401,14 +507,15 @@ async def check_availability(
 
 @router.get("/slots/{tutor_id}")
 async def get_available_slots(
-    tutor_id: str,
+    tutor_id: UUID,
     date_str: str = Query(..., description="Date in YYYY-MM-DD format"),
     duration: int = Query(30, description="Session duration in minutes (30 or 60)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get available 15-min start slots for a tutor on a given day.
-    Considers tutor's weekly schedule, existing bookings, and 15-min buffer after each session.
+    Considers tutor's weekly schedule, existing bookings, and the 15-min buffer
+    kept between sessions.
 
     Args:
         tutor_id: Tutor's user ID
@@ -430,60 +537,97 @@ async def get_available_slots(
         raise HTTPException(status_code=400, detail="Invalid date format")
 
     # Get tutor and schedule
-    tutor = db.query(Tutor).filter(Tutor.user_id == tutor_id).first()
+    tutor = await db.get(Tutor, tutor_id)
     if not tutor:
         raise HTTPException(status_code=404, detail="Tutor not found")
-    if not tutor.availability_schedule:
-        return {"slots": []}
-    try:
-        schedule = json.loads(tutor.availability_schedule)
-    except Exception:
-        return {"slots": []}
 
-    # Get weekday name (e.g., 'monday')
-    weekday = day_date.strftime("%A").lower()
-    day_blocks = schedule.get(weekday, [])
-    if not day_blocks:
+    grid = AvailabilityGrid(tutor.availability_schedule)
+    if not grid.open_mask(day_date):
         return {"slots": []}
 
-    # Get all bookings for that day
+    # Get all bookings within the buffer of that day, on either side
     day_start = datetime.combine(day_date, time(0, 0))
-    day_end = datetime.combine(day_date, time(23, 59, 59))
-    bookings = (
-        db.query(Booking)
-        .filter(
+    day_end = day_start + timedelta(days=1)
+    bookings = await db.execute(
+        select(Booking.start_time, Booking.end_time).where(
             Booking.tutor_id == tutor_id,
-            Booking.start_time < day_end,
-            Booking.end_time > day_start,
-            Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
+            Booking.start_time < day_end + BOOKING_BUFFER,
+            Booking.end_time > day_start - BOOKING_BUFFER,
+            active_booking_filter(),
         )
-        .all()
     )
-    # Build list of (start, end) for each booking, including 15-min buffer after
-    booking_blocks = []
-    for b in bookings:
-        booking_blocks.append((b.start_time, b.end_time + timedelta(minutes=15)))
-
-    # Generate all possible 15-min start slots within available blocks
-    slots = []
-    for block in day_blocks:
-        block_start = datetime.combine(
-            day_date, datetime.strptime(block[0], "%H:%M").time()
+    for start_time, end_time in bookings:
+        grid.add_booking(start_time, end_time)
+
+    return {"slots": grid.available_slots(day_date, duration)}
+
+
+@router.get("/slots/{tutor_id}/range")
+async def get_available_slots_range(
+    tutor_id: UUID,
+    date_from: date = Query(..., description="First day of the range (YYYY-MM-DD)"),
+    date_to: date = Query(..., description="Last day of the range (YYYY-MM-DD)"),
+    duration: int = Query(30, description="Session duration in minutes (30 or 60)"),
+    db: AsyncSession = Depends(get_read_db),
+) -> StreamingResponse:
+    """
+    Get available 15-min start slots for a tutor on every day of a date range.
+
+    The tutor is loaded once and all active bookings overlapping the range are
+    fetched in a single query. Days are streamed as newline-delimited JSON so
+    the first days can render before the whole range has been computed.
+
+    Args:
+        tutor_id: Tutor's user ID
+        date_from: First day of the range
+        date_to: Last day of the range (inclusive)
+        duration: Session duration in minutes (30 or 60)
+        db: Database session
+
+    Returns:
+        StreamingResponse: One ``{"date": "YYYY-MM-DD", "slots": [...]}``
+        object per line, in date order
+
+    Raises:
+        HTTPException: If the range or duration is invalid or tutor not found
+    """
+    if duration not in [30, 60]:
+        raise HTTPException(status_code=400, detail="Duration must be 30 or 60 minutes")
+
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=400, detail="date_to must not be before date_from"
         )
-        block_end = datetime.combine(
-            day_date, datetime.strptime(block[1], "%H:%M").time()
+
+    if (date_to - date_from).days + 1 > settings.max_slot_range_days:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range cannot exceed {settings.max_slot_range_days} days",
+        )
+
+    tutor = await db.get(Tutor, tutor_id)
+    if not tutor:
+        raise HTTPException(status_code=404, detail="Tutor not found")
+
+    range_start = datetime.combine(date_from, time(0, 0))
+    range_end = datetime.combine(date_to, time(0, 0)) + timedelta(days=1)
+    bookings = (
+        await db.execute(
+            select(Booking.start_time, Booking.end_time)
+            .where(
+                Booking.tutor_id == tutor_id,
+                Booking.start_time < range_end + BOOKING_BUFFER,
+                Booking.end_time > range_start - BOOKING_BUFFER,
+                active_booking_filter(),
+            )
+            .order_by(Booking.start_time)
         )
-        slot = block_start
-        while slot + timedelta(minutes=duration) <= block_end:
-            slot_end = slot + timedelta(minutes=duration)
-            # Check for conflicts with bookings (including buffer)
-            conflict = False
-            for b_start, b_end in booking_blocks:
-                # Block if slot overlaps with any booking+buffer
-                if slot < b_end and slot_end > b_start:
-                    conflict = True
-                    break
-            if not conflict:
-                slots.append(slot.strftime("%H:%M"))
-            slot += timedelta(minutes=15)
-    return {"slots": slots}
+    ).all()
+
+    def generate_days():
+        for day, slots in iter_available_slots(
+            tutor.availability_schedule, bookings, date_from, date_to, duration
+        ):
+            yield json.dumps({"date": day.isoformat(), "slots": slots}) + "\n"
+
+    return StreamingResponse(generate_days(), media_type="application/x-ndjson")
@@ -5,50 +5,142 @@ This module contains all user management endpoints including
 profile management, user listing, and role management.
 """
 
+from datetime import datetime, timedelta
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 import json
 
-from app.core.auth import get_current_user, require_roles
-from app.database import get_db
-from app.models.user import User, UserRole, Tutor, UserProfile as UserProfileModel
+from app.core.auth import (
+    get_current_user,
+    get_current_user_record,
+    commit_principal_change,
+    require_roles,
+)
+from app.core.conditional import ConditionalGet
+from app.core.principals import Principal
+from app.core.query_budget import query_budget
+from app.core.response_cache import CachedResponse, cache_key, response_cache
+from app.database import get_db, get_read_db
+from app.models.user import (
+    User,
+    UserRole,
+    Tutor,
+    UserProfile as UserProfileModel,
+    normalize_subject,
+    tutor_subject_filter,
+)
 from app.schemas.user import UserProfile, UserProfileUpdate, UserList, UserDetail
+from app.services.tutor_search import (
+    TutorSearchService,
+    text_search_query,
+    text_search_total_query,
+)
+from app.services.user_search import user_search_filter
+from app.utils.pagination import NEXT_CURSOR_HEADER, paginate, split_page
+from app.utils.projection import projection, row_dicts
+from app.utils.serialization import ORJSONResponse
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# Response cache tag of every cached tutor list page
+TUTOR_LISTS_TAG = "tutor-lists"
+
+
+def tutor_tag(tutor_id) -> str:
+    """Response cache tag of responses built from one tutor's records."""
+    return f"tutor:{tutor_id}"
+
+
+# Columns of a user list item; users without a profile get empty names
+USER_LIST_FIELDS = {
+    "id": User.id,
+    "email": User.email,
+    "first_name": func.coalesce(UserProfileModel.first_name, ""),
+    "last_name": func.coalesce(UserProfileModel.last_name, ""),
+    "role": User.role,
+    "is_active": User.is_active,
+    "created_at": User.created_at,
+}
+
+# Columns of a tutor list item; the availability schedule is left out
+TUTOR_LIST_FIELDS = {
+    "id": Tutor.user_id,
+    "email": User.email,
+    "first_name": UserProfileModel.first_name,
+    "last_name": UserProfileModel.last_name,
+    "bio": UserProfileModel.bio,
+    "avatar_url": UserProfileModel.avatar_url,
+    "subjects": Tutor.subjects,
+    "hourly_rate": Tutor.hourly_rate,
+    "rating": Tutor.rating,
+    "total_sessions": Tutor.total_sessions,
+    "is_verified": Tutor.is_verified,
+    "created_at": Tutor.created_at,
+}
+
 
 @router.get("/profile", response_model=UserProfile)
+@query_budget(3)
 async def get_user_profile(
-    current_user: User = Depends(get_current_user),
+    conditional: ConditionalGet = Depends(),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> UserProfile:
     """
     Get current user's profile.
 
+    Supports ``If-None-Match`` and ``If-Modified-Since``; an unchanged
+    profile is answered with 304 after reading only its versions.
+
     Args:
+        conditional: Conditional request handling
         current_user: Current authenticated user
+        db: Database session
 
     Returns:
         UserProfile: User profile information
+
+    Raises:
+        HTTPException: 304 if the client's copy is current
     """
+    versions = (
+        await db.execute(
+            select(User.updated_at, UserProfileModel.updated_at)
+            .outerjoin(UserProfileModel, User.id == UserProfileModel.user_id)
+            .where(User.id == current_user.id)
+        )
+    ).one()
+    conditional.check(f"profile:{current_user.id}", *versions)
+
+    user, profile = (
+        await db.execute(
+            select(User, UserProfileModel)
+            .outerjoin(UserProfileModel, User.id == UserProfileModel.user_id)
+            .where(User.id == current_user.id)
+        )
+    ).one()
+
     return UserProfile(
-        id=current_user.id,
-        email=current_user.email,
-        first_name=current_user.first_name,
-        last_name=current_user.last_name,
-        role=current_user.role,
-        is_active=current_user.is_active,
-        created_at=current_user.created_at,
-        updated_at=current_user.updated_at,
+        id=user.id,
+        email=user.email,
+        first_name=profile.first_name if profile else "",
+        last_name=profile.last_name if profile else "",
+        role=user.role,
+        is_active=user.is_active,
+        created_at=user.created_at,
+        updated_at=user.updated_at,
     )
 
 
 @router.put("/profile", response_model=UserProfile)
 async def update_user_profile(
     profile_update: UserProfileUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_record),
+    db: AsyncSession = Depends(get_db),
 ) -> UserProfile:
     """
     Update current user's profile.
@@ -64,20 +156,25 @@ async def update_user_profile(
     Raises:
         HTTPException: If validation fails
     """
-    # Update user fields
+    # Names live on the profile row, which also feeds tutor search
+    profile = await db.get(UserProfileModel, current_user.id)
+    if profile is None:
+        profile = UserProfileModel(user_id=current_user.id, first_name="", last_name="")
+        db.add(profile)
     if profile_update.first_name is not None:
-        current_user.first_name = profile_update.first_name
+        profile.first_name = profile_update.first_name
     if profile_update.last_name is not None:
-        current_user.last_name = profile_update.last_name
+        profile.last_name = profile_update.last_name
 
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await response_cache.invalidate(tutor_tag(current_user.id))
+    await db.refresh(current_user)
 
     return UserProfile(
         id=current_user.id,
         email=current_user.email,
-        first_name=current_user.first_name,
-        last_name=current_user.last_name,
+        first_name=profile.first_name,
+        last_name=profile.last_name,
         role=current_user.role,
         is_active=current_user.is_active,
         created_at=current_user.created_at,
@@ -86,14 +183,20 @@ async def update_user_profile(
 
 
 @router.get("/tutor/profile")
+@query_budget(3)
 async def get_tutor_profile(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    conditional: ConditionalGet = Depends(),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get current tutor's profile information.
 
+    Supports ``If-None-Match`` and ``If-Modified-Since``; an unchanged
+    profile is answered with 304 after reading only its versions.
+
     Args:
+        conditional: Conditional request handling
         current_user: Current authenticated user (must be tutor)
         db: Database session
 
@@ -101,7 +204,8 @@ async def get_tutor_profile(
         dict: Tutor profile information
 
     Raises:
-        HTTPException: If user is not a tutor
+        HTTPException: If user is not a tutor, or 304 if the client's copy
+        is current
     """
     if current_user.role != UserRole.TUTOR:
         raise HTTPException(
@@ -109,19 +213,26 @@ async def get_tutor_profile(
             detail="Only tutors can access tutor profile",
         )
 
-    # Get tutor profile
-    tutor = db.query(Tutor).filter(Tutor.user_id == current_user.id).first()
-    if not tutor:
+    versions = (
+        await db.execute(
+            select(Tutor.updated_at, UserProfileModel.updated_at)
+            .outerjoin(UserProfileModel, Tutor.user_id == UserProfileModel.user_id)
+            .where(Tutor.user_id == current_user.id)
+        )
+    ).first()
+    if not versions:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Tutor profile not found"
         )
+    conditional.check(f"tutor-profile:{current_user.id}", *versions)
 
-    # Get user profile
-    profile = (
-        db.query(UserProfileModel)
-        .filter(UserProfileModel.user_id == current_user.id)
-        .first()
-    )
+    tutor, profile = (
+        await db.execute(
+            select(Tutor, UserProfileModel)
+            .outerjoin(UserProfileModel, Tutor.user_id == UserProfileModel.user_id)
+            .where(Tutor.user_id == current_user.id)
+        )
+    ).one()
 
     return {
         "user_id": current_user.id,
@@ -149,8 +260,8 @@ async def get_tutor_profile(
 @router.post("/tutor/profile")
 async def create_tutor_profile(
     tutor_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Create or update tutor profile.
@@ -189,7 +300,7 @@ async def create_tutor_profile(
         )
 
     # Check if tutor profile already exists
-    existing_tutor = db.query(Tutor).filter(Tutor.user_id == current_user.id).first()
+    existing_tutor = await db.get(Tutor, current_user.id)
 
     if existing_tutor:
         # Update existing profile
@@ -199,8 +310,8 @@ async def create_tutor_profile(
             existing_tutor.availability_schedule = json.dumps(
                 tutor_data["availability_schedule"]
             )
-        db.commit()
-        db.refresh(existing_tutor)
+        await db.commit()
+        await db.refresh(existing_tutor)
         tutor = existing_tutor
     else:
         # Create new profile
@@ -213,8 +324,8 @@ async def create_tutor_profile(
             ),
         )
         db.add(tutor)
-        db.commit()
-        db.refresh(tutor)
+        await db.commit()
+        await db.refresh(tutor)
 
     # Update user profile if provided
     if (
@@ -223,11 +334,7 @@ async def create_tutor_profile(
         or "bio" in tutor_data
         or "phone" in tutor_data
     ):
-        profile = (
-            db.query(UserProfileModel)
-            .filter(UserProfileModel.user_id == current_user.id)
-            .first()
-        )
+        profile = await db.get(UserProfileModel, current_user.id)
 
         if not profile:
             profile = UserProfileModel(
@@ -248,8 +355,11 @@ async def create_tutor_profile(
             if "phone" in tutor_data:
                 profile.phone = tutor_data["phone"]
 
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+        await db.refresh(profile)
+
+    # Subjects and rate decide which list pages the tutor appears on
+    await response_cache.invalidate(tutor_tag(current_user.id), TUTOR_LISTS_TAG)
 
     return {
         "user_id": current_user.id,
@@ -270,94 +380,241 @@ async def create_tutor_profile(
 
 @router.get("/", response_model=List[UserList])
 @require_roles([UserRole.ADMIN])
+@query_budget(2)
 async def list_users(
-    skip: int = Query(0, ge=0, description="Number of users to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    skip: Optional[int] = Query(
+        None, ge=0, description="Number of users to skip (legacy offset mode)"
+    ),
     limit: int = Query(100, ge=1, le=1000, description="Number of users to return"),
     role: Optional[UserRole] = Query(None, description="Filter by user role"),
-    search: Optional[str] = Query(None, description="Search by name or email"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> List[UserList]:
+    search: Optional[str] = Query(
+        None, max_length=100, description="Search by name or email"
+    ),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
     """
-    List all users (admin only).
+    List all users (admin only), oldest account first.
+
+    Pages are keyed on ``(created_at, id)``; the cursor for the next page is
+    returned in the ``X-Next-Cursor`` header. The projected rows are
+    serialized directly, without a second pass through the response model.
 
     Args:
-        skip: Number of users to skip for pagination
+        cursor: Cursor returned with the previous page
+        skip: Number of users to skip for legacy offset pagination
         limit: Maximum number of users to return
         role: Filter by user role
-        search: Search term for name or email
+        search: Fragment or misspelling of a name or email
         current_user: Current authenticated user (must be admin)
         db: Database session
 
     Returns:
-        List[UserList]: List of users
+        Response: JSON list of users
 
     Raises:
-        HTTPException: If user is not admin
+        HTTPException: If user is not admin or the cursor is invalid
     """
-    query = db.query(User)
+    query = projection(USER_LIST_FIELDS, UserList).outerjoin(
+        UserProfileModel, User.id == UserProfileModel.user_id
+    )
 
     # Apply filters
     if role:
-        query = query.filter(User.role == role)
-
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (User.first_name.ilike(search_term))
-            | (User.last_name.ilike(search_term))
-            | (User.email.ilike(search_term))
-        )
-
-    users = query.offset(skip).limit(limit).all()
-
-    return [
-        UserList(
-            id=user.id,
-            email=user.email,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            role=user.role,
-            is_active=user.is_active,
-            created_at=user.created_at,
+        query = query.where(User.role == role)
+
+    if search and search.strip():
+        query = query.where(user_search_filter(db.get_bind().dialect.name, search))
+
+    try:
+        query = paginate(
+            query,
+            (User.created_at, User.id),
+            (datetime, UUID),
+            limit,
+            cursor=cursor,
+            skip=skip,
         )
-        for user in users
-    ]
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    rows, next_cursor = split_page(
+        (await db.execute(query)).all(),
+        limit,
+        lambda row: (row.created_at, row.id),
+    )
+    return ORJSONResponse(
+        row_dicts(rows),
+        headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None,
+    )
 
 
 @router.get("/tutors")
+@query_budget(1)
 async def list_tutors(
-    skip: int = Query(0, ge=0, description="Number of tutors to skip"),
+    request: Request,
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    skip: Optional[int] = Query(
+        None, ge=0, description="Number of tutors to skip (legacy offset mode)"
+    ),
     limit: int = Query(100, ge=1, le=1000, description="Number of tutors to return"),
     subject: str = Query(None, description="Filter by subject"),
+    subject_prefix: bool = Query(
+        False, description="Match subjects starting with ``subject``"
+    ),
     min_rate: float = Query(None, ge=0, description="Minimum hourly rate"),
     max_rate: float = Query(None, ge=0, description="Maximum hourly rate"),
     verified_only: bool = Query(True, description="Show only verified tutors"),
-    db: Session = Depends(get_db),
-):
-    from sqlalchemy import func
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    List tutors, oldest profile first.
+
+    Pages are keyed on ``(created_at, user_id)``; the cursor for the next
+    page is returned in the ``X-Next-Cursor`` header. Pages are served from
+    the response cache until a tutor on them, or the set of tutors matching
+    any list, changes.
+
+    Raises:
+        HTTPException: If the cursor is invalid
+    """
+    key = cache_key(
+        "tutors",
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+        subject=normalize_subject(subject) if subject else None,
+        subject_prefix=subject_prefix if subject else None,
+        min_rate=min_rate,
+        max_rate=max_rate,
+        verified_only=verified_only,
+    )
+    cached = await response_cache.get(key)
+    if cached is not None:
+        return cached.to_response(request)
+    epoch = response_cache.epoch()
 
     query = (
-        db.query(Tutor, User, UserProfileModel)
+        projection(TUTOR_LIST_FIELDS)
+        .select_from(Tutor)
         .join(User, Tutor.user_id == User.id)
         .join(UserProfileModel, User.id == UserProfileModel.user_id)
-        .filter(User.is_active == True)
+        .where(User.is_active == True)
     )
 
     # Filter by verification status if requested
     if verified_only:
-        query = query.filter(Tutor.is_verified == True)
+        query = query.where(Tutor.is_verified == True)
 
     if subject:
-        query = query.filter(func.lower(Tutor.subjects).like(f"%{subject.lower()}%"))
+        query = query.where(tutor_subject_filter(subject, prefix=subject_prefix))
     if min_rate is not None:
-        query = query.filter(Tutor.hourly_rate >= min_rate)
+        query = query.where(Tutor.hourly_rate >= min_rate)
     if max_rate is not None:
-        query = query.filter(Tutor.hourly_rate <= max_rate)
+        query = query.where(Tutor.hourly_rate <= max_rate)
+
+    try:
+        query = paginate(
+            query,
+            (Tutor.created_at, Tutor.user_id),
+            (datetime, UUID),
+            limit,
+            cursor=cursor,
+            skip=skip,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    rows, next_cursor = split_page(
+        (await db.execute(query)).all(),
+        limit,
+        lambda row: (row.created_at, row.id),
+    )
+    tutors = row_dicts(rows)
+
+    entry = CachedResponse.render(
+        tutors,
+        tags=[TUTOR_LISTS_TAG, *(tutor_tag(tutor["id"]) for tutor in tutors)],
+        headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None,
+    )
+    await response_cache.put(key, entry, epoch)
+    return entry.to_response(request)
+
+
+@router.get("/tutors/available")
+@query_budget(1)
+async def search_available_tutors(
+    subject: str = Query(..., min_length=1, description="Subject to be tutored"),
+    start_time: datetime = Query(..., description="Session start time"),
+    duration: int = Query(60, ge=15, le=240, description="Session duration in minutes"),
+    limit: int = Query(20, ge=1, le=100, description="Number of tutors to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    db: AsyncSession = Depends(get_read_db),
+) -> dict:
+    """
+    Find verified tutors for a subject who are free for a session.
+
+    Args:
+        subject: Subject to be tutored
+        start_time: Session start time
+        duration: Session duration in minutes
+        limit: Maximum number of tutors to return
+        cursor: Cursor returned by a previous page
+        db: Database session
+
+    Returns:
+        dict: { tutors: [...], next_cursor: str | None }
+
+    Raises:
+        HTTPException: If the cursor is invalid
+    """
+    end_time = start_time + timedelta(minutes=duration)
+
+    # The batched search is written against a sync Session; run_sync drives
+    # it through the async connection without blocking the event loop
+    def search(session):
+        return TutorSearchService(session).find_available_tutors(
+            subject, start_time, end_time, limit=limit, cursor=cursor
+        )
+
+    try:
+        tutors, next_cursor = await db.run_sync(search)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+    return {"tutors": tutors, "next_cursor": next_cursor}
+
+
+@router.get("/tutors/search")
+@query_budget(2)
+async def search_tutors(
+    q: str = Query(
+        ..., min_length=1, max_length=200, description="Free-text search terms"
+    ),
+    skip: int = Query(0, ge=0, description="Number of tutors to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Number of tutors to return"),
+    db: AsyncSession = Depends(get_read_db),
+) -> dict:
+    """
+    Search tutors by name, subjects and bio, best matches first.
+
+    Args:
+        q: Free-text search terms
+        skip: Number of tutors to skip
+        limit: Maximum number of tutors to return
+        db: Database session
+
+    Returns:
+        dict: { tutors: [...], total: int }
+    """
+    query = text_search_query(db.get_bind().dialect.name, q, limit, skip)
+    if query is None:
+        return {"tutors": [], "total": 0}
 
-    results = query.offset(skip).limit(limit).all()
     tutors = []
-    for tutor, user, profile in results:
+    total = 0
+    for tutor, user, profile, rank, total in await db.execute(query):
         tutors.append(
             {
                 "id": tutor.user_id,
@@ -370,38 +627,52 @@ async def list_tutors(
                 "hourly_rate": tutor.hourly_rate,
                 "rating": tutor.rating,
                 "total_sessions": tutor.total_sessions,
-                "is_verified": tutor.is_verified,
-                "created_at": tutor.created_at,
+                "rank": rank,
             }
         )
-    return tutors
+    # The total comes with the page rows; a page past the end has none
+    if not tutors and skip:
+        total = await db.scalar(text_search_total_query(query))
+    return {"tutors": tutors, "total": total}
 
 
 @router.get("/tutors/{tutor_id}", response_model=dict)
+@query_budget(1)
 async def get_tutor_detail(
-    tutor_id: str,
-    db: Session = Depends(get_db),
-) -> dict:
+    tutor_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+) -> Response:
     """
     Get detailed tutor information.
 
+    Served from the response cache until the tutor's records change.
+
     Args:
         tutor_id: ID of the tutor to retrieve
+        request: Incoming request, checked for ``If-None-Match``
         db: Database session
 
     Returns:
-        dict: Detailed tutor information
+        Response: Detailed tutor information, or 304 if unchanged
 
     Raises:
         HTTPException: If tutor not found
     """
+    key = cache_key("tutor", id=tutor_id)
+    cached = await response_cache.get(key)
+    if cached is not None:
+        return cached.to_response(request)
+    epoch = response_cache.epoch()
+
     result = (
-        db.query(Tutor, User, UserProfileModel)
-        .join(User, Tutor.user_id == User.id)
-        .join(UserProfileModel, User.id == UserProfileModel.user_id)
-        .filter(Tutor.user_id == tutor_id, User.is_active == True)
-        .first()
-    )
+        await db.execute(
+            select(Tutor, User, UserProfileModel)
+            .join(User, Tutor.user_id == User.id)
+            .join(UserProfileModel, User.id == UserProfileModel.user_id)
+            .where(Tutor.user_id == tutor_id, User.is_active == True)
+        )
+    ).first()
 
     if not result:
         raise HTTPException(
@@ -410,7 +681,7 @@ async def get_tutor_detail(
 
     tutor, user, profile = result
 
-    return {
+    detail = {
         "id": tutor.user_id,
         "email": user.email,
         "first_name": profile.first_name,
@@ -427,14 +698,18 @@ async def get_tutor_detail(
         "created_at": tutor.created_at,
         "updated_at": tutor.updated_at,
     }
+    entry = CachedResponse.render(detail, tags=[tutor_tag(tutor.user_id)])
+    await response_cache.put(key, entry, epoch)
+    return entry.to_response(request)
 
 
 @router.get("/{user_id}", response_model=UserDetail)
 @require_roles([UserRole.ADMIN])
+@query_budget(2)
 async def get_user_detail(
-    user_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    user_id: UUID,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> UserDetail:
     """
     Get detailed user information (admin only).
@@ -450,7 +725,9 @@ async def get_user_detail(
     Raises:
         HTTPException: If user not found or current user is not admin
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(
+        select(User).options(joinedload(User.profile)).where(User.id == user_id)
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
@@ -459,8 +736,8 @@ async def get_user_detail(
     return UserDetail(
         id=user.id,
         email=user.email,
-        first_name=user.first_name,
-        last_name=user.last_name,
+        first_name=user.profile.first_name if user.profile else "",
+        last_name=user.profile.last_name if user.profile else "",
         role=user.role,
         is_active=user.is_active,
         created_at=user.created_at,
@@ -471,10 +748,10 @@ async def get_user_detail(
 @router.put("/{user_id}/role")
 @require_roles([UserRole.ADMIN])
 async def update_user_role(
-    user_id: str,
+    user_id: UUID,
     role: UserRole,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> dict:
     """
     Update user role (admin only).
@@ -491,7 +768,7 @@ async def update_user_role(
     Raises:
         HTTPException: If user not found or current user is not admin
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
@@ -505,7 +782,7 @@ async def update_user_role(
         )
 
     user.role = role
-    db.commit()
+    await commit_principal_change(db, user)
 
     return {"message": f"User role updated to {role.value}"}
 
@@ -513,10 +790,10 @@ async def update_user_role(
 @router.put("/{user_id}/status")
 @require_roles([UserRole.ADMIN])
 async def update_user_status(
-    user_id: str,
+    user_id: UUID,
     is_active: bool,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> dict:
     """
     Update user active status (admin only).
@@ -533,7 +810,7 @@ async def update_user_status(
     Raises:
         HTTPException: If user not found or current user is not admin
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
@@ -547,7 +824,8 @@ async def update_user_status(
         )
 
     user.is_active = is_active
-    db.commit()
+    await commit_principal_change(db, user)
+    await response_cache.invalidate(tutor_tag(user.id), TUTOR_LISTS_TAG)
 
     return {
         "message": f"User status updated to {'active' if is_active else 'inactive'}"
@@ -557,10 +835,10 @@ async def update_user_status(
 @router.put("/tutors/{tutor_id}/verify")
 @require_roles([UserRole.ADMIN])
 async def verify_tutor(
-    tutor_id: str,
+    tutor_id: UUID,
     is_verified: bool = True,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> dict:
     """
     Verify or unverify a tutor (admin only).
@@ -577,14 +855,15 @@ async def verify_tutor(
     Raises:
         HTTPException: If tutor not found or current user is not admin
     """
-    tutor = db.query(Tutor).filter(Tutor.user_id == tutor_id).first()
+    tutor = await db.scalar(select(Tutor).where(Tutor.user_id == tutor_id))
     if not tutor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Tutor not found"
         )
 
     tutor.is_verified = is_verified
-    db.commit()
+    await db.commit()
+    await response_cache.invalidate(tutor_tag(tutor.user_id), TUTOR_LISTS_TAG)
 
     return {
         "message": f"Tutor verification status updated to {'verified' if is_verified else 'unverified'}"
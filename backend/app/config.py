@@ -21,6 +21,50 @@ class Settings(BaseSettings):
         description="Database connection URL",
     )
     database_echo: bool = Field(default=False, description="Echo SQL queries")
+    database_pool_size: int = Field(
+        default=5, ge=1, description="Connections each engine keeps open"
+    )
+    database_max_overflow: int = Field(
+        default=10,
+        ge=-1,
+        description="Extra connections opened under load; -1 for no limit",
+    )
+    database_pool_timeout: float = Field(
+        default=30.0,
+        gt=0,
+        description="Seconds to wait for a free connection before failing",
+    )
+    database_pool_recycle: int = Field(
+        default=300,
+        ge=-1,
+        description="Seconds after which a connection is replaced; -1 never",
+    )
+    database_pool_pre_ping: bool = Field(
+        default=True, description="Test connections before handing them out"
+    )
+    database_external_pooler: bool = Field(
+        default=False,
+        description="Open a connection per checkout, for use behind PgBouncer",
+    )
+    database_replica_urls: list[str] = Field(
+        default=[], description="Read replica URLs used by read-only endpoints"
+    )
+    replica_sticky_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        description="Seconds a client's reads stay on the primary after it writes",
+    )
+    replica_failure_cooldown_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        description="Seconds a replica that failed to connect is skipped",
+    )
+    readiness_max_pool_saturation: float = Field(
+        default=1.0,
+        gt=0,
+        le=1,
+        description="Share of pooled connections in use at which /ready fails",
+    )
 
     # Security
     secret_key: str = Field(description="Secret key for JWT tokens")
@@ -31,6 +75,117 @@ class Settings(BaseSettings):
     refresh_token_expire_days: int = Field(
         default=7, description="Refresh token expiration"
     )
+    bcrypt_rounds: int = Field(
+        default=12, ge=4, le=31, description="bcrypt cost factor (log2 rounds)"
+    )
+    password_hash_concurrency: int = Field(
+        default=4, ge=1, description="Maximum concurrent password hash operations"
+    )
+    password_hash_executor: str = Field(
+        default="thread", description="Password hash pool type: thread or process"
+    )
+    principal_cache_ttl_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        description="Seconds an authenticated user is trusted without a DB lookup",
+    )
+    principal_cache_size: int = Field(
+        default=10_000, ge=0, description="Maximum number of cached principals"
+    )
+    token_cache_size: int = Field(
+        default=10_000, ge=0, description="Maximum number of cached decoded tokens"
+    )
+    revocation_backend_url: Optional[str] = Field(
+        default=None,
+        description="Redis URL shared by workers for revoked tokens; "
+        "in-process when unset",
+    )
+    revocation_filter_capacity: int = Field(
+        default=100_000, ge=1, description="Expected number of live revoked tokens"
+    )
+    revocation_filter_error_rate: float = Field(
+        default=0.001,
+        gt=0,
+        lt=1,
+        description="False positive rate of the revoked token prefilter",
+    )
+    revocation_refresh_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        description="Seconds between prefilter rebuilds from the shared store",
+    )
+
+    # Response cache
+    response_cache_backend_url: Optional[str] = Field(
+        default=None,
+        description="Redis URL shared by workers for cached responses; "
+        "in-process when unset",
+    )
+    response_cache_size: int = Field(
+        default=1024, ge=0, description="Maximum number of cached responses"
+    )
+    response_cache_ttl_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        description="Seconds a cached public response is served; 0 disables it",
+    )
+
+    # Compression
+    compression_minimum_size: int = Field(
+        default=1024,
+        ge=0,
+        description="Smallest response body, in bytes, that is compressed",
+    )
+    compression_level: int = Field(
+        default=6, ge=1, le=9, description="gzip compression level"
+    )
+    compression_brotli_quality: int = Field(
+        default=4,
+        ge=0,
+        le=11,
+        description="Brotli quality, used when the brotli package is installed",
+    )
+    compression_content_types: list[str] = Field(
+        default=[
+            "application/json",
+            "application/x-ndjson",
+            "text/csv",
+            "text/html",
+            "text/plain",
+        ],
+        description="Media types of responses that may be compressed",
+    )
+
+    # Metrics
+    metrics_enabled: bool = Field(
+        default=True,
+        description="Record request, database and hashing metrics at /metrics",
+    )
+
+    # Query statistics
+    slow_query_ms: float = Field(
+        default=200,
+        ge=0,
+        description="Statements at least this slow, in ms, are logged; 0 disables",
+    )
+    query_stats_size: int = Field(
+        default=500,
+        ge=0,
+        description="Most query fingerprints with statistics kept; 0 disables",
+    )
+    query_stats_window: int = Field(
+        default=1000,
+        ge=1,
+        description="Recent runs per fingerprint that percentiles are taken from",
+    )
+
+    # Bookings
+    max_slot_range_days: int = Field(
+        default=31, description="Maximum number of days in a slot range query"
+    )
+    export_batch_size: int = Field(
+        default=1000, ge=1, description="Rows fetched per chunk of a booking export"
+    )
 
     # CORS
     allowed_origins: list[str] = Field(
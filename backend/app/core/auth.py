@@ -6,21 +6,25 @@ and authentication decorators.
 """
 
 import functools
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional, List
+from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.config import settings
+from app.core.hashing import password_hasher, pwd_context
+from app.core.principals import Principal, principal_cache
+from app.core.revocation import revocation_store
+from app.core.token_cache import token_cache
 from app.database import get_db
 from app.models.user import User, UserRole
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # JWT token handling
 security = HTTPBearer()
 
@@ -56,6 +60,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     """
     Create a JWT access token.
 
+    Each token gets a unique ``jti`` claim so it can be revoked on logout.
+
     Args:
         data: Data to encode in the token
         expires_delta: Token expiration time
@@ -71,7 +77,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
             minutes=settings.access_token_expire_minutes
         )
 
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(
         to_encode, settings.secret_key, algorithm=settings.algorithm
     )
@@ -95,17 +101,23 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     else:
         expire = datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
 
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(
         to_encode, settings.secret_key, algorithm=settings.algorithm
     )
     return encoded_jwt
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(
+    db: AsyncSession, email: str, password: str
+) -> Optional[User]:
     """
     Authenticate a user with email and password.
 
+    The password is checked in the password hashing pool. If the stored hash
+    was made with an outdated bcrypt cost it is replaced with a fresh one.
+    The user's profile is loaded in the same query.
+
     Args:
         db: Database session
         email: User email
@@ -114,29 +126,114 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     Returns:
         Optional[User]: User object if authentication successful, None otherwise
     """
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(
+        select(User).options(joinedload(User.profile)).where(User.email == email)
+    )
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    verified, new_hash = await password_hasher.verify_and_update(
+        password, user.password_hash
+    )
+    if not verified:
         return None
     if not user.is_active:
         return None
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
     return user
 
 
-def get_current_user(
+def decode_access_token(token: str) -> dict:
+    """
+    Verify a JWT and return its claims, reusing earlier verifications.
+
+    Args:
+        token: Encoded JWT
+
+    Returns:
+        dict: Verified claims; callers must not modify the returned dict
+
+    Raises:
+        JWTError: If the token is invalid or expired
+    """
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        token_cache.put(token, claims)
+    return claims
+
+
+async def revoke_token(claims: dict) -> None:
+    """
+    Revoke a verified token until it expires.
+
+    Tokens issued before ``jti`` claims existed cannot be revoked and are
+    left to expire.
+
+    Args:
+        claims: Verified token claims
+    """
+    jti = claims.get("jti")
+    expires_at = claims.get("exp")
+    if jti is not None and isinstance(expires_at, (int, float)):
+        await revocation_store.revoke(jti, float(expires_at))
+
+
+def token_claims(user: User) -> dict:
+    """
+    Build the identity claims carried by access and refresh tokens.
+
+    Args:
+        user: Authenticated user
+
+    Returns:
+        dict: ``sub`` (email), ``uid``, ``role`` and token version ``ver``
+    """
+    return {
+        "sub": user.email,
+        "uid": str(user.id),
+        "role": user.role.value,
+        "ver": user.token_version or 0,
+    }
+
+
+async def commit_principal_change(db: AsyncSession, user: User) -> None:
+    """
+    Commit a role or status change and revoke the user's outstanding tokens.
+
+    Bumps the token version, so tokens issued before the change are rejected
+    once their principal is reloaded, and drops the locally cached principal
+    after the commit. Workers that still hold the principal stop trusting it
+    within ``principal_cache_ttl_seconds``.
+
+    Args:
+        db: Database session holding the pending change
+        user: User whose role or status changed
+    """
+    user.token_version = (user.token_version or 0) + 1
+    await db.commit()
+    principal_cache.invalidate(user.id)
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
     """
     Get the current authenticated user from JWT token.
 
+    Tokens carrying ``uid`` and ``ver`` are served from the principal cache
+    without touching the database. On a miss the user row is loaded once and
+    the token is rejected if its version is older than the user's. Tokens
+    revoked on logout are rejected by their ``jti``.
+
     Args:
         credentials: HTTP Bearer token credentials
         db: Database session
 
     Returns:
-        User: Current authenticated user
+        Principal: Current authenticated user
 
     Raises:
         HTTPException: If token is invalid or user not found
@@ -148,25 +245,66 @@ def get_current_user(
     )
 
     try:
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.secret_key,
-            algorithms=[settings.algorithm],
-        )
+        payload = decode_access_token(credentials.credentials)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
-    except JWTError:
+        user_id = UUID(payload["uid"]) if "uid" in payload else None
+        version = int(payload.get("ver", 0))
+    except (JWTError, ValueError, TypeError):
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+    jti = payload.get("jti")
+    if jti is not None and await revocation_store.is_revoked(jti):
         raise credentials_exception
-    if not user.is_active:
+
+    principal = principal_cache.get(user_id) if user_id else None
+    # A newer token than the cached principal means this worker missed a change
+    if principal is None or principal.token_version < version:
+        if user_id is not None:
+            user = await db.get(User, user_id)
+        else:
+            # Tokens issued before uid/ver claims existed
+            user = await db.scalar(select(User).where(User.email == email))
+        if user is None:
+            raise credentials_exception
+        principal = Principal.from_user(user)
+        principal_cache.put(principal)
+
+    if user_id is not None and version != principal.token_version:
+        raise credentials_exception
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
         )
 
+    return principal
+
+
+async def get_current_user_record(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """
+    Load the full user row for handlers that read or modify it.
+
+    Args:
+        current_user: Current authenticated principal
+        db: Database session
+
+    Returns:
+        User: Current user attached to ``db``
+
+    Raises:
+        HTTPException: If the user no longer exists
+    """
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
@@ -184,7 +322,7 @@ def require_roles(allowed_roles: List[UserRole]):
     def decorator(func):
         @functools.wraps(func)
         async def wrapper(
-            *args, current_user: User = Depends(get_current_user), **kwargs
+            *args, current_user: Principal = Depends(get_current_user), **kwargs
         ):
             if current_user.role not in allowed_roles:
                 raise HTTPException(
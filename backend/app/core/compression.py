@@ -0,0 +1,284 @@
+"""
+Response compression for TutorFlow backend.
+
+Text responses of the allowed content types are compressed with Brotli,
+when the ``brotli`` package is installed and the client accepts it, or with
+gzip otherwise. Complete bodies below the minimum size are sent as they are.
+Streaming responses such as booking exports are compressed chunk by chunk
+and flushed after every chunk, so clients receive each batch as soon as it
+is produced instead of the middleware buffering the whole export.
+"""
+
+import zlib
+from typing import Iterable, Optional, Sequence
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the installed extras
+    brotli = None
+
+# Chunks at least this large are compressed in a worker thread
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+# Media types compressed unless configured otherwise
+DEFAULT_CONTENT_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/html",
+    "text/plain",
+)
+
+# Responses that never carry a compressible body
+UNCOMPRESSED_STATUSES = {204, 206, 304}
+
+
+class GzipStream:
+    """Incremental gzip encoder."""
+
+    encoding = "gzip"
+
+    def __init__(self, level: int) -> None:
+        """
+        Initialize the encoder.
+
+        Args:
+            level: zlib compression level, 1-9
+        """
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """
+        Compress ``data`` and flush it, finishing the stream if ``final``.
+
+        Args:
+            data: Next chunk of the body
+            final: Whether this is the last chunk
+
+        Returns:
+            bytes: Compressed bytes ready to send
+        """
+        flush = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(flush)
+
+
+class BrotliStream:
+    """Incremental Brotli encoder."""
+
+    encoding = "br"
+
+    def __init__(self, quality: int) -> None:
+        """
+        Initialize the encoder.
+
+        Args:
+            quality: Brotli quality, 0-11
+        """
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """
+        Compress ``data`` and flush it, finishing the stream if ``final``.
+
+        Args:
+            data: Next chunk of the body
+            final: Whether this is the last chunk
+
+        Returns:
+            bytes: Compressed bytes ready to send
+        """
+        compressed = self._compressor.process(data)
+        return compressed + (
+            self._compressor.finish() if final else self._compressor.flush()
+        )
+
+
+def available_encodings() -> tuple:
+    """Return the supported content codings, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """
+    Pick the content coding to use for an ``Accept-Encoding`` header.
+
+    Args:
+        accept_encoding: Raw header value
+        encodings: Supported codings, most preferred first
+
+    Returns:
+        Optional[str]: Chosen coding, or None to send the body unencoded
+    """
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    wildcard = weights.get("*", 0.0)
+    ranked = [
+        (weights.get(encoding, wildcard), -index, encoding)
+        for index, encoding in enumerate(encodings)
+    ]
+    weight, _, encoding = max(ranked, default=(0.0, 0, None))
+    return encoding if weight > 0 else None
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing text responses.
+
+    Example:
+        ```python
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=1024,
+            content_types=["application/json", "application/x-ndjson"],
+        )
+        ```
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        content_types: Iterable[str] = DEFAULT_CONTENT_TYPES,
+    ) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped application
+            minimum_size: Smallest complete body, in bytes, that is compressed
+            gzip_level: zlib compression level, 1-9
+            brotli_quality: Brotli quality, 0-11
+            content_types: Media types that may be compressed
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.content_types = frozenset(
+            content_type.partition(";")[0].strip().lower()
+            for content_type in content_types
+        )
+        self.encodings = available_encodings()
+
+    def stream(self, encoding: str):
+        """Create an encoder for ``encoding``."""
+        if encoding == "br":
+            return BrotliStream(self.brotli_quality)
+        return GzipStream(self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve the request, compressing the response where allowed."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Rewrites the messages of one response."""
+
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: Optional[str], send: Send
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._stream = None
+        self._passthrough = False
+
+    def _compressible(self, message: Message) -> bool:
+        """Whether the response may be compressed at all."""
+        headers = Headers(raw=message["headers"])
+        media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        return (
+            message["status"] not in UNCOMPRESSED_STATUSES
+            and "content-encoding" not in headers
+            and media_type in self.middleware.content_types
+        )
+
+    async def _compress(self, body: bytes, final: bool) -> bytes:
+        """Compress a chunk, off the event loop if it is large."""
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            return await anyio.to_thread.run_sync(self._stream.compress, body, final)
+        return self._stream.compress(body, final)
+
+    def _encode_headers(self, streaming: bool, length: int = 0) -> None:
+        """Mark the held response start as encoded."""
+        headers = MutableHeaders(raw=self._start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        if streaming:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(length)
+        # The encoded body differs byte for byte, so a strong tag would lie
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+    async def send(self, message: Message) -> None:
+        """Handle one message sent by the application."""
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            if not self._compressible(message):
+                self._passthrough = True
+                await self._send(message)
+                return
+            MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            if self.encoding is None:
+                self._passthrough = True
+                await self._send(message)
+                return
+            self._start = message
+            return
+
+        if message["type"] != "http.response.body":
+            if self._start is not None:
+                await self._send(self._start)
+                self._start = None
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._start is not None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self._passthrough = True
+                await self._send(self._start)
+                await self._send(message)
+                return
+            self._stream = self.middleware.stream(self.encoding)
+            body = await self._compress(body, final=not more_body)
+            self._encode_headers(streaming=more_body, length=len(body))
+            await self._send(self._start)
+            self._start = None
+        else:
+            body = await self._compress(body, final=not more_body)
+        await self._send({**message, "body": body})
@@ -0,0 +1,80 @@
+"""
+Conditional GET support for TutorFlow backend.
+
+Every model carries ``updated_at``, which changes on each write. Endpoints
+that clients poll first read only the version columns of the rows behind a
+response, derive a weak ETag and ``Last-Modified`` from them, and answer
+``304 Not Modified`` before the full rows are loaded and serialized when
+the client's copy is still current.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+from app.utils.http_cache import etag_matches, http_date, modified_since, version_etag
+
+# Per-user responses: browsers may keep them but must revalidate
+CACHE_CONTROL = "private, no-cache"
+
+
+class ConditionalGet:
+    """
+    Dependency answering conditional GETs from ``updated_at`` versions.
+
+    Example:
+        ```python
+        @router.get("/bookings/{booking_id}")
+        async def get_booking(booking_id: int, conditional: ConditionalGet = Depends()):
+            updated_at = await db.scalar(select(Booking.updated_at).where(...))
+            conditional.check(f"booking:{booking_id}", updated_at)
+            ...  # only reached when the client's copy is stale
+        ```
+    """
+
+    def __init__(self, request: Request, response: Response) -> None:
+        """
+        Initialize the dependency.
+
+        Args:
+            request: Incoming request, checked for conditional headers
+            response: Outgoing response, given the validators
+        """
+        self.request = request
+        self.response = response
+
+    def check(self, resource: str, *versions: Optional[datetime]) -> None:
+        """
+        Set ``ETag`` and ``Last-Modified``, and stop with 304 if unchanged.
+
+        ``If-None-Match`` takes precedence; ``If-Modified-Since`` is only
+        consulted when it is absent.
+
+        Args:
+            resource: Resource identity, e.g. ``booking:42``
+            versions: ``updated_at`` of every row the response is built from
+
+        Raises:
+            HTTPException: 304 Not Modified if the client's copy is current
+        """
+        headers = {
+            "ETag": version_etag(resource, *versions),
+            "Cache-Control": CACHE_CONTROL,
+        }
+        stamps = [version for version in versions if version is not None]
+        if stamps:
+            headers["Last-Modified"] = http_date(max(stamps))
+        self.response.headers.update(headers)
+
+        if_none_match = self.request.headers.get("if-none-match")
+        if if_none_match is not None:
+            fresh = etag_matches(if_none_match, headers["ETag"])
+        else:
+            fresh = bool(stamps) and not modified_since(
+                self.request.headers.get("if-modified-since"), max(stamps)
+            )
+        if fresh:
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
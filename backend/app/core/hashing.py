@@ -0,0 +1,182 @@
+"""
+Password hashing pool for TutorFlow backend.
+
+bcrypt is deliberately slow, so hashing and verification run in a bounded
+thread or process pool instead of on the event loop. A semaphore caps how
+many calls are in flight; callers beyond the cap wait in a queue whose depth
+is tracked for monitoring.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.config import settings
+from app.core.metrics import PASSWORD_HASH_DURATION
+
+# Password hashing; hashes made with a different cost are replaced on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds
+)
+
+
+def hash_password(password: str) -> str:
+    """Hash ``password`` with the configured bcrypt cost."""
+    return pwd_context.hash(password)
+
+
+def verify_and_update_password(
+    password: str, password_hash: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify ``password`` and rehash it if ``password_hash`` is outdated.
+
+    Args:
+        password: Plain text password
+        password_hash: Stored hash
+
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the password matches, and a new
+        hash to store when the stored one uses an outdated cost
+    """
+    return pwd_context.verify_and_update(password, password_hash)
+
+
+@dataclass(frozen=True)
+class PasswordHasherStats:
+    """Snapshot of password pool activity."""
+
+    max_concurrency: int
+    in_flight: int
+    queued: int
+    max_queued: int
+    completed: int
+    total_wait_seconds: float
+
+
+class PasswordHasher:
+    """Runs bcrypt calls in a bounded worker pool."""
+
+    def __init__(self, max_concurrency: int, executor: str = "thread") -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            max_concurrency: Maximum number of hashes computed at once
+            executor: ``"thread"`` or ``"process"``
+
+        Raises:
+            ValueError: If the executor kind or concurrency is invalid
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {executor}")
+        if max_concurrency < 1:
+            raise ValueError("Password hash concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.executor_kind = executor
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight = 0
+        self._queued = 0
+        self._max_queued = 0
+        self._completed = 0
+        self._total_wait = 0.0
+
+    def _get_executor(self) -> Executor:
+        """Create the worker pool on first use."""
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(self.max_concurrency)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.max_concurrency, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency limiter for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run(self, operation: str, func, *args):
+        """Run ``func`` in the pool once a concurrency slot is free."""
+        semaphore = self._get_semaphore()
+        self._queued += 1
+        self._max_queued = max(self._max_queued, self._queued)
+        queued_at = time.perf_counter()
+        try:
+            await semaphore.acquire()
+        finally:
+            self._queued -= 1
+        self._total_wait += time.perf_counter() - queued_at
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            PASSWORD_HASH_DURATION.labels(operation).observe(
+                time.perf_counter() - started
+            )
+            self._in_flight -= 1
+            self._completed += 1
+            semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password off the event loop.
+
+        Args:
+            password: Plain text password
+
+        Returns:
+            str: Hashed password
+        """
+        return await self._run("hash", hash_password, password)
+
+    async def verify_and_update(
+        self, password: str, password_hash: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password off the event loop; see ``verify_and_update_password``.
+
+        Args:
+            password: Plain text password
+            password_hash: Stored hash
+
+        Returns:
+            Tuple[bool, Optional[str]]: Match result and optional new hash
+        """
+        return await self._run(
+            "verify", verify_and_update_password, password, password_hash
+        )
+
+    def stats(self) -> PasswordHasherStats:
+        """Return a snapshot of pool activity."""
+        return PasswordHasherStats(
+            max_concurrency=self.max_concurrency,
+            in_flight=self._in_flight,
+            queued=self._queued,
+            max_queued=self._max_queued,
+            completed=self._completed,
+            total_wait_seconds=self._total_wait,
+        )
+
+    def shutdown(self) -> None:
+        """Stop the worker pool; it is recreated on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    settings.password_hash_concurrency, settings.password_hash_executor
+)
@@ -0,0 +1,543 @@
+"""
+Performance metrics for TutorFlow backend.
+
+A small in-process metrics registry exposed at ``/metrics`` in the
+Prometheus text format. ``MetricsMiddleware`` records the latency of every
+request by route template, the number of requests in flight, and how many
+SQL statements each request ran and how long they took; the statement
+timings come from cursor events on the engines in ``app.database``.
+Password hashing and JSON serialization record their own durations, and the
+stats of the token, revocation and response caches and of the password
+pool are read when the endpoint is scraped.
+
+Recording a value is a dictionary lookup and an uncontended lock, so the
+instrumentation stays on in production.
+"""
+
+import dataclasses
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bucket upper bounds, in seconds, for request and statement latencies
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Bucket upper bounds, in seconds, for encoding one response body
+SERIALIZATION_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+)
+
+# Bucket upper bounds for the number of statements one request runs
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Route label of requests that matched no route, e.g. 404s and rejected hosts
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value or bucket bound."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    """Format a label set as ``{name="value",...}``, or nothing if empty."""
+    pairs = ",".join(f'{n}="{_escape_label(v)}"' for n, v in zip(names, values))
+    return f"{{{pairs}}}" if pairs else ""
+
+
+def _header(name: str, kind: str, documentation: str) -> List[str]:
+    """The ``HELP`` and ``TYPE`` lines of a metric family."""
+    documentation = documentation.replace("\\", r"\\").replace("\n", r"\n")
+    return [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+
+
+class _Value:
+    """A single counter or gauge value."""
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add ``amount`` to the value."""
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Subtract ``amount`` from the value."""
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        """Replace the value."""
+        with self._lock:
+            self.value = float(value)
+
+
+class _HistogramValue:
+    """Bucket counts, sum and count of one histogram label set."""
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self._bounds = bounds
+        # One count per bound plus the +Inf bucket, not cumulative
+        self._counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def cumulative_counts(self) -> List[int]:
+        """Counts of observations at or below each bound, ending with +Inf."""
+        with self._lock:
+            counts = list(self._counts)
+        running = 0
+        for index, count in enumerate(counts):
+            running += count
+            counts[index] = running
+        return counts
+
+
+class _Metric:
+    """A metric family with a child value per label set."""
+
+    kind = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()
+    ) -> None:
+        """
+        Initialize the metric.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every sample carries
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> Any:
+        """
+        Return the child holding the value for one label set.
+
+        Args:
+            *values: Label values, in the order of ``labelnames``
+
+        Returns:
+            The child, created on first use
+
+        Raises:
+            ValueError: If the number of values does not match the labels
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {values}"
+                )
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _items(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def render(self) -> List[str]:
+        """Return the metric's lines in the text format."""
+        lines = _header(self.name, self.kind, self.documentation)
+        for values, child in self._items():
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}{labels} {_format_value(child.value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """A value that only goes up; the name should end in ``_total``."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add ``amount`` to the counter without labels."""
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    """A value that goes up and down."""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add ``amount`` to the gauge without labels."""
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Subtract ``amount`` from the gauge without labels."""
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        """Set the gauge without labels."""
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    """Observations counted into buckets by upper bound."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """
+        Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every sample carries
+            buckets: Increasing bucket upper bounds; +Inf is added
+
+        Raises:
+            ValueError: If the bounds are not increasing
+        """
+        if list(buckets) != sorted(set(buckets)):
+            raise ValueError(f"{name} buckets must be increasing")
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(float(bound) for bound in buckets)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record an observation without labels."""
+        self.labels().observe(value)
+
+    def render(self) -> List[str]:
+        """Return the histogram's lines in the text format."""
+        lines = _header(self.name, self.kind, self.documentation)
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for values, child in self._items():
+            counts = child.cumulative_counts()
+            for bound, count in zip(bounds, counts):
+                labels = _format_labels(self.labelnames + ("le",), values + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {counts[-1]}")
+        return lines
+
+
+class StatsCollector:
+    """Exports the numeric fields of a component's stats snapshot."""
+
+    def __init__(
+        self,
+        prefix: str,
+        documentation: str,
+        snapshot: Callable[[], Any],
+        counters: Iterable[str] = (),
+    ) -> None:
+        """
+        Initialize the collector.
+
+        Args:
+            prefix: Name prefix; each field becomes ``<prefix>_<field>``
+            documentation: Help text describing the component
+            snapshot: Returns a dataclass of current stats
+            counters: Fields that only go up, exported as ``_total`` counters
+        """
+        self.prefix = prefix
+        self.documentation = documentation
+        self.snapshot = snapshot
+        self.counters = frozenset(counters)
+
+    def render(self) -> List[str]:
+        """Take a snapshot and return it in the text format."""
+        stats = self.snapshot()
+        lines: List[str] = []
+        for field in dataclasses.fields(stats):
+            value = getattr(stats, field.name)
+            name = f"{self.prefix}_{field.name}"
+            kind = "gauge"
+            if field.name in self.counters:
+                name, kind = f"{name}_total", "counter"
+            label = field.name.replace("_", " ")
+            lines.extend(_header(name, kind, f"{self.documentation}: {label}"))
+            lines.append(f"{name} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """The metrics and collectors rendered at ``/metrics``."""
+
+    def __init__(self) -> None:
+        self._collectors: List[Any] = []
+        self._names: set = set()
+        self._lock = threading.Lock()
+
+    def register(self, collector: Any) -> Any:
+        """
+        Add a metric or ``StatsCollector``.
+
+        Args:
+            collector: Object with a ``render()`` method returning lines
+
+        Returns:
+            The collector, so metrics can be declared in one statement
+
+        Raises:
+            ValueError: If a metric of the same name is already registered
+        """
+        name = getattr(collector, "name", None) or getattr(collector, "prefix")
+        with self._lock:
+            if name in self._names:
+                raise ValueError(f"Metric {name} is already registered")
+            self._names.add(name)
+            self._collectors.append(collector)
+        return collector
+
+    def render(self) -> bytes:
+        """
+        Render all metrics in the Prometheus text format.
+
+        Returns:
+            bytes: Exposition body
+        """
+        with self._lock:
+            collectors = list(self._collectors)
+        lines: List[str] = []
+        for collector in collectors:
+            lines.extend(collector.render())
+        return ("\n".join(lines) + "\n").encode()
+
+
+registry = MetricsRegistry()
+
+REQUESTS_IN_FLIGHT = registry.register(
+    Gauge("tutorflow_http_requests_in_flight", "HTTP requests being served")
+)
+REQUEST_DURATION = registry.register(
+    Histogram(
+        "tutorflow_http_request_duration_seconds",
+        "Time to serve an HTTP request, including streaming the body",
+        ("method", "route", "status"),
+    )
+)
+REQUEST_DB_QUERIES = registry.register(
+    Histogram(
+        "tutorflow_http_request_db_queries",
+        "SQL statements run while serving an HTTP request",
+        ("method", "route"),
+        QUERY_COUNT_BUCKETS,
+    )
+)
+REQUEST_DB_SECONDS = registry.register(
+    Histogram(
+        "tutorflow_http_request_db_seconds",
+        "Time spent in SQL statements while serving an HTTP request",
+        ("method", "route"),
+    )
+)
+DB_QUERY_DURATION = registry.register(
+    Histogram("tutorflow_db_query_duration_seconds", "Time to run one SQL statement")
+)
+PASSWORD_HASH_DURATION = registry.register(
+    Histogram(
+        "tutorflow_password_hash_duration_seconds",
+        "Time to hash or verify a password in the worker pool",
+        ("operation",),
+        (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    )
+)
+SERIALIZATION_DURATION = registry.register(
+    Histogram(
+        "tutorflow_serialization_duration_seconds",
+        "Time to encode a JSON response body",
+        buckets=SERIALIZATION_BUCKETS,
+    )
+)
+
+
+class _RequestTimings:
+    """SQL statement count and time of the request being served."""
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_request_timings: ContextVar[Optional[_RequestTimings]] = ContextVar(
+    "metrics_request_timings", default=None
+)
+
+# Execution context attribute holding the statement start time
+_STARTED_ATTR = "_metrics_started"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Note when a statement starts."""
+    if context is not None:
+        setattr(context, _STARTED_ATTR, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Record a statement's duration, overall and for the current request."""
+    started = getattr(context, _STARTED_ATTR, None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    DB_QUERY_DURATION.observe(elapsed)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.queries += 1
+        timings.db_seconds += elapsed
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time the statements run on ``engine``.
+
+    Args:
+        engine: Sync engine, or the ``sync_engine`` of an async engine
+    """
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+    ):
+        if not event.contains(engine, name, listener):
+            event.listen(engine, name, listener)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Return the template of the route that served a request.
+
+    Routes of included routers hold the path they were declared with, such
+    as ``/bookings/{booking_id}``; the router prefix is put back from the
+    segments of the request path in front of the match.
+
+    Args:
+        scope: ASGI scope after the request was routed
+
+    Returns:
+        str: Template such as ``/api/v1/bookings/{booking_id}``, or
+        ``UNMATCHED_ROUTE``
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    if ":path}" in template:
+        return template
+    segments = scope["path"].split("/")
+    prefix = "/".join(segments[: len(segments) - template.count("/")])
+    return prefix + template
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and SQL work per route."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped application
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve the request and record its metrics once the body is sent."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Requests that fail before a response starts are answered with a 500
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        timings = _RequestTimings()
+        token = _request_timings.set(timings)
+        REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.dec()
+            _request_timings.reset(token)
+            # The route template, not the path, keeps the label set bounded
+            route = route_template(scope)
+            method = scope["method"]
+            REQUEST_DURATION.labels(method, route, str(status_code)).observe(elapsed)
+            REQUEST_DB_QUERIES.labels(method, route).observe(timings.queries)
+            REQUEST_DB_SECONDS.labels(method, route).observe(timings.db_seconds)
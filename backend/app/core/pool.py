@@ -0,0 +1,98 @@
+"""
+Connection pool telemetry for TutorFlow backend.
+
+The engines in ``app.database`` use the pools below, which time every
+checkout: waiting for a free connection, pinging it, or opening a new one.
+``pool_stats`` reports how many connections are in use, which the
+``/metrics`` endpoint exports and ``/ready`` compares against the
+saturation limit, so an instance whose pool is exhausted is taken out of
+rotation before its requests start timing out.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Union
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from app.core.metrics import Histogram, registry
+
+POOL_CHECKOUT_DURATION = registry.register(
+    Histogram(
+        "tutorflow_db_pool_checkout_seconds",
+        "Time to check a connection out of the pool, including waiting for one",
+        ("pool",),
+    )
+)
+
+
+class _TimedCheckout:
+    """Pool mixin recording checkout time under the pool's logging name."""
+
+    def connect(self):
+        """Check out a connection, recording how long it took."""
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            POOL_CHECKOUT_DURATION.labels(self.logging_name or "default").observe(
+                time.perf_counter() - started
+            )
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    """``QueuePool`` recording checkout time."""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` recording checkout time."""
+
+
+class TimedNullPool(_TimedCheckout, NullPool):
+    """``NullPool`` recording connect time, for use behind an external pooler."""
+
+
+@dataclass
+class PoolStats:
+    """Snapshot of connection pool occupancy."""
+
+    size: int
+    max_overflow: int
+    checked_out: int
+    idle: int
+    overflow: int
+    saturation: float
+
+
+def pool_stats(engine: Union[Engine, AsyncEngine]) -> PoolStats:
+    """
+    Report how many of an engine's pooled connections are in use.
+
+    Pools that do not bound their connections, such as the ``NullPool``
+    used behind an external pooler, report zero capacity and saturation.
+
+    Args:
+        engine: Sync or async engine
+
+    Returns:
+        PoolStats: Current occupancy; saturation is the share of the pool
+        and overflow checked out
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return PoolStats(0, 0, 0, 0, 0, 0.0)
+    size = pool.size()
+    max_overflow = pool._max_overflow
+    checked_out = pool.checkedout()
+    # A negative limit allows unbounded overflow, so the pool never saturates
+    capacity = size + max_overflow if max_overflow >= 0 else 0
+    return PoolStats(
+        size=size,
+        max_overflow=max_overflow,
+        checked_out=checked_out,
+        idle=pool.checkedin(),
+        overflow=max(pool.overflow(), 0),
+        saturation=checked_out / capacity if capacity else 0.0,
+    )
@@ -0,0 +1,116 @@
+"""
+Authenticated principal cache for TutorFlow backend.
+
+Access tokens carry the user ID, role and token version, so a request can be
+authenticated from a small in-process cache instead of loading the user row
+every time. Entries expire after a short TTL, which bounds how long another
+worker can keep accepting a user that was deactivated or changed role.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+from uuid import UUID
+
+from app.config import settings
+from app.models.user import User, UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as seen by request handlers."""
+
+    id: UUID
+    email: str
+    role: UserRole
+    is_active: bool
+    token_version: int
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Build a principal from a user row."""
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            is_active=user.is_active,
+            token_version=user.token_version or 0,
+        )
+
+
+class PrincipalCache:
+    """Thread-safe LRU cache of principals with a per-entry TTL."""
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of principals kept
+            ttl_seconds: Seconds an entry stays valid after being stored
+            clock: Monotonic time source
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[UUID, tuple[float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: UUID) -> Optional[Principal]:
+        """
+        Return the cached principal for ``user_id`` if it has not expired.
+
+        Args:
+            user_id: User ID from the access token
+
+        Returns:
+            Optional[Principal]: Cached principal, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= self._clock():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def put(self, principal: Principal) -> None:
+        """Store ``principal``, evicting the least recently used entry if full."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (
+                self._clock() + self.ttl_seconds,
+                principal,
+            )
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop the cached principal for ``user_id``."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached principals."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+principal_cache = PrincipalCache(
+    settings.principal_cache_size, settings.principal_cache_ttl_seconds
+)
@@ -0,0 +1,109 @@
+"""
+Query budgets for TutorFlow backend.
+
+Endpoints on hot paths declare how many SQL statements one request may
+issue. ``QueryBudgetMiddleware`` counts the statements executed while a
+request is served and raises ``QueryBudgetExceeded`` when the endpoint goes
+over its budget, so an N+1 pattern, such as a lazy relationship load or a
+query per row, fails the test suite instead of slowing production down.
+
+The tests wrap the application in the middleware; production does not
+count statements.
+"""
+
+from contextvars import ContextVar
+from typing import Callable, List, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+F = TypeVar("F", bound=Callable)
+
+# Endpoint attribute holding its declared budget
+QUERY_BUDGET_ATTR = "__query_budget__"
+
+_statements: ContextVar[Optional[List[str]]] = ContextVar(
+    "query_budget_statements", default=None
+)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request issues more statements than its endpoint allows."""
+
+
+def query_budget(limit: int) -> Callable[[F], F]:
+    """
+    Declare the most SQL statements one request to an endpoint may issue.
+
+    The budget covers everything the request runs, including dependencies
+    such as the principal lookup on a cold cache.
+
+    Args:
+        limit: Maximum number of statements
+
+    Returns:
+        Callable: Decorator recording the budget on the endpoint
+
+    Example:
+        ```python
+        @router.get("/me")
+        @query_budget(2)
+        async def get_current_user_info(...):
+            ...
+        ```
+    """
+
+    def decorate(endpoint: F) -> F:
+        setattr(endpoint, QUERY_BUDGET_ATTR, limit)
+        return endpoint
+
+    return decorate
+
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    """Append a statement to the current request's list, if one is counted."""
+    statements = _statements.get()
+    if statements is not None:
+        statements.append(statement)
+
+
+class QueryBudgetMiddleware:
+    """ASGI middleware enforcing the declared query budgets."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Initialize the middleware and start counting statements.
+
+        Args:
+            app: Wrapped application
+        """
+        self.app = app
+        if not event.contains(Engine, "before_cursor_execute", _record_statement):
+            event.listen(Engine, "before_cursor_execute", _record_statement)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Serve the request and check its statement count.
+
+        Raises:
+            QueryBudgetExceeded: If the endpoint's budget was exceeded
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        statements: List[str] = []
+        token = _statements.set(statements)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _statements.reset(token)
+
+        endpoint = scope.get("endpoint")
+        limit = getattr(endpoint, QUERY_BUDGET_ATTR, None)
+        if limit is not None and len(statements) > limit:
+            listing = "\n".join(f"  {sql}" for sql in statements)
+            raise QueryBudgetExceeded(
+                f"{scope['method']} {scope['path']} ran {len(statements)} "
+                f"statements, budget is {limit}:\n{listing}"
+            )
@@ -0,0 +1,271 @@
+"""
+SQL statement statistics for TutorFlow backend.
+
+Every statement run on the engines in ``app.database`` is reduced to a
+fingerprint, its SQL with literals and bound parameters replaced by ``?``
+and ``IN`` lists and multi-row ``VALUES`` collapsed, so the same query from
+the same call site always lands in the same row of a bounded in-memory
+table. Each row keeps a count, the total time and the latencies of its most
+recent runs, from which the p50, p95 and p99 are computed when the table is
+read. Statements slower than ``slow_query_ms`` are logged with their
+parameter values redacted.
+
+Admins read the most expensive fingerprints from ``GET /admin/queries``.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Fields the top offenders can be ordered by
+ORDER_FIELDS = ("total_seconds", "count", "p95_seconds", "p99_seconds", "max_seconds")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b")
+# qmark, format, pyformat, numeric ($1) and named (:name, but not ::casts)
+_PARAMETER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, ?\?)+\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(\((?:\?|\s|,)+\))(?:\s*,\s*\((?:\?|\s|,)+\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a SQL statement so that runs of the same query compare equal.
+
+    Compiled statements are cached by SQLAlchemy and repeat verbatim, so
+    the result is cached by statement text.
+
+    Args:
+        statement: SQL as sent to the driver
+
+    Returns:
+        str: Statement with literals and parameters replaced by ``?``
+
+    Example:
+        ```python
+        fingerprint("SELECT * FROM users WHERE id IN (?, ?, ?) LIMIT 10")
+        # "SELECT * FROM users WHERE id IN (...) LIMIT ?"
+        ```
+    """
+    sql = _STRING.sub("?", statement)
+    sql = _PARAMETER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    sql = _VALUES_ROWS.sub(r"\1, ...", sql)
+    return _IN_LIST.sub("IN (...)", sql)
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """
+    Replace bound parameter values by their type names for logging.
+
+    Args:
+        parameters: Parameters passed to the cursor, a mapping, a sequence,
+            or a list of either for ``executemany``
+
+    Returns:
+        Any: The same shape with each value replaced by its type name
+    """
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} parameter sets>"
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _percentile(ordered: List[float], quantile: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(quantile * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class QueryStats:
+    """Snapshot of one fingerprint's activity."""
+
+    fingerprint: str
+    count: int
+    slow_count: int
+    total_seconds: float
+    mean_seconds: float
+    p50_seconds: float
+    p95_seconds: float
+    p99_seconds: float
+    max_seconds: float
+
+
+class _Entry:
+    """Running totals and recent latencies of one fingerprint."""
+
+    __slots__ = ("count", "slow_count", "total_seconds", "max_seconds", "recent")
+
+    def __init__(self, window: int) -> None:
+        self.count = 0
+        self.slow_count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+
+class QueryStatsTable:
+    """Bounded table of statement statistics keyed by fingerprint."""
+
+    def __init__(
+        self, max_fingerprints: int, window: int, slow_threshold_seconds: float
+    ) -> None:
+        """
+        Initialize the table.
+
+        Args:
+            max_fingerprints: Most fingerprints kept; the one with the least
+                total time makes room for a new one
+            window: Recent runs per fingerprint the percentiles are taken from
+            slow_threshold_seconds: Runs at least this slow are logged;
+                0 disables the log
+        """
+        self.max_fingerprints = max_fingerprints
+        self.window = window
+        self.slow_threshold_seconds = slow_threshold_seconds
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, parameters: Any, seconds: float) -> None:
+        """
+        Record one run of a statement, logging it if it was slow.
+
+        Args:
+            statement: SQL as sent to the driver
+            parameters: Bound parameters, logged redacted
+            seconds: Time the statement took
+        """
+        slow = 0 < self.slow_threshold_seconds <= seconds
+        if slow:
+            logger.warning(
+                "Slow query (%.1f ms): %s; parameters: %s",
+                seconds * 1000,
+                statement,
+                redact_parameters(parameters),
+            )
+        if self.max_fingerprints < 1:
+            return
+        key = fingerprint(statement)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    cheapest = min(
+                        self._entries, key=lambda k: self._entries[k].total_seconds
+                    )
+                    del self._entries[cheapest]
+                entry = self._entries[key] = _Entry(self.window)
+            entry.count += 1
+            entry.slow_count += slow
+            entry.total_seconds += seconds
+            entry.max_seconds = max(entry.max_seconds, seconds)
+            entry.recent.append(seconds)
+
+    def top(self, limit: int = 20, order_by: str = "total_seconds") -> List[QueryStats]:
+        """
+        Return the fingerprints with the most of ``order_by``.
+
+        Args:
+            limit: Most fingerprints returned
+            order_by: One of ``ORDER_FIELDS``
+
+        Returns:
+            List[QueryStats]: Snapshots, largest first
+
+        Raises:
+            ValueError: If ``order_by`` is not a known field
+        """
+        if order_by not in ORDER_FIELDS:
+            raise ValueError(f"Cannot order query stats by {order_by}")
+        with self._lock:
+            stats = [
+                QueryStats(
+                    fingerprint=key,
+                    count=entry.count,
+                    slow_count=entry.slow_count,
+                    total_seconds=entry.total_seconds,
+                    mean_seconds=entry.total_seconds / entry.count,
+                    p50_seconds=0.0,
+                    p95_seconds=0.0,
+                    p99_seconds=0.0,
+                    max_seconds=entry.max_seconds,
+                )
+                for key, entry in self._entries.items()
+            ]
+            recent = {key: list(entry.recent) for key, entry in self._entries.items()}
+        # Sort the recent runs outside the lock; recording never waits on it
+        for snapshot in stats:
+            ordered = sorted(recent[snapshot.fingerprint])
+            snapshot.p50_seconds = _percentile(ordered, 0.50)
+            snapshot.p95_seconds = _percentile(ordered, 0.95)
+            snapshot.p99_seconds = _percentile(ordered, 0.99)
+        stats.sort(key=lambda s: getattr(s, order_by), reverse=True)
+        return stats[:limit]
+
+    def clear(self) -> None:
+        """Drop all statistics."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+query_stats = QueryStatsTable(
+    settings.query_stats_size,
+    settings.query_stats_window,
+    settings.slow_query_ms / 1000,
+)
+
+# Execution context attribute holding the statement start time
+_STARTED_ATTR = "_query_stats_started"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Note when a statement starts."""
+    if context is not None:
+        setattr(context, _STARTED_ATTR, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Record a finished statement in the table."""
+    started: Optional[float] = getattr(context, _STARTED_ATTR, None)
+    if started is not None:
+        query_stats.record(statement, parameters, time.perf_counter() - started)
+
+
+def track_queries(engine: Engine) -> None:
+    """
+    Record the statements run on ``engine`` in ``query_stats``.
+
+    Args:
+        engine: Sync engine, or the ``sync_engine`` of an async engine
+    """
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+    ):
+        if not event.contains(engine, name, listener):
+            event.listen(engine, name, listener)
@@ -0,0 +1,250 @@
+"""
+Read replica routing for TutorFlow backend.
+
+Read-only endpoints, such as tutor search, slot lookups and booking lists,
+take their session from ``get_read_db``, which asks ``ReplicaRouter`` for a
+replica. Replicas are used in turn; one that cannot be connected to is
+skipped for a cool-down period, and reads fall back to the primary when no
+replica is available or none is configured. Endpoints whose responses go to
+the shared response cache read the primary: a page rendered from a lagging
+replica right after an invalidation would be served to every client until
+it expires.
+
+Replicas lag the primary, so a client that has just written would not see
+its own change. Sessions from ``get_db`` record committed writes under the
+client's key, the digest of its ``Authorization`` header, and that client's
+reads go to the primary for ``replica_sticky_seconds`` afterwards.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+# Session.info keys used to track writes
+WRITE_TRACKER_KEY = "replica_write_tracker"
+_WROTE_KEY = "replica_wrote"
+
+
+def read_key(request: Request) -> Optional[bytes]:
+    """
+    Identify the client of a request for read-your-writes routing.
+
+    The token is not verified here: the key only decides where reads go,
+    and only verified requests commit writes that make a key sticky.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Optional[bytes]: Digest of the ``Authorization`` header, or None for
+        anonymous requests
+    """
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).digest()
+
+
+@dataclass
+class ReplicaStats:
+    """Snapshot of read routing."""
+
+    replicas: int
+    healthy: int
+    replica_reads: int
+    primary_reads: int
+    sticky_reads: int
+    failovers: int
+
+
+class ReplicaRouter:
+    """Chooses the database a read-only session connects to."""
+
+    def __init__(
+        self,
+        replicas: Sequence[AsyncEngine],
+        sticky_seconds: float,
+        failure_cooldown_seconds: float,
+        max_sticky_clients: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the router.
+
+        Args:
+            replicas: Engines of the read replicas, possibly none
+            sticky_seconds: How long a client's reads stay on the primary
+                after it writes; 0 disables stickiness
+            failure_cooldown_seconds: How long a replica that failed to
+                connect is skipped
+            max_sticky_clients: Most clients remembered; the oldest writes
+                are forgotten first
+            clock: Monotonic time source
+        """
+        self.replicas = list(replicas)
+        self.sticky_seconds = sticky_seconds
+        self.failure_cooldown_seconds = failure_cooldown_seconds
+        self.max_sticky_clients = max_sticky_clients
+        self._clock = clock
+        self._next = 0
+        self._down_until: Dict[int, float] = {}
+        self._sticky: "OrderedDict[bytes, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._replica_reads = 0
+        self._primary_reads = 0
+        self._sticky_reads = 0
+        self._failovers = 0
+
+    def candidates(self, key: Optional[bytes]) -> List[AsyncEngine]:
+        """
+        Return the replicas to try for a read, in order.
+
+        Healthy replicas are rotated so consecutive reads start at the next
+        one. An empty list means the read goes to the primary.
+
+        Args:
+            key: Client key from ``read_key``
+
+        Returns:
+            List[AsyncEngine]: Replicas to try before falling back
+        """
+        if not self.replicas:
+            return []
+        if self.is_sticky(key):
+            with self._lock:
+                self._sticky_reads += 1
+            return []
+        now = self._clock()
+        with self._lock:
+            start = self._next
+            self._next = (start + 1) % len(self.replicas)
+            order = self.replicas[start:] + self.replicas[:start]
+            return [
+                engine
+                for engine in order
+                if self._down_until.get(id(engine), 0.0) <= now
+            ]
+
+    def mark_down(self, engine: AsyncEngine) -> None:
+        """
+        Skip a replica that failed to connect for the cool-down period.
+
+        Args:
+            engine: Replica engine
+        """
+        with self._lock:
+            self._down_until[id(engine)] = self._clock() + self.failure_cooldown_seconds
+            self._failovers += 1
+
+    def record_read(self, replica: bool) -> None:
+        """Count a read served by a replica or by the primary."""
+        with self._lock:
+            if replica:
+                self._replica_reads += 1
+            else:
+                self._primary_reads += 1
+
+    def record_write(self, key: Optional[bytes]) -> None:
+        """
+        Send a client's reads to the primary for the sticky window.
+
+        Args:
+            key: Client key from ``read_key``; anonymous writes are ignored
+        """
+        if key is None or self.sticky_seconds <= 0 or not self.replicas:
+            return
+        with self._lock:
+            self._sticky[key] = self._clock() + self.sticky_seconds
+            self._sticky.move_to_end(key)
+            while len(self._sticky) > self.max_sticky_clients:
+                self._sticky.popitem(last=False)
+
+    def is_sticky(self, key: Optional[bytes]) -> bool:
+        """
+        Whether a client wrote within the sticky window.
+
+        Args:
+            key: Client key from ``read_key``
+
+        Returns:
+            bool: True if the client's reads must go to the primary
+        """
+        if key is None:
+            return False
+        with self._lock:
+            until = self._sticky.get(key)
+            if until is None:
+                return False
+            if until > self._clock():
+                return True
+            del self._sticky[key]
+            return False
+
+    def stats(self) -> ReplicaStats:
+        """Return a snapshot of read routing."""
+        now = self._clock()
+        with self._lock:
+            return ReplicaStats(
+                replicas=len(self.replicas),
+                healthy=sum(
+                    self._down_until.get(id(engine), 0.0) <= now
+                    for engine in self.replicas
+                ),
+                replica_reads=self._replica_reads,
+                primary_reads=self._primary_reads,
+                sticky_reads=self._sticky_reads,
+                failovers=self._failovers,
+            )
+
+
+def track_writes(session, router: ReplicaRouter, key: Optional[bytes]) -> None:
+    """
+    Make the session's committed writes sticky for the client ``key``.
+
+    Args:
+        session: Sync or async session serving the request
+        router: Router whose sticky window is extended
+        key: Client key from ``read_key``
+    """
+    session.info[WRITE_TRACKER_KEY] = (router, key)
+
+
+@event.listens_for(Session, "after_flush")
+def _note_flush(session, flush_context) -> None:
+    """Remember that the transaction changed rows through the unit of work."""
+    session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_dml(orm_execute_state) -> None:
+    """Remember that the transaction ran an INSERT, UPDATE or DELETE."""
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_commit(session) -> None:
+    """Start the client's sticky window once its writes are committed."""
+    if session.info.pop(_WROTE_KEY, False):
+        tracker = session.info.get(WRITE_TRACKER_KEY)
+        if tracker is not None:
+            router, key = tracker
+            router.record_write(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rollback(session) -> None:
+    """Rolled back writes are not visible anywhere."""
+    session.info.pop(_WROTE_KEY, None)
@@ -0,0 +1,377 @@
+"""
+Response cache for TutorFlow backend.
+
+Public, read-heavy endpoints such as the tutor catalog keep their rendered
+JSON bodies in a cache keyed by the normalized request parameters. Entries
+carry tags naming the records they were built from, and writes to those
+records invalidate the tags, so a cached page is dropped as soon as a tutor
+on it changes. Every entry has an entity tag, so a client holding the
+current body gets ``304 Not Modified`` without one.
+
+Entries live in a backend: an in-process LRU by default, or Redis when
+several workers must share entries and invalidations. With the in-process
+backend, a write on one worker is only seen by the others once their
+entries expire after ``response_cache_ttl_seconds``.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Protocol, Set
+from urllib.parse import quote
+
+from fastapi import Request, Response, status
+
+from app.config import settings
+from app.utils.http_cache import etag_matches, make_etag
+from app.utils.serialization import dumps
+
+# Sent with cached responses: clients may keep them but must revalidate
+CACHE_CONTROL = "no-cache"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A rendered JSON response body with its entity tag."""
+
+    body: bytes
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    tags: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def render(
+        cls,
+        content: Any,
+        tags: Iterable[str] = (),
+        headers: Optional[Dict[str, str]] = None,
+    ) -> "CachedResponse":
+        """
+        Render ``content`` as the JSON body the endpoint would have returned.
+
+        Args:
+            content: Response content, as returned by the endpoint
+            tags: Records the response was built from
+            headers: Extra response headers to replay with the body
+
+        Returns:
+            CachedResponse: Rendered response
+        """
+        body = dumps(content)
+        return cls(
+            body=body, etag=make_etag(body), headers=headers or {}, tags=frozenset(tags)
+        )
+
+    def to_response(self, request: Request) -> Response:
+        """
+        Answer ``request`` with this body, or 304 if the client has it.
+
+        Args:
+            request: Incoming request, checked for ``If-None-Match``
+
+        Returns:
+            Response: 200 with the body, or 304 without one
+        """
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(
+            self.body,
+            media_type="application/json",
+            headers={**self.headers, **headers},
+        )
+
+
+class ResponseCacheBackend(Protocol):
+    """Storage for cached responses."""
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the live entry for ``key``, or None."""
+
+    async def set(self, key: str, entry: CachedResponse, ttl_seconds: float) -> None:
+        """Store ``entry`` under ``key`` for ``ttl_seconds``."""
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        """Drop every entry carrying any of ``tags``."""
+
+
+class InMemoryResponseCacheBackend:
+    """Thread-safe LRU of responses with a per-entry TTL and a tag index."""
+
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the backend.
+
+        Args:
+            max_size: Maximum number of responses kept
+            clock: Monotonic time source
+        """
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple[float, CachedResponse]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def _remove(self, key: str) -> None:
+        """Drop ``key`` and its tag index entries; the lock must be held."""
+        _, entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the live entry for ``key``, or None."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at <= self._clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    async def set(self, key: str, entry: CachedResponse, ttl_seconds: float) -> None:
+        """Store ``entry``, evicting the least recently used entries if full."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self._clock() + ttl_seconds, entry)
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        """Drop every entry carrying any of ``tags``."""
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisResponseCacheBackend:
+    """
+    Responses shared through Redis.
+
+    Each entry is a key that Redis expires after the TTL; each tag is a set
+    of the keys carrying it, so invalidation deletes exactly those keys.
+    """
+
+    def __init__(self, client, prefix: str = "tutorflow:responses") -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            client: ``redis.asyncio.Redis`` (or compatible) client
+            prefix: Key prefix for cached responses and tag sets
+        """
+        self._client = client
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the live entry for ``key``, or None."""
+        raw = await self._client.get(f"{self._prefix}:entry:{key}")
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return CachedResponse(
+            body=data["body"].encode(),
+            etag=data["etag"],
+            headers=data["headers"],
+            tags=frozenset(data["tags"]),
+        )
+
+    async def set(self, key: str, entry: CachedResponse, ttl_seconds: float) -> None:
+        """Store ``entry`` under ``key`` and index it by its tags."""
+        ttl = max(1, int(ttl_seconds))
+        payload = {
+            "body": entry.body.decode(),
+            "etag": entry.etag,
+            "headers": entry.headers,
+            "tags": sorted(entry.tags),
+        }
+        await self._client.set(
+            f"{self._prefix}:entry:{key}", json.dumps(payload), ex=ttl
+        )
+        for tag in entry.tags:
+            await self._client.sadd(f"{self._prefix}:tag:{tag}", key)
+            await self._client.expire(f"{self._prefix}:tag:{tag}", ttl)
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        """Drop every entry carrying any of ``tags``."""
+        for tag in tags:
+            tag_key = f"{self._prefix}:tag:{tag}"
+            members = await self._client.smembers(tag_key)
+            keys = [
+                f"{self._prefix}:entry:"
+                + (member.decode() if isinstance(member, bytes) else member)
+                for member in members
+            ]
+            await self._client.delete(*keys, tag_key)
+
+
+@dataclass(frozen=True)
+class ResponseCacheStats:
+    """Snapshot of response cache activity."""
+
+    hits: int
+    misses: int
+    invalidations: int
+
+
+class ResponseCache:
+    """Tagged response cache in front of a backend."""
+
+    def __init__(self, backend: ResponseCacheBackend, ttl_seconds: float) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Where rendered responses are kept
+            ttl_seconds: Seconds a response is served; 0 disables caching
+        """
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def epoch(self) -> int:
+        """
+        Return the current invalidation epoch.
+
+        Take it before reading the database and pass it to ``put``: a
+        response rendered from rows read before a concurrent invalidation is
+        then not stored.
+
+        Returns:
+            int: Number of invalidations so far
+        """
+        return self._epoch
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Return the cached response for ``key``.
+
+        Args:
+            key: Normalized request key
+
+        Returns:
+            Optional[CachedResponse]: Cached response, or None on a miss
+        """
+        if self.ttl_seconds <= 0:
+            return None
+        entry = await self.backend.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def put(self, key: str, entry: CachedResponse, epoch: int) -> None:
+        """
+        Store a freshly rendered response.
+
+        Args:
+            key: Normalized request key
+            entry: Rendered response
+            epoch: Value of ``epoch()`` taken before the rows were read
+        """
+        if self.ttl_seconds <= 0 or epoch != self._epoch:
+            return
+        await self.backend.set(key, entry, self.ttl_seconds)
+
+    async def invalidate(self, *tags: str) -> None:
+        """
+        Drop every cached response built from the records named by ``tags``.
+
+        Args:
+            tags: Record tags, e.g. ``tutor:<id>``
+        """
+        self._epoch += 1
+        self.invalidations += 1
+        await self.backend.invalidate(tags)
+
+    def reset_stats(self) -> None:
+        """Reset the activity counters."""
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def stats(self) -> ResponseCacheStats:
+        """Return a snapshot of response cache activity."""
+        return ResponseCacheStats(
+            hits=self.hits, misses=self.misses, invalidations=self.invalidations
+        )
+
+
+def cache_key(name: str, **params: Any) -> str:
+    """
+    Build a cache key that does not depend on parameter order or omissions.
+
+    Args:
+        name: Endpoint name
+        params: Validated request parameters; None values are left out
+
+    Returns:
+        str: Cache key such as ``tutors?limit=100&verified_only=true``
+    """
+    parts = []
+    for param, value in sorted(params.items()):
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = str(value).lower()
+        parts.append(f"{param}={quote(str(value), safe='')}")
+    return f"{name}?{'&'.join(parts)}"
+
+
+def create_response_cache_backend(
+    url: Optional[str], max_size: int
+) -> ResponseCacheBackend:
+    """
+    Create the backend configured by ``response_cache_backend_url``.
+
+    Args:
+        url: ``redis://`` URL, or None for the in-process backend
+        max_size: Maximum number of responses kept in process
+
+    Returns:
+        ResponseCacheBackend: Configured backend
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+        ImportError: If a Redis URL is given but ``redis`` is not installed
+    """
+    if not url:
+        return InMemoryResponseCacheBackend(max_size)
+    if not url.startswith(("redis://", "rediss://", "unix://")):
+        raise ValueError(f"Unsupported response cache backend URL: {url}")
+    try:
+        import redis.asyncio as redis
+    except ImportError as exc:
+        raise ImportError(
+            "The redis package is required for a Redis response cache backend"
+        ) from exc
+    return RedisResponseCacheBackend(redis.Redis.from_url(url))
+
+
+response_cache = ResponseCache(
+    create_response_cache_backend(
+        settings.response_cache_backend_url, settings.response_cache_size
+    ),
+    settings.response_cache_ttl_seconds,
+)
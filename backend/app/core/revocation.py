@@ -0,0 +1,262 @@
+"""
+Token revocation for TutorFlow backend.
+
+Revoked tokens are recorded by their ``jti`` claim until they would have
+expired anyway. Records live in a backend: an in-process dict by default,
+or Redis when several workers must share them. Every worker keeps a Bloom
+filter of the revoked IDs in front of the backend, so the common "not
+revoked" answer costs a few bit tests and never a network round trip. The
+filter is rebuilt from the backend every ``revocation_refresh_seconds``,
+which bounds how long a revocation made on another worker goes unseen and
+drops entries that have expired.
+"""
+
+import heapq
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Protocol, Tuple
+
+from app.config import settings
+from app.utils.bloom import BloomFilter
+
+
+class RevocationBackend(Protocol):
+    """Storage for revoked token IDs."""
+
+    async def add(self, jti: str, expires_at: float) -> None:
+        """Record ``jti`` as revoked until ``expires_at`` (Unix time)."""
+
+    async def contains(self, jti: str) -> bool:
+        """Return True if ``jti`` is revoked and not yet expired."""
+
+    async def active(self) -> List[str]:
+        """Return all revoked IDs that have not expired."""
+
+
+class InMemoryRevocationBackend:
+    """Revocation records in a dict, purged in expiry order."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            clock: Wall-clock time source, compared against token expiry
+        """
+        self._clock = clock
+        self._expiry: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    def _purge(self) -> None:
+        """Drop records whose token has expired."""
+        now = self._clock()
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, jti = heapq.heappop(self._heap)
+            if self._expiry.get(jti) == expires_at:
+                del self._expiry[jti]
+
+    async def add(self, jti: str, expires_at: float) -> None:
+        """Record ``jti`` as revoked until ``expires_at``."""
+        self._purge()
+        self._expiry[jti] = max(expires_at, self._expiry.get(jti, 0.0))
+        heapq.heappush(self._heap, (self._expiry[jti], jti))
+
+    async def contains(self, jti: str) -> bool:
+        """Return True if ``jti`` is revoked and not yet expired."""
+        expires_at = self._expiry.get(jti)
+        return expires_at is not None and expires_at > self._clock()
+
+    async def active(self) -> List[str]:
+        """Return all revoked IDs that have not expired."""
+        self._purge()
+        return list(self._expiry)
+
+
+class RedisRevocationBackend:
+    """
+    Revocation records shared through Redis.
+
+    Each revoked ID is a key that Redis expires together with the token; a
+    sorted set scored by expiry lets workers list the live IDs cheaply.
+    """
+
+    def __init__(
+        self,
+        client,
+        prefix: str = "tutorflow:revoked",
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            client: ``redis.asyncio.Redis`` (or compatible) client
+            prefix: Key prefix for revocation records
+            clock: Wall-clock time source, compared against token expiry
+        """
+        self._client = client
+        self._prefix = prefix
+        self._index = f"{prefix}:index"
+        self._clock = clock
+
+    async def add(self, jti: str, expires_at: float) -> None:
+        """Record ``jti`` as revoked until ``expires_at``."""
+        ttl = max(1, int(expires_at - self._clock()) + 1)
+        await self._client.set(f"{self._prefix}:{jti}", 1, ex=ttl)
+        await self._client.zadd(self._index, {jti: expires_at})
+
+    async def contains(self, jti: str) -> bool:
+        """Return True if ``jti`` is revoked and not yet expired."""
+        return bool(await self._client.exists(f"{self._prefix}:{jti}"))
+
+    async def active(self) -> List[str]:
+        """Return all revoked IDs that have not expired."""
+        now = self._clock()
+        await self._client.zremrangebyscore(self._index, "-inf", now)
+        members = await self._client.zrangebyscore(self._index, now, "+inf")
+        return [
+            member.decode() if isinstance(member, bytes) else member
+            for member in members
+        ]
+
+
+@dataclass(frozen=True)
+class RevocationStats:
+    """Snapshot of revocation checks."""
+
+    filtered: int
+    backend_lookups: int
+    revoked: int
+
+
+class RevocationStore:
+    """Revocation checks with a Bloom filter in front of a backend."""
+
+    def __init__(
+        self,
+        backend: RevocationBackend,
+        filter_capacity: int = 100_000,
+        filter_error_rate: float = 0.001,
+        refresh_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            backend: Where revocation records are kept
+            filter_capacity: Expected number of live revocations
+            filter_error_rate: Target false positive rate of the filter
+            refresh_seconds: How often the filter is rebuilt from the backend
+            clock: Monotonic time source for refresh scheduling
+        """
+        self.backend = backend
+        self.filter_capacity = filter_capacity
+        self.filter_error_rate = filter_error_rate
+        self.refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._filter = BloomFilter(filter_capacity, filter_error_rate)
+        self._refreshed_at: Optional[float] = None
+        self._filtered = 0
+        self._backend_lookups = 0
+        self._revoked = 0
+
+    async def refresh(self) -> None:
+        """Rebuild the filter from the live records in the backend."""
+        active = await self.backend.active()
+        bloom = BloomFilter(
+            max(self.filter_capacity, len(active)), self.filter_error_rate
+        )
+        for jti in active:
+            bloom.add(jti)
+        self._filter = bloom
+        self._refreshed_at = self._clock()
+
+    async def _refresh_if_stale(self) -> None:
+        """Refresh the filter when it is older than ``refresh_seconds``."""
+        if (
+            self._refreshed_at is None
+            or self._clock() - self._refreshed_at >= self.refresh_seconds
+        ):
+            await self.refresh()
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """
+        Revoke a token until it expires.
+
+        Args:
+            jti: Token ID claim
+            expires_at: Token ``exp`` claim (Unix time)
+        """
+        await self.backend.add(jti, expires_at)
+        self._filter.add(jti)
+
+    async def is_revoked(self, jti: str) -> bool:
+        """
+        Check whether a token has been revoked.
+
+        Args:
+            jti: Token ID claim
+
+        Returns:
+            bool: True if the token was revoked and has not expired
+        """
+        await self._refresh_if_stale()
+        if jti not in self._filter:
+            self._filtered += 1
+            return False
+        self._backend_lookups += 1
+        revoked = await self.backend.contains(jti)
+        self._revoked += revoked
+        return revoked
+
+    def clear(self) -> None:
+        """Drop the local filter and counters; the next check refreshes."""
+        self._filter = BloomFilter(self.filter_capacity, self.filter_error_rate)
+        self._refreshed_at = None
+        self._filtered = 0
+        self._backend_lookups = 0
+        self._revoked = 0
+
+    def stats(self) -> RevocationStats:
+        """Return a snapshot of revocation checks."""
+        return RevocationStats(
+            filtered=self._filtered,
+            backend_lookups=self._backend_lookups,
+            revoked=self._revoked,
+        )
+
+
+def create_revocation_backend(url: Optional[str]) -> RevocationBackend:
+    """
+    Create the backend configured by ``revocation_backend_url``.
+
+    Args:
+        url: ``redis://`` URL, or None for the in-process backend
+
+    Returns:
+        RevocationBackend: Configured backend
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+        ImportError: If a Redis URL is given but ``redis`` is not installed
+    """
+    if not url:
+        return InMemoryRevocationBackend()
+    if not url.startswith(("redis://", "rediss://", "unix://")):
+        raise ValueError(f"Unsupported revocation backend URL: {url}")
+    try:
+        import redis.asyncio as redis
+    except ImportError as exc:
+        raise ImportError(
+            "The redis package is required for a Redis revocation backend"
+        ) from exc
+    return RedisRevocationBackend(redis.Redis.from_url(url))
+
+
+revocation_store = RevocationStore(
+    create_revocation_backend(settings.revocation_backend_url),
+    filter_capacity=settings.revocation_filter_capacity,
+    filter_error_rate=settings.revocation_filter_error_rate,
+    refresh_seconds=settings.revocation_refresh_seconds,
+)
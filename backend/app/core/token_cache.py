@@ -0,0 +1,116 @@
+"""
+Decoded token cache for TutorFlow backend.
+
+The frontend sends the same access token with every request of a page load.
+Verified claims are kept in a bounded LRU keyed by a SHA-256 digest of the
+token, so repeat requests skip base64 parsing and HMAC verification. An
+entry is only served until the token's ``exp``.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class TokenCacheStats:
+    """Snapshot of decoded token cache activity."""
+
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+
+
+class DecodedTokenCache:
+    """Thread-safe LRU of verified token claims, valid until ``exp``."""
+
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.time) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of tokens kept; 0 disables caching
+            clock: Wall-clock time source, compared against ``exp``
+        """
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, tuple[float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        """Digest used as the cache key, so raw tokens are not kept around."""
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached claims for ``token`` if it has not expired.
+
+        Args:
+            token: Encoded JWT
+
+        Returns:
+            Optional[Dict[str, Any]]: Verified claims, or None on a miss
+        """
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, claims = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return claims
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        """
+        Store verified claims for ``token`` until its ``exp`` claim.
+
+        Tokens without a numeric ``exp`` are not cached.
+
+        Args:
+            token: Encoded JWT
+            claims: Claims returned by a successful decode
+        """
+        expires_at = claims.get("exp")
+        if self.max_size <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (float(expires_at), claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached tokens and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> TokenCacheStats:
+        """Return a snapshot of cache activity."""
+        with self._lock:
+            return TokenCacheStats(
+                size=len(self._entries),
+                max_size=self.max_size,
+                hits=self.hits,
+                misses=self.misses,
+            )
+
+
+token_cache = DecodedTokenCache(settings.token_cache_size)
@@ -2,50 +2,222 @@
 Database configuration and session management.
 """
 
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict
+from fastapi import Depends, Request
 from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.config import settings
+from app.core.metrics import instrument_engine
+from app.core.pool import TimedAsyncAdaptedQueuePool, TimedNullPool, TimedQueuePool
+from app.core.query_stats import track_queries
+from app.core.replicas import ReplicaRouter, read_key, track_writes
+
+
+def engine_options(url: URL, pool_name: str) -> Dict[str, Any]:
+    """
+    Build the connection pool arguments for an engine from the settings.
+
+    In-memory SQLite keeps one shared connection, since every new
+    connection would open a new empty database. Behind an external pooler
+    such as PgBouncer each checkout opens a connection to the pooler, and
+    asyncpg's prepared statement caches are disabled because consecutive
+    transactions may run on different server connections. Otherwise
+    connections are pooled with the configured size, overflow, timeout,
+    recycle and pre-ping.
+
+    Args:
+        url: Database URL, with the driver the engine will use
+        pool_name: Name of the pool in logs and metrics, e.g. ``"async"``
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for ``create_engine``
+    """
+    options: Dict[str, Any] = {
+        "echo": settings.database_echo,
+        "pool_logging_name": pool_name,
+    }
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        options["poolclass"] = StaticPool
+    elif settings.database_external_pooler:
+        options["poolclass"] = TimedNullPool
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+            }
+    else:
+        options.update(
+            poolclass=(
+                TimedAsyncAdaptedQueuePool
+                if url.get_dialect().is_async
+                else TimedQueuePool
+            ),
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout,
+            pool_recycle=settings.database_pool_recycle,
+            pool_pre_ping=settings.database_pool_pre_ping,
+        )
+    return options
+
 
 # Create database engine
-engine = create_engine(
-    settings.database_url,
-    echo=settings.database_echo,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    # For development, use StaticPool to avoid connection issues
-    poolclass=StaticPool if settings.debug else None,
-)
+_sync_url = make_url(settings.database_url)
+engine = create_engine(_sync_url, **engine_options(_sync_url, "sync"))
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers used by the request-serving engine
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str) -> URL:
+    """
+    Convert a database URL to use the dialect's async driver.
+
+    Args:
+        database_url: Database URL, e.g. ``postgresql://...`` or ``sqlite://``
+
+    Returns:
+        URL: The same URL with an async driver, e.g. ``postgresql+asyncpg://...``
+    """
+    url = make_url(database_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+# Create async database engine used by the API
+_async_url = get_async_database_url(settings.database_url)
+async_engine = create_async_engine(_async_url, **engine_options(_async_url, "async"))
+
+# Create async engines of the read replicas, if any
+replica_engines = []
+for number, replica_url in enumerate(settings.database_replica_urls):
+    _replica_url = get_async_database_url(replica_url)
+    replica_engines.append(
+        create_async_engine(
+            _replica_url, **engine_options(_replica_url, f"replica-{number}")
+        )
+    )
+
+# Route read-only sessions to the replicas
+replica_router = ReplicaRouter(
+    replica_engines,
+    sticky_seconds=settings.replica_sticky_seconds,
+    failure_cooldown_seconds=settings.replica_failure_cooldown_seconds,
+)
+
+for _engine in [engine, async_engine.sync_engine] + [
+    replica.sync_engine for replica in replica_engines
+]:
+    # Time every statement for the per-request metrics
+    if settings.metrics_enabled:
+        instrument_engine(_engine)
+    # Keep fingerprint statistics and log slow statements
+    track_queries(_engine)
+
+# Create async session factory; objects stay usable after commit
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 # Create base class for models
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
-    Dependency to get database session.
+    Dependency to get an async database session on the primary.
+
+    Queries are awaited, so a slow query suspends only its own request
+    instead of blocking the event loop. Committed writes keep the client's
+    reads on the primary for a short while; see ``get_read_db``.
+
+    Args:
+        request: Incoming request
 
     Yields:
-        Session: Database session
+        AsyncSession: Database session
 
     Example:
         ```python
         @app.get("/users")
-        def get_users(db: Session = Depends(get_db)):
-            return db.query(User).all()
+        async def get_users(db: AsyncSession = Depends(get_db)):
+            return (await db.scalars(select(User))).all()
         ```
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
+        track_writes(db, replica_router, read_key(request))
         yield db
-    finally:
-        db.close()
+
+
+async def get_read_db(
+    request: Request, db: AsyncSession = Depends(get_db)
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get a session for read-only queries, on a replica if possible.
+
+    Replicas are tried in turn; one that cannot be connected to is skipped
+    for ``replica_failure_cooldown_seconds``. The primary session from
+    ``get_db`` is used when no replica is configured or reachable, and for
+    clients that wrote within the last ``replica_sticky_seconds``, so they
+    read their own writes. The session must not be used to write, nor to
+    render responses stored in the shared response cache.
+
+    Args:
+        request: Incoming request
+        db: Primary session, used as the fallback
+
+    Yields:
+        AsyncSession: Replica or primary session
+
+    Example:
+        ```python
+        @app.get("/bookings")
+        async def list_bookings(db: AsyncSession = Depends(get_read_db)):
+            return (await db.scalars(select(Booking))).all()
+        ```
+    """
+    for replica in replica_router.candidates(read_key(request)):
+        session = AsyncSessionLocal(bind=replica)
+        try:
+            # Connect now, so a replica that is down fails over before use
+            await session.connection()
+        except (DBAPIError, OSError):
+            await session.close()
+            replica_router.mark_down(replica)
+            continue
+        replica_router.record_read(replica=True)
+        try:
+            yield session
+        finally:
+            await session.close()
+        return
+    replica_router.record_read(replica=False)
+    yield db
+
+
+def get_session_factory() -> async_sessionmaker:
+    """
+    Dependency to get the session factory, for work that outlives the request.
+
+    Sessions from ``get_db`` are closed when the endpoint returns, before a
+    streamed response body is sent. A streaming generator opens its own
+    session from this factory and closes it when the stream ends.
+
+    Returns:
+        async_sessionmaker: Factory of sessions on the primary
+    """
+    return AsyncSessionLocal
 
 
 def init_db() -> None:
@@ -64,3 +236,14 @@ def close_db() -> None:
     This should be called during application shutdown.
     """
     engine.dispose()
+
+
+async def close_async_db() -> None:
+    """
+    Close async database connections.
+
+    This should be called during application shutdown.
+    """
+    await async_engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
@@ -5,12 +5,39 @@ This module contains the main FastAPI application with all routes,
 middleware, and configuration.
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from sqlalchemy import text
 
-from app.api.v1 import auth, users, bookings
+from app.api.v1 import admin, auth, users, bookings
 from app.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.hashing import password_hasher
+from app.core.metrics import (
+    CONTENT_TYPE_LATEST,
+    MetricsMiddleware,
+    StatsCollector,
+    registry,
+)
+from app.core.pool import pool_stats
+from app.core.response_cache import response_cache
+from app.core.revocation import revocation_store
+from app.core.token_cache import token_cache
+from app.database import async_engine, close_async_db, replica_router
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.serialization import ORJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release pooled database connections and worker pools on shutdown."""
+    yield
+    await close_async_db()
+    password_hasher.shutdown()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -19,6 +46,17 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# Compress large text responses, including streamed exports
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.compression_level,
+    brotli_quality=settings.compression_brotli_quality,
+    content_types=settings.compression_content_types,
 )
 
 # Add CORS middleware
@@ -28,15 +66,59 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # Add trusted host middleware
 app.add_middleware(TrustedHostMiddleware, allowed_hosts=["localhost", "127.0.0.1"])
 
+# Record latency and SQL work per route; outermost so it times everything
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    for collector in (
+        StatsCollector(
+            "tutorflow_password_hasher",
+            "Password hashing pool",
+            password_hasher.stats,
+            counters=("completed", "total_wait_seconds"),
+        ),
+        StatsCollector(
+            "tutorflow_token_cache",
+            "Decoded token cache",
+            token_cache.stats,
+            counters=("hits", "misses"),
+        ),
+        StatsCollector(
+            "tutorflow_revocation",
+            "Token revocation checks",
+            revocation_store.stats,
+            counters=("filtered", "backend_lookups", "revoked"),
+        ),
+        StatsCollector(
+            "tutorflow_response_cache",
+            "Public response cache",
+            response_cache.stats,
+            counters=("hits", "misses", "invalidations"),
+        ),
+        StatsCollector(
+            "tutorflow_db_pool",
+            "Database connection pool",
+            lambda: pool_stats(async_engine),
+        ),
+        StatsCollector(
+            "tutorflow_db_replicas",
+            "Read replica routing",
+            replica_router.stats,
+            counters=("replica_reads", "primary_reads", "sticky_reads", "failovers"),
+        ),
+    ):
+        registry.register(collector)
+
 # Include API routes
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(users.router, prefix="/api/v1")
 app.include_router(bookings.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -51,6 +133,41 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness endpoint reporting database reachability and pool saturation.
+
+    Returns 503 without touching the database when the pool is saturated,
+    so the check never queues behind the requests it is meant to protect.
+    """
+    pool = pool_stats(async_engine)
+    report = {"status": "ready", "database": "ok", "pool": pool}
+    if pool.saturation >= settings.readiness_max_pool_saturation:
+        report.update(status="not ready", database="saturated")
+    else:
+        try:
+            async with async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        except Exception:
+            report.update(status="not ready", database="unavailable")
+    ready = report["status"] == "ready"
+    return ORJSONResponse(
+        report,
+        status_code=(
+            status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+    )
+
+
+if settings.metrics_enabled:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Metrics in the Prometheus text format."""
+        return Response(registry.render(), media_type=CONTENT_TYPE_LATEST)
+
+
 if __name__ == "__main__":
     import uvicorn
 
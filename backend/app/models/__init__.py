@@ -5,5 +5,6 @@ This package contains all SQLAlchemy models for the application.
 """
 
 from .user import User, UserRole, Tutor
+from . import search  # noqa: F401  registers search document DDL and hooks
 
 __all__ = ["User", "UserRole", "Tutor"]
@@ -0,0 +1,196 @@
+"""
+Full-text search documents for the TutorFlow application.
+
+Each tutor has one search document built from their name, subjects and bio.
+On Postgres it is a weighted ``tsvector`` in ``tutor_search_documents`` with
+a GIN index; on SQLite, used in tests and local development, it is a row of
+the FTS5 table ``tutor_search_fts`` keyed by the tutor's ID in an unindexed
+column. The implicit rowid of ``tutors`` is not used, since ``VACUUM`` may
+renumber it. Documents are rebuilt in the same transaction whenever a flush
+touches a tutor or their profile.
+
+Admin user search needs no documents: on Postgres, user emails and profile
+full names carry ``pg_trgm`` GIN indexes that serve substring and similarity
+matches directly (see ``app.services.user_search``).
+"""
+
+from typing import Iterable, List
+from uuid import UUID
+
+from sqlalchemy import (
+    DDL,
+    Connection,
+    column,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    literal,
+    literal_column,
+    select,
+    table,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models.user import Tutor, User, UserProfile
+
+# Text search configuration, written as a regconfig literal
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+tutor_search_documents = table(
+    "tutor_search_documents",
+    column("tutor_id"),
+    column("search_vector"),
+)
+tutor_search_fts = table(
+    "tutor_search_fts",
+    column("tutor_id", Tutor.__table__.c.user_id.type),
+    column("name"),
+    column("subjects"),
+    column("bio"),
+)
+
+_POSTGRES_CREATE = (
+    """
+    CREATE TABLE IF NOT EXISTS tutor_search_documents (
+        tutor_id UUID PRIMARY KEY REFERENCES tutors (user_id) ON DELETE CASCADE,
+        search_vector TSVECTOR NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_tutor_search_documents_vector "
+    "ON tutor_search_documents USING gin (search_vector)",
+)
+_SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tutor_search_fts "
+    "USING fts5(tutor_id UNINDEXED, name, subjects, bio, "
+    "tokenize = 'porter unicode61')",
+    # FTS5 tables cannot take foreign keys; drop documents with their tutor
+    "CREATE TRIGGER IF NOT EXISTS tutor_search_fts_delete AFTER DELETE ON tutors "
+    "BEGIN DELETE FROM tutor_search_fts WHERE tutor_id = OLD.user_id; END",
+)
+
+_TRIGRAM_INDEXES = (
+    (
+        User.__table__,
+        "CREATE INDEX IF NOT EXISTS ix_users_email_trgm "
+        "ON users USING gin (email gin_trgm_ops)",
+    ),
+    (
+        UserProfile.__table__,
+        "CREATE INDEX IF NOT EXISTS ix_user_profiles_name_trgm ON user_profiles "
+        "USING gin ((first_name || ' ' || last_name) gin_trgm_ops)",
+    ),
+)
+
+event.listen(
+    User.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+for _table, _statement in _TRIGRAM_INDEXES:
+    event.listen(
+        _table, "after_create", DDL(_statement).execute_if(dialect="postgresql")
+    )
+for _statement in _POSTGRES_CREATE:
+    event.listen(
+        Tutor.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+for _statement in _SQLITE_CREATE:
+    event.listen(
+        Tutor.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+event.listen(
+    Tutor.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tutor_search_documents").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Tutor.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tutor_search_fts").execute_if(dialect="sqlite"),
+)
+
+
+def _document_source(tutor_ids: List[UUID], *columns):
+    """Select ``columns`` from tutors joined to their profile."""
+    return (
+        select(*columns)
+        .select_from(Tutor)
+        .outerjoin(UserProfile, UserProfile.user_id == Tutor.user_id)
+        .where(Tutor.user_id.in_(tutor_ids))
+    )
+
+
+def refresh_tutor_search(connection: Connection, tutor_ids: Iterable[UUID]) -> None:
+    """
+    Rebuild the search documents of ``tutor_ids`` from their current rows.
+
+    Args:
+        connection: Connection inside the writing transaction
+        tutor_ids: Tutors whose name, subjects or bio may have changed
+    """
+    tutor_ids = list(tutor_ids)
+    if not tutor_ids:
+        return
+    name = func.coalesce(UserProfile.first_name, "") + literal(" ")
+    name = name + func.coalesce(UserProfile.last_name, "")
+    subjects = func.coalesce(Tutor.subjects, "")
+    bio = func.coalesce(UserProfile.bio, "")
+
+    if connection.dialect.name == "postgresql":
+
+        def weighted(text_, weight):
+            return func.setweight(
+                func.to_tsvector(SEARCH_CONFIG, text_), literal_column(f"'{weight}'")
+            )
+
+        vector = weighted(name, "A").op("||")(weighted(subjects, "A"))
+        vector = vector.op("||")(weighted(bio, "B"))
+        statement = postgresql.insert(tutor_search_documents).from_select(
+            ["tutor_id", "search_vector"],
+            _document_source(tutor_ids, Tutor.user_id, vector),
+        )
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=["tutor_id"],
+                set_={"search_vector": statement.excluded.search_vector},
+            )
+        )
+    elif connection.dialect.name == "sqlite":
+        connection.execute(
+            delete(tutor_search_fts).where(tutor_search_fts.c.tutor_id.in_(tutor_ids))
+        )
+        connection.execute(
+            insert(tutor_search_fts).from_select(
+                ["tutor_id", "name", "subjects", "bio"],
+                _document_source(tutor_ids, Tutor.user_id, name, subjects, bio),
+            )
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_changed_tutors(session, flush_context) -> None:
+    """Rebuild search documents for tutors whose searchable fields changed."""
+    tutor_ids = set()
+    for instance in [*session.new, *session.dirty]:
+        if isinstance(instance, Tutor):
+            fields = ("subjects",)
+            tutor_id = instance.user_id
+        elif isinstance(instance, UserProfile):
+            fields = ("first_name", "last_name", "bio")
+            tutor_id = instance.user_id
+        else:
+            continue
+        state = inspect(instance)
+        if instance in session.new or any(
+            state.attrs[field].history.has_changes() for field in fields
+        ):
+            tutor_ids.add(tutor_id)
+    if tutor_ids:
+        refresh_tutor_search(session.connection(), tutor_ids)
@@ -2,8 +2,9 @@
 User models for the TutorFlow application.
 """
 
-from datetime import datetime
-from typing import Optional
+import json
+from datetime import datetime, timedelta
+from typing import List, Optional
 from sqlalchemy import (
     Column,
     String,
@@ -13,10 +14,22 @@ from sqlalchemy import (
     Text,
     Float,
     Integer,
+    Interval,
     ForeignKey,
+    Index,
+    DDL,
+    and_,
+    bindparam,
+    delete,
+    event,
+    func,
+    inspect,
+    literal_column,
+    select,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
+from sqlalchemy.orm import Session, relationship
 from sqlmodel import SQLModel, Field
 import uuid
 from enum import Enum as PyEnum
@@ -43,25 +56,37 @@ class User(Base):
     password_hash: str = Column(String(255), nullable=False)
     role: UserRole = Column(SAEnum(UserRole, name="user_role"), nullable=False)
     is_active: bool = Column(Boolean, default=True)
+    # Bumped whenever role or status changes; tokens with an older value are rejected
+    token_version: int = Column(Integer, nullable=False, default=0, server_default="0")
     created_at: datetime = Column(DateTime, default=datetime.utcnow)
     updated_at: datetime = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
-    # Relationships
-    profile = relationship("UserProfile", back_populates="user", uselist=False)
-    tutor_profile = relationship("Tutor", back_populates="user", uselist=False)
+    # Relationships; never loaded implicitly, so a forgotten selectinload or
+    # joinedload fails loudly instead of issuing a query per row
+    profile = relationship(
+        "UserProfile", back_populates="user", uselist=False, lazy="raise_on_sql"
+    )
+    tutor_profile = relationship(
+        "Tutor", back_populates="user", uselist=False, lazy="raise_on_sql"
+    )
     student_bookings = relationship(
         "Booking",
         foreign_keys=lambda: [Booking.student_id],
         back_populates="student",
+        lazy="raise_on_sql",
     )
     tutor_bookings = relationship(
         "Booking",
         foreign_keys=lambda: [Booking.tutor_id],
         back_populates="tutor",
+        lazy="raise_on_sql",
     )
 
+    # Keyset pagination order for the admin user list
+    __table_args__ = (Index("ix_users_created_id", "created_at", "id"),)
+
     def __repr__(self) -> str:
         return f"<User(id={self.id}, email={self.email}, role={self.role})>"
 
@@ -84,7 +109,7 @@ class UserProfile(Base):
     )
 
     # Relationships
-    user = relationship("User", back_populates="profile")
+    user = relationship("User", back_populates="profile", lazy="raise_on_sql")
 
     def __repr__(self) -> str:
         return f"<UserProfile(user_id={self.user_id}, name={self.first_name} {self.last_name})>"
@@ -109,12 +134,110 @@ class Tutor(Base):
     )
 
     # Relationships
-    user = relationship("User", back_populates="tutor_profile")
+    user = relationship("User", back_populates="tutor_profile", lazy="raise_on_sql")
+    # Search rows kept in step with ``subjects``; never loaded, only added to
+    subject_rows = relationship(
+        "TutorSubject", lazy="write_only", cascade="save-update", passive_deletes=True
+    )
+
+    __table_args__ = (
+        Index("ix_tutors_verified_rate", "is_verified", "hourly_rate"),
+        Index("ix_tutors_created_user", "created_at", "user_id"),
+    )
 
     def __repr__(self) -> str:
         return f"<Tutor(user_id={self.user_id}, hourly_rate={self.hourly_rate})>"
 
 
+class TutorSubject(Base):
+    """One normalized subject a tutor teaches, used for indexed search."""
+
+    __tablename__ = "tutor_subjects"
+
+    tutor_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("tutors.user_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    subject = Column(String(100), primary_key=True)
+
+    __table_args__ = (Index("ix_tutor_subjects_subject", "subject", "tutor_id"),)
+
+    def __repr__(self) -> str:
+        return f"<TutorSubject(tutor_id={self.tutor_id}, subject={self.subject})>"
+
+
+def normalize_subject(subject: str) -> str:
+    """Return the search key for a subject name: trimmed and lower-cased."""
+    return " ".join(str(subject).split()).lower()[:100]
+
+
+def subject_keys(subjects_json: Optional[str]) -> List[str]:
+    """
+    Return the distinct search keys for a tutor's JSON list of subjects.
+
+    Args:
+        subjects_json: ``Tutor.subjects`` value
+
+    Returns:
+        List[str]: Normalized subjects, in their original order
+    """
+    try:
+        subjects = json.loads(subjects_json or "[]")
+    except (ValueError, TypeError):
+        return []
+    if not isinstance(subjects, list):
+        return []
+    keys = (normalize_subject(subject) for subject in subjects)
+    return list(dict.fromkeys(key for key in keys if key))
+
+
+@event.listens_for(Session, "before_flush")
+def _sync_tutor_subjects(session, flush_context, instances) -> None:
+    """Rewrite a tutor's subject rows whenever ``Tutor.subjects`` changes."""
+    for tutor in [*session.new, *session.dirty]:
+        if not isinstance(tutor, Tutor):
+            continue
+        if not inspect(tutor).attrs.subjects.history.has_changes():
+            continue
+        if tutor not in session.new:
+            session.execute(
+                delete(TutorSubject).where(TutorSubject.tutor_id == tutor.user_id)
+            )
+        tutor.subject_rows.add_all(
+            TutorSubject(subject=key) for key in subject_keys(tutor.subjects)
+        )
+
+
+def tutor_subject_filter(subject: str, prefix: bool = False):
+    """
+    Filter for tutors who teach ``subject``, served by the subject index.
+
+    A prefix match is written as a range on the normalized key, which both
+    Postgres and SQLite answer from ``ix_tutor_subjects_subject`` regardless
+    of collation; the ``LIKE`` only removes strings the collation sorts into
+    the range without sharing the prefix.
+
+    Args:
+        subject: Subject name, or its beginning when ``prefix`` is set
+        prefix: Match subjects starting with ``subject`` instead of equal to it
+
+    Returns:
+        ColumnElement: ``tutors.user_id IN (SELECT tutor_id ...)``
+    """
+    key = normalize_subject(subject)
+    if not prefix:
+        condition = TutorSubject.subject == key
+    else:
+        upper = key[:-1] + chr(ord(key[-1]) + 1) if key else None
+        conditions = [TutorSubject.subject >= key]
+        if upper is not None:
+            conditions.append(TutorSubject.subject < upper)
+        conditions.append(TutorSubject.subject.startswith(key, autoescape=True))
+        condition = and_(*conditions)
+    return Tutor.user_id.in_(select(TutorSubject.tutor_id).where(condition))
+
+
 class StudentParent(Base):
     """Student-parent relationship mapping."""
 
@@ -215,6 +338,20 @@ class BookingStatus(str, PyEnumBase):
     NO_SHOW = "no_show"
 
 
+# Statuses for which a booking still holds its time slot
+ACTIVE_BOOKING_STATUSES = (BookingStatus.CONFIRMED, BookingStatus.PENDING)
+
+# Partial index predicate; must match active_booking_filter() as rendered
+_ACTIVE_BOOKING_PREDICATE = text("status IN ('CONFIRMED', 'PENDING')")
+
+# Name of the database-enforced "no overlapping active bookings" rule
+BOOKING_OVERLAP_CONSTRAINT = "bookings_no_overlap"
+
+# Time kept free between two active bookings of the same tutor
+BOOKING_BUFFER = timedelta(minutes=15)
+_BUFFER_MINUTES = int(BOOKING_BUFFER.total_seconds() // 60)
+
+
 class Booking(Base):
     """Booking model."""
 
@@ -237,8 +374,131 @@ class Booking(Base):
 
     # Relationships
     student = relationship(
-        "User", foreign_keys=[student_id], back_populates="student_bookings"
+        "User",
+        foreign_keys=[student_id],
+        back_populates="student_bookings",
+        lazy="raise_on_sql",
     )
     tutor = relationship(
-        "User", foreign_keys=[tutor_id], back_populates="tutor_bookings"
+        "User",
+        foreign_keys=[tutor_id],
+        back_populates="tutor_bookings",
+        lazy="raise_on_sql",
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_bookings_tutor_active_time",
+            "tutor_id",
+            "start_time",
+            "end_time",
+            postgresql_where=_ACTIVE_BOOKING_PREDICATE,
+            sqlite_where=_ACTIVE_BOOKING_PREDICATE,
+        ),
+        Index("ix_bookings_tutor_start", "tutor_id", "start_time"),
+        Index("ix_bookings_student_start", "student_id", "start_time"),
+        Index("ix_bookings_start_id", "start_time", "id"),
+        ExcludeConstraint(
+            (tutor_id, "="),
+            (
+                func.tsrange(
+                    start_time,
+                    end_time
+                    + literal_column(f"interval '{_BUFFER_MINUTES} minutes'", Interval),
+                ),
+                "&&",
+            ),
+            name=BOOKING_OVERLAP_CONSTRAINT,
+            using="gist",
+            where=_ACTIVE_BOOKING_PREDICATE,
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+# The exclusion constraint needs btree_gist for the UUID equality operator
+event.listen(
+    Booking.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+
+
+def _sqlite_shifted(moment: str, minutes: int) -> str:
+    """SQLite expression for ``moment`` plus ``minutes``, in stored format."""
+    # strftime keeps milliseconds; pad to the six digits SQLAlchemy stores,
+    # so the result compares as text with stored values
+    return f"strftime('%Y-%m-%d %H:%M:%f', {moment}, '{minutes:+d} minutes') || '000'"
+
+
+# SQLite has no exclusion constraints; enforce the same rule with triggers,
+# which run inside the write lock and so cannot race each other
+_SQLITE_OVERLAP_CHECK = f"""
+    WHEN NEW.status IN ('CONFIRMED', 'PENDING') AND EXISTS (
+        SELECT 1 FROM bookings
+        WHERE bookings.tutor_id = NEW.tutor_id
+          AND bookings.status IN ('CONFIRMED', 'PENDING')
+          AND bookings.start_time < {_sqlite_shifted("NEW.end_time", _BUFFER_MINUTES)}
+          AND bookings.end_time > {_sqlite_shifted("NEW.start_time", -_BUFFER_MINUTES)}
+          AND bookings.id IS NOT NEW.id
+    )
+    BEGIN
+        SELECT RAISE(ABORT, '{BOOKING_OVERLAP_CONSTRAINT}');
+    END
+"""
+SQLITE_OVERLAP_TRIGGERS = (
+    f"CREATE TRIGGER {BOOKING_OVERLAP_CONSTRAINT}_insert "
+    f"BEFORE INSERT ON bookings {_SQLITE_OVERLAP_CHECK}",
+    f"CREATE TRIGGER {BOOKING_OVERLAP_CONSTRAINT}_update "
+    f"BEFORE UPDATE OF tutor_id, start_time, end_time, status ON bookings "
+    f"{_SQLITE_OVERLAP_CHECK}",
+)
+for _trigger in SQLITE_OVERLAP_TRIGGERS:
+    event.listen(
+        Booking.__table__,
+        "after_create",
+        # DDL applies %-formatting to its statement
+        DDL(_trigger.replace("%", "%%")).execute_if(dialect="sqlite"),
+    )
+
+
+def active_booking_filter():
+    """
+    Filter for bookings that still hold their time slot.
+
+    The statuses are rendered as literals rather than bound parameters so
+    that the planner can match the partial overlap index.
+
+    Returns:
+        ColumnElement: ``bookings.status IN ('CONFIRMED', 'PENDING')``
+    """
+    return Booking.status.in_(
+        bindparam(
+            "active_statuses",
+            list(ACTIVE_BOOKING_STATUSES),
+            expanding=True,
+            literal_execute=True,
+            unique=True,
+        )
+    )
+
+
+def booking_conflict_filter(start_time: datetime, end_time: datetime):
+    """
+    Filter for active bookings that ``[start_time, end_time)`` would clash with.
+
+    Two active bookings of a tutor clash unless ``BOOKING_BUFFER`` separates
+    them, whichever comes first. This is the rule the overlap constraint and
+    the SQLite triggers enforce, so a period found free here can be booked.
+
+    Args:
+        start_time: Start of the requested period
+        end_time: End of the requested period
+
+    Returns:
+        ColumnElement: Condition on ``bookings``, to combine with the tutor
+    """
+    return and_(
+        Booking.start_time < end_time + BOOKING_BUFFER,
+        Booking.end_time > start_time - BOOKING_BUFFER,
+        active_booking_filter(),
     )
@@ -0,0 +1,22 @@
+"""
+Admin schemas for TutorFlow backend.
+
+This module contains Pydantic models for admin-only diagnostics
+responses.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class QueryStatsEntry(BaseModel):
+    """Statistics of one SQL statement fingerprint."""
+
+    fingerprint: str = Field(..., description="SQL with literals replaced by ?")
+    count: int = Field(..., description="Runs since the process started")
+    slow_count: int = Field(..., description="Runs over the slow query threshold")
+    total_seconds: float = Field(..., description="Total time of all runs")
+    mean_seconds: float = Field(..., description="Mean time per run")
+    p50_seconds: float = Field(..., description="Median of recent runs")
+    p95_seconds: float = Field(..., description="95th percentile of recent runs")
+    p99_seconds: float = Field(..., description="99th percentile of recent runs")
+    max_seconds: float = Field(..., description="Slowest run")
@@ -72,6 +72,14 @@ class TokenRefreshResponse(BaseModel):
     token_type: str = Field(..., description="Token type (bearer)")
 
 
+class LogoutRequest(BaseModel):
+    """Request model for logout."""
+
+    refresh_token: Optional[str] = Field(
+        None, description="JWT refresh token to revoke along with the access token"
+    )
+
+
 class CurrentUserResponse(BaseModel):
     """Response model for current user information."""
 
@@ -16,7 +16,7 @@ from app.models.user import BookingStatus
 class BookingCreate(BaseModel):
     """Booking creation request model."""
 
-    tutor_id: str = Field(..., description="Tutor ID")
+    tutor_id: UUID = Field(..., description="Tutor ID")
     subject: str = Field(
         ..., min_length=1, max_length=100, description="Subject being tutored"
     )
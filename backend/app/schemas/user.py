@@ -8,6 +8,7 @@ requests and responses.
 from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import Optional
+from uuid import UUID
 
 from app.models.user import UserRole
 
@@ -15,7 +16,7 @@ from app.models.user import UserRole
 class UserProfile(BaseModel):
     """User profile response model."""
 
-    id: int = Field(..., description="User ID")
+    id: UUID = Field(..., description="User ID")
     email: str = Field(..., description="User email address")
     first_name: str = Field(..., description="User first name")
     last_name: str = Field(..., description="User last name")
@@ -39,7 +40,7 @@ class UserProfileUpdate(BaseModel):
 class UserList(BaseModel):
     """User list item model."""
 
-    id: int = Field(..., description="User ID")
+    id: UUID = Field(..., description="User ID")
     email: str = Field(..., description="User email address")
     first_name: str = Field(..., description="User first name")
     last_name: str = Field(..., description="User last name")
@@ -51,7 +52,7 @@ class UserList(BaseModel):
 class UserDetail(BaseModel):
     """Detailed user information model."""
 
-    id: int = Field(..., description="User ID")
+    id: UUID = Field(..., description="User ID")
     email: str = Field(..., description="User email address")
     first_name: str = Field(..., description="User first name")
     last_name: str = Field(..., description="User last name")
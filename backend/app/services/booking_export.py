@@ -0,0 +1,153 @@
+"""
+Booking export for TutorFlow backend.
+
+This module streams bookings as newline-delimited JSON or CSV. Rows are read
+through a server-side cursor in batches of plain column tuples, and each
+batch is serialized and handed to the response before the next one is
+fetched, so memory use does not grow with the size of the table.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import Booking, BookingStatus
+
+# Media type of each supported export format
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+EXPORT_COLUMNS = (
+    Booking.id,
+    Booking.student_id,
+    Booking.tutor_id,
+    Booking.subject,
+    Booking.start_time,
+    Booking.end_time,
+    Booking.status,
+    Booking.notes,
+    Booking.created_at,
+)
+EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS)
+
+
+def booking_export_query(
+    status: Optional[BookingStatus] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Select:
+    """
+    Build the query for a booking export, ordered by booking ID.
+
+    Args:
+        status: Only export bookings with this status
+        start_date: Only export bookings starting on or after this date
+        end_date: Only export bookings ending on or before this date
+
+    Returns:
+        Select: Query returning one tuple of ``EXPORT_COLUMNS`` per booking
+    """
+    query = select(*EXPORT_COLUMNS).order_by(Booking.id)
+    if status:
+        query = query.where(Booking.status == status)
+    if start_date:
+        query = query.where(Booking.start_time >= start_date)
+    if end_date:
+        query = query.where(Booking.end_time <= end_date)
+    return query
+
+
+def _export_value(value: Any) -> Any:
+    """Convert a column value to its JSON or CSV representation."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def format_ndjson(rows: Sequence[Sequence[Any]]) -> str:
+    """
+    Serialize rows as newline-delimited JSON objects.
+
+    Args:
+        rows: Tuples of ``EXPORT_COLUMNS`` values
+
+    Returns:
+        str: One JSON object per row, each followed by a newline
+    """
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, map(_export_value, row)))) + "\n"
+        for row in rows
+    )
+
+
+def format_csv(rows: Sequence[Sequence[Any]], header: bool = False) -> str:
+    """
+    Serialize rows as CSV records.
+
+    Args:
+        rows: Tuples of ``EXPORT_COLUMNS`` values
+        header: Whether to start with a header record of field names
+
+    Returns:
+        str: CSV records terminated by CRLF
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows([_export_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def stream_booking_export(
+    session_factory: Callable[[], AsyncSession],
+    query: Select,
+    export_format: str,
+    batch_size: int,
+) -> AsyncIterator[str]:
+    """
+    Stream the rows of ``query`` in an export format.
+
+    The stream runs on a session of its own, closed when the stream is
+    exhausted or closed, since the request's session is already closed by
+    the time the response body is sent.
+
+    Args:
+        session_factory: Factory of the session the stream reads from
+        query: Query from ``booking_export_query``
+        export_format: ``"ndjson"`` or ``"csv"``
+        batch_size: Rows fetched from the cursor per chunk
+
+    Yields:
+        str: Serialized chunks of at most ``batch_size`` rows
+
+    Raises:
+        ValueError: If the export format is not supported
+    """
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    if export_format == "csv":
+        yield format_csv((), header=True)
+    async with session_factory() as session:
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        try:
+            async for rows in result.partitions():
+                if export_format == "csv":
+                    yield format_csv(rows)
+                else:
+                    yield format_ndjson(rows)
+        finally:
+            await result.close()
@@ -7,11 +7,168 @@ including conflict detection and validation.
 
 from datetime import datetime, timedelta
 from typing import List, Optional
+from sqlalchemy import Select, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.models.user import Booking, BookingStatus
+from app.models.user import (
+    BOOKING_OVERLAP_CONSTRAINT,
+    Booking,
+    BookingStatus,
+    booking_conflict_filter,
+)
 from app.models.user import User, UserRole
 from app.schemas.booking import BookingCreate, AvailabilityRequest
+from app.services.slot_engine import AvailabilityGrid
+
+
+class BookingConflictError(ValueError):
+    """Raised when a booking would overlap an active booking of the same tutor."""
+
+
+def is_booking_overlap_error(exc: IntegrityError) -> bool:
+    """
+    Check whether an integrity error comes from the booking overlap rule.
+
+    Args:
+        exc: Integrity error raised on flush or commit
+
+    Returns:
+        bool: True if the no-overlap constraint (or trigger) rejected the row
+    """
+    return BOOKING_OVERLAP_CONSTRAINT in str(exc.orig)
+
+
+def _conflict_error(exc: IntegrityError) -> Exception:
+    """Map an integrity error to the exception the caller should see."""
+    if is_booking_overlap_error(exc):
+        error = BookingConflictError("Booking time conflicts with existing booking")
+        error.__cause__ = exc
+        return error
+    return exc
+
+
+def _busy_intervals_query(tutor_id, start_time: datetime, end_time: datetime) -> Select:
+    """Build the query for active bookings too close to a requested period."""
+    return select(Booking.start_time, Booking.end_time).where(
+        Booking.tutor_id == tutor_id,
+        booking_conflict_filter(start_time, end_time),
+    )
+
+
+def _bookings_query(
+    owner_column,
+    owner_id,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Select:
+    """Build the query for one tutor's or student's bookings in a date range."""
+    query = select(Booking).where(owner_column == owner_id)
+
+    if start_date:
+        query = query.where(Booking.start_time >= start_date)
+
+    if end_date:
+        query = query.where(Booking.end_time <= end_date)
+
+    return query.order_by(Booking.start_time)
+
+
+def _validate_new_booking(booking_data: BookingCreate) -> None:
+    """Reject bookings that end before they start or start in the past."""
+    if booking_data.start_time >= booking_data.end_time:
+        raise ValueError("Start time must be before end time")
+
+    if booking_data.start_time < datetime.utcnow():
+        raise ValueError("Cannot book sessions in the past")
+
+
+def _new_booking(booking_data: BookingCreate, student_id) -> Booking:
+    """Build a pending booking from creation data."""
+    return Booking(
+        student_id=student_id,
+        tutor_id=booking_data.tutor_id,
+        subject=booking_data.subject,
+        start_time=booking_data.start_time,
+        end_time=booking_data.end_time,
+        notes=booking_data.notes,
+        status=BookingStatus.PENDING,
+    )
+
+
+def _check_cancellation(booking: Optional[Booking], user_id, user_role) -> None:
+    """Raise if ``user_id`` may not cancel ``booking`` right now."""
+    if not booking:
+        raise ValueError("Booking not found")
+
+    # Check authorization
+    if (
+        user_role != UserRole.ADMIN
+        and booking.student_id != user_id
+        and booking.tutor_id != user_id
+    ):
+        raise ValueError("Not authorized to cancel this booking")
+
+    # Check if cancellation is allowed
+    if booking.status not in [BookingStatus.PENDING, BookingStatus.CONFIRMED]:
+        raise ValueError("Cannot cancel booking with current status")
+
+    # Check cancellation window (e.g., 24 hours before session)
+    if booking.start_time - datetime.utcnow() < timedelta(hours=24):
+        raise ValueError("Cannot cancel booking within 24 hours of session")
+
+
+def save_booking(db: Session, booking: Booking) -> Booking:
+    """
+    Insert a booking, relying on the database to reject overlaps.
+
+    The overlap rule is enforced by an exclusion constraint (Postgres) or
+    triggers (SQLite), so concurrent requests for the same slot cannot both
+    succeed and no separate conflict query is needed.
+
+    Args:
+        db: Database session
+        booking: New booking to insert
+
+    Returns:
+        Booking: Inserted booking
+
+    Raises:
+        BookingConflictError: If the booking overlaps an active booking
+    """
+    db.add(booking)
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise _conflict_error(exc)
+    db.refresh(booking)
+    return booking
+
+
+async def async_save_booking(db: AsyncSession, booking: Booking) -> Booking:
+    """
+    Insert a booking through an async session; see ``save_booking``.
+
+    Args:
+        db: Async database session
+        booking: New booking to insert
+
+    Returns:
+        Booking: Inserted booking
+
+    Raises:
+        BookingConflictError: If the booking overlaps an active booking
+    """
+    db.add(booking)
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise _conflict_error(exc)
+    await db.refresh(booking)
+    return booking
 
 
 class BookingService:
@@ -27,6 +184,10 @@ class BookingService:
         """
         Check if a tutor is available for a given time period.
 
+        Existing bookings are folded into a slot bitmap and checked against
+        the requested period; the buffer must separate the period from every
+        booking on both sides, as the database overlap rule requires.
+
         Args:
             tutor_id: ID of the tutor to check
             start_time: Start time of the requested period
@@ -35,18 +196,11 @@ class BookingService:
         Returns:
             bool: True if available, False otherwise
         """
-        conflicting_bookings = (
-            self.db.query(Booking)
-            .filter(
-                Booking.tutor_id == tutor_id,
-                Booking.start_time < end_time,
-                Booking.end_time > start_time,
-                Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
-            )
-            .count()
-        )
+        bookings = self.db.execute(
+            _busy_intervals_query(tutor_id, start_time, end_time)
+        ).all()
 
-        return conflicting_bookings == 0
+        return AvailabilityGrid(bookings=bookings).is_free(start_time, end_time)
 
     def get_tutor_bookings(
         self,
@@ -65,15 +219,8 @@ class BookingService:
         Returns:
             List[Booking]: List of tutor's bookings
         """
-        query = self.db.query(Booking).filter(Booking.tutor_id == tutor_id)
-
-        if start_date:
-            query = query.filter(Booking.start_time >= start_date)
-
-        if end_date:
-            query = query.filter(Booking.end_time <= end_date)
-
-        return query.order_by(Booking.start_time).all()
+        query = _bookings_query(Booking.tutor_id, tutor_id, start_date, end_date)
+        return list(self.db.scalars(query))
 
     def get_student_bookings(
         self,
@@ -92,15 +239,8 @@ class BookingService:
         Returns:
             List[Booking]: List of student's bookings
         """
-        query = self.db.query(Booking).filter(Booking.student_id == student_id)
-
-        if start_date:
-            query = query.filter(Booking.start_time >= start_date)
-
-        if end_date:
-            query = query.filter(Booking.end_time <= end_date)
-
-        return query.order_by(Booking.start_time).all()
+        query = _bookings_query(Booking.student_id, student_id, start_date, end_date)
+        return list(self.db.scalars(query))
 
     def create_booking(self, booking_data: BookingCreate, student_id: int) -> Booking:
         """
@@ -115,13 +255,9 @@ class BookingService:
 
         Raises:
             ValueError: If validation fails
+            BookingConflictError: If the slot was taken concurrently
         """
-        # Validate booking time
-        if booking_data.start_time >= booking_data.end_time:
-            raise ValueError("Start time must be before end time")
-
-        if booking_data.start_time < datetime.utcnow():
-            raise ValueError("Cannot book sessions in the past")
+        _validate_new_booking(booking_data)
 
         # Check availability
         if not self.check_availability(
@@ -129,22 +265,7 @@ class BookingService:
         ):
             raise ValueError("Tutor is not available for the requested time")
 
-        # Create booking
-        booking = Booking(
-            student_id=student_id,
-            tutor_id=booking_data.tutor_id,
-            subject=booking_data.subject,
-            start_time=booking_data.start_time,
-            end_time=booking_data.end_time,
-            notes=booking_data.notes,
-            status=BookingStatus.PENDING,
-        )
-
-        self.db.add(booking)
-        self.db.commit()
-        self.db.refresh(booking)
-
-        return booking
+        return save_booking(self.db, _new_booking(booking_data, student_id))
 
     def cancel_booking(
         self, booking_id: int, user_id: int, user_role: UserRole
@@ -163,29 +284,129 @@ class BookingService:
         Raises:
             ValueError: If cancellation is not allowed
         """
-        booking = self.db.query(Booking).filter(Booking.id == booking_id).first()
+        booking = self.db.get(Booking, booking_id)
+        _check_cancellation(booking, user_id, user_role)
+
+        booking.status = BookingStatus.CANCELLED
+        self.db.commit()
+        self.db.refresh(booking)
+
+        return booking
+
+
+class AsyncBookingService:
+    """Async counterpart of ``BookingService`` for request handlers."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize booking service with async database session."""
+        self.db = db
+
+    async def check_availability(
+        self, tutor_id, start_time: datetime, end_time: datetime
+    ) -> bool:
+        """
+        Check if a tutor is available for a given time period.
+
+        Args:
+            tutor_id: ID of the tutor to check
+            start_time: Start time of the requested period
+            end_time: End time of the requested period
+
+        Returns:
+            bool: True if available, False otherwise
+        """
+        result = await self.db.execute(
+            _busy_intervals_query(tutor_id, start_time, end_time)
+        )
 
-        if not booking:
-            raise ValueError("Booking not found")
+        return AvailabilityGrid(bookings=result.all()).is_free(start_time, end_time)
 
-        # Check authorization
-        if (
-            user_role != UserRole.ADMIN
-            and booking.student_id != user_id
-            and booking.tutor_id != user_id
+    async def get_tutor_bookings(
+        self,
+        tutor_id,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Booking]:
+        """
+        Get all bookings for a tutor within an optional date range.
+
+        Args:
+            tutor_id: ID of the tutor
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+
+        Returns:
+            List[Booking]: List of tutor's bookings
+        """
+        query = _bookings_query(Booking.tutor_id, tutor_id, start_date, end_date)
+        return list(await self.db.scalars(query))
+
+    async def get_student_bookings(
+        self,
+        student_id,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Booking]:
+        """
+        Get all bookings for a student within an optional date range.
+
+        Args:
+            student_id: ID of the student
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+
+        Returns:
+            List[Booking]: List of student's bookings
+        """
+        query = _bookings_query(Booking.student_id, student_id, start_date, end_date)
+        return list(await self.db.scalars(query))
+
+    async def create_booking(self, booking_data: BookingCreate, student_id) -> Booking:
+        """
+        Create a new booking with validation.
+
+        Args:
+            booking_data: Booking creation data
+            student_id: ID of the student making the booking
+
+        Returns:
+            Booking: Created booking
+
+        Raises:
+            ValueError: If validation fails
+            BookingConflictError: If the slot was taken concurrently
+        """
+        _validate_new_booking(booking_data)
+
+        if not await self.check_availability(
+            booking_data.tutor_id, booking_data.start_time, booking_data.end_time
         ):
-            raise ValueError("Not authorized to cancel this booking")
+            raise ValueError("Tutor is not available for the requested time")
+
+        return await async_save_booking(self.db, _new_booking(booking_data, student_id))
 
-        # Check if cancellation is allowed
-        if booking.status not in [BookingStatus.PENDING, BookingStatus.CONFIRMED]:
-            raise ValueError("Cannot cancel booking with current status")
+    async def cancel_booking(
+        self, booking_id: int, user_id, user_role: UserRole
+    ) -> Booking:
+        """
+        Cancel a booking with proper authorization.
+
+        Args:
+            booking_id: ID of the booking to cancel
+            user_id: ID of the user requesting cancellation
+            user_role: Role of the user requesting cancellation
 
-        # Check cancellation window (e.g., 24 hours before session)
-        if booking.start_time - datetime.utcnow() < timedelta(hours=24):
-            raise ValueError("Cannot cancel booking within 24 hours of session")
+        Returns:
+            Booking: Updated booking
+
+        Raises:
+            ValueError: If cancellation is not allowed
+        """
+        booking = await self.db.get(Booking, booking_id)
+        _check_cancellation(booking, user_id, user_role)
 
         booking.status = BookingStatus.CANCELLED
-        self.db.commit()
-        self.db.refresh(booking)
+        await self.db.commit()
+        await self.db.refresh(booking)
 
         return booking
@@ -0,0 +1,339 @@
+"""
+Slot engine for TutorFlow backend.
+
+This module represents each tutor-day as a fixed-width bitmap of 15-minute
+slots (96 bits per day). Weekly schedules and booking intervals are folded
+into bitmaps once, after which slot lookups and availability checks are a
+handful of bitwise operations regardless of how many bookings a tutor has.
+"""
+
+import json
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.models.user import BOOKING_BUFFER
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+FULL_DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+
+WEEKDAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+
+_ONE_DAY = timedelta(days=1)
+
+
+def range_mask(first_slot: int, last_slot: int) -> int:
+    """
+    Build a bitmap with bits ``first_slot`` to ``last_slot - 1`` set.
+
+    Args:
+        first_slot: Index of the first slot (inclusive)
+        last_slot: Index of the last slot (exclusive)
+
+    Returns:
+        int: Slot bitmap, clipped to a single day
+    """
+    first_slot = max(first_slot, 0)
+    last_slot = min(last_slot, SLOTS_PER_DAY)
+    if last_slot <= first_slot:
+        return 0
+    return ((1 << (last_slot - first_slot)) - 1) << first_slot
+
+
+def _parse_minutes(value: str) -> int:
+    """Convert an ``HH:MM`` string to minutes since midnight."""
+    hours, minutes = value.split(":")
+    total = int(hours) * 60 + int(minutes)
+    if not 0 <= total <= 24 * 60:
+        raise ValueError(f"Time out of range: {value}")
+    return total
+
+
+@lru_cache(maxsize=4096)
+def weekly_masks(availability_schedule: Optional[str]) -> Tuple[int, ...]:
+    """
+    Parse a tutor's weekly schedule JSON into one open-slot bitmap per weekday.
+
+    Results are cached on the raw JSON string, so the schedule of a tutor is
+    parsed once and reused until it changes. Blocks that do not fall on slot
+    boundaries are shrunk inwards to the nearest whole slot.
+
+    Args:
+        availability_schedule: JSON string mapping weekday names to
+            ``[["HH:MM", "HH:MM"], ...]`` blocks
+
+    Returns:
+        Tuple[int, ...]: Seven bitmaps indexed by ``date.weekday()``; all zero
+        if the schedule is missing or malformed
+    """
+    if not availability_schedule:
+        return (0,) * 7
+    try:
+        schedule = json.loads(availability_schedule)
+        masks = []
+        for weekday in WEEKDAYS:
+            mask = 0
+            for block in schedule.get(weekday, []) or []:
+                start = _parse_minutes(block[0])
+                end = _parse_minutes(block[1])
+                mask |= range_mask(-(-start // SLOT_MINUTES), end // SLOT_MINUTES)
+            masks.append(mask)
+    except (ValueError, TypeError, AttributeError, IndexError):
+        return (0,) * 7
+    return tuple(masks)
+
+
+def interval_mask(start: datetime, end: datetime, day: date) -> int:
+    """
+    Build the bitmap of slots on ``day`` that overlap ``[start, end)``.
+
+    Partially covered slots count as covered, so the result is conservative
+    for intervals that do not fall on slot boundaries.
+
+    Args:
+        start: Interval start
+        end: Interval end
+        day: Day to project the interval onto
+
+    Returns:
+        int: Slot bitmap for the given day
+    """
+    day_start = datetime.combine(day, time(0, 0))
+    start_minutes = (start - day_start).total_seconds() / 60
+    end_minutes = (end - day_start).total_seconds() / 60
+    first_slot = int(start_minutes // SLOT_MINUTES)
+    last_slot = -int(-end_minutes // SLOT_MINUTES)
+    return range_mask(first_slot, last_slot)
+
+
+def start_mask(free_mask: int, duration: int) -> int:
+    """
+    Compute the slots at which a session of ``duration`` minutes can start.
+
+    A start slot is valid when it and the following slots covering the
+    session are all free, which is the AND of the free bitmap with itself
+    shifted by each covered slot.
+
+    Args:
+        free_mask: Bitmap of free slots
+        duration: Session duration in minutes
+
+    Returns:
+        int: Bitmap of valid start slots
+    """
+    slots_needed = -(-duration // SLOT_MINUTES)
+    mask = free_mask
+    for offset in range(1, slots_needed):
+        mask &= free_mask >> offset
+    return mask
+
+
+def mask_to_times(mask: int) -> List[str]:
+    """
+    Convert a slot bitmap into ``HH:MM`` labels in chronological order.
+
+    Args:
+        mask: Slot bitmap
+
+    Returns:
+        List[str]: Start time label for every set bit
+    """
+    times = []
+    while mask:
+        low_bit = mask & -mask
+        slot = low_bit.bit_length() - 1
+        minutes = slot * SLOT_MINUTES
+        times.append(f"{minutes // 60:02d}:{minutes % 60:02d}")
+        mask ^= low_bit
+    return times
+
+
+def _slot_floor(moment: datetime) -> int:
+    """Index of the slot containing ``moment``."""
+    return (moment.hour * 60 + moment.minute) // SLOT_MINUTES
+
+
+def _slot_ceil(moment: datetime) -> int:
+    """Index of the first slot starting at or after ``moment``."""
+    minutes = moment.hour * 60 + moment.minute
+    if moment.second or moment.microsecond:
+        minutes += 1
+    return -(-minutes // SLOT_MINUTES)
+
+
+def _day_masks(start: datetime, end: datetime) -> Iterator[Tuple[date, int]]:
+    """Yield ``(day, bitmap)`` for every day touched by ``[start, end)``."""
+    if end <= start:
+        return
+    day = start.date()
+    last_day = end.date()
+    first_slot = _slot_floor(start)
+    while day < last_day:
+        yield day, range_mask(first_slot, SLOTS_PER_DAY)
+        first_slot = 0
+        day += _ONE_DAY
+    mask = range_mask(first_slot, _slot_ceil(end))
+    if mask:
+        yield day, mask
+
+
+class AvailabilityGrid:
+    """Per-tutor availability as weekly open bitmaps plus per-day busy bitmaps."""
+
+    def __init__(
+        self,
+        availability_schedule: Optional[str] = None,
+        bookings: Iterable[Tuple[datetime, datetime]] = (),
+        buffer: timedelta = BOOKING_BUFFER,
+    ):
+        """
+        Build the grid from a weekly schedule and booked intervals.
+
+        Args:
+            availability_schedule: Tutor's weekly schedule JSON string
+            bookings: ``(start_time, end_time)`` pairs of active bookings
+            buffer: Time kept free between two bookings
+        """
+        self._weekly = weekly_masks(availability_schedule)
+        self._busy: Dict[date, int] = {}
+        self.buffer = buffer
+        for start_time, end_time in bookings:
+            self.add_booking(start_time, end_time)
+
+    def add_booking(self, start_time: datetime, end_time: datetime) -> None:
+        """
+        Mark a booking (plus buffer) as busy on every day it spans.
+
+        Args:
+            start_time: Booking start time
+            end_time: Booking end time
+        """
+        self.add_interval(start_time, end_time + self.buffer)
+
+    def add_interval(self, start_time: datetime, end_time: datetime) -> None:
+        """
+        Mark ``[start_time, end_time)`` as busy on every day it spans.
+
+        Args:
+            start_time: Interval start
+            end_time: Interval end
+        """
+        for day, mask in _day_masks(start_time, end_time):
+            self._busy[day] = self._busy.get(day, 0) | mask
+
+    def open_mask(self, day: date) -> int:
+        """Return the bitmap of slots the tutor's schedule opens on ``day``."""
+        return self._weekly[day.weekday()]
+
+    def busy_mask(self, day: date) -> int:
+        """Return the bitmap of slots blocked by bookings on ``day``."""
+        return self._busy.get(day, 0)
+
+    def free_mask(self, day: date) -> int:
+        """Return the bitmap of slots that are open and not booked on ``day``."""
+        return self.open_mask(day) & ~self.busy_mask(day) & FULL_DAY_MASK
+
+    def is_open(self, start_time: datetime, end_time: datetime) -> bool:
+        """
+        Check that the weekly schedule opens every slot of ``[start_time, end_time)``.
+
+        Args:
+            start_time: Requested start time
+            end_time: Requested end time
+
+        Returns:
+            bool: True if the interval lies entirely within schedule blocks
+        """
+        for day, mask in _day_masks(start_time, end_time):
+            if self.open_mask(day) & mask != mask:
+                return False
+        return True
+
+    def available_slots(self, day: date, duration: int) -> List[str]:
+        """
+        List the start times at which a session of ``duration`` fits on ``day``.
+
+        The session must lie within the schedule and clear of bookings, and
+        the buffer after it clear of bookings, possibly on the next day.
+
+        Args:
+            day: Day to inspect
+            duration: Session duration in minutes
+
+        Returns:
+            List[str]: ``HH:MM`` start times in chronological order
+        """
+        starts = start_mask(self.free_mask(day), duration)
+        if self.buffer:
+            busy = self.busy_mask(day) | self.busy_mask(day + _ONE_DAY) << SLOTS_PER_DAY
+            unbooked = ~busy & ((1 << 2 * SLOTS_PER_DAY) - 1)
+            buffer_minutes = int(self.buffer.total_seconds() // 60)
+            starts &= start_mask(unbooked, duration + buffer_minutes)
+        return mask_to_times(starts)
+
+    def is_free(self, start_time: datetime, end_time: datetime) -> bool:
+        """
+        Check that ``[start_time, end_time)`` can be booked.
+
+        No booked slot may overlap the period or the buffer after it; only
+        bookings are considered, not the weekly schedule.
+
+        Args:
+            start_time: Requested start time
+            end_time: Requested end time
+
+        Returns:
+            bool: True if the interval does not collide with any booking
+        """
+        for day, mask in _day_masks(start_time, end_time + self.buffer):
+            if self.busy_mask(day) & mask:
+                return False
+        return True
+
+
+def iter_available_slots(
+    availability_schedule: Optional[str],
+    bookings: Iterable[Tuple[datetime, datetime]],
+    first_day: date,
+    last_day: date,
+    duration: int,
+    buffer: timedelta = BOOKING_BUFFER,
+) -> Iterator[Tuple[date, List[str]]]:
+    """
+    Yield available start times for each day of a range as soon as it is final.
+
+    Bookings must be ordered by start time. A day is emitted once a booking
+    starting more than ``buffer`` after it ends is seen, since no later booking
+    can reach back into it, so callers can stream early days while the rest
+    are still computed.
+
+    Args:
+        availability_schedule: Tutor's weekly schedule JSON string
+        bookings: ``(start_time, end_time)`` pairs ordered by start time
+        first_day: First day of the range (inclusive)
+        last_day: Last day of the range (inclusive)
+        duration: Session duration in minutes
+        buffer: Time kept free between two bookings
+
+    Yields:
+        Tuple[date, List[str]]: Day and its ``HH:MM`` start times
+    """
+    grid = AvailabilityGrid(availability_schedule, buffer=buffer)
+    day = first_day
+    for start_time, end_time in bookings:
+        while day <= last_day and day < (start_time - buffer).date():
+            yield day, grid.available_slots(day, duration)
+            day += _ONE_DAY
+        grid.add_booking(start_time, end_time)
+    while day <= last_day:
+        yield day, grid.available_slots(day, duration)
+        day += _ONE_DAY
@@ -0,0 +1,261 @@
+"""
+Tutor search service for TutorFlow backend.
+
+This module finds tutors who teach a subject and are free for a given
+session window, using one set-based query per batch instead of probing
+availability tutor by tutor, and ranks tutors against free-text queries.
+"""
+
+import re
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, literal_column, select, true
+from sqlalchemy.orm import Session
+
+from app.models.user import (
+    Booking,
+    Tutor,
+    User,
+    UserProfile,
+    booking_conflict_filter,
+    tutor_subject_filter,
+)
+from app.models.search import (
+    SEARCH_CONFIG,
+    tutor_search_documents,
+    tutor_search_fts,
+)
+from app.services.slot_engine import AvailabilityGrid
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+class TutorSearchService:
+    """Service class for cross-tutor availability search."""
+
+    def __init__(self, db: Session):
+        """Initialize tutor search service with database session."""
+        self.db = db
+
+    def candidates_query(
+        self,
+        subject: str,
+        start_time: datetime,
+        end_time: datetime,
+        after: Optional[UUID] = None,
+    ):
+        """
+        Build the query for tutors teaching ``subject`` with no clashing booking.
+
+        Tutors with a pending or confirmed booking within the buffer of the
+        window, on either side, are removed with an
+        anti-join against the set of busy tutor IDs. The set is computed once
+        per query rather than probed per candidate, so the database never
+        returns busy tutors and never scans bookings tutor by tutor.
+
+        Args:
+            subject: Subject to match
+            start_time: Session start time
+            end_time: Session end time
+            after: Only return tutors whose ID sorts after this one
+
+        Returns:
+            Query: Rows of ``(Tutor, User, UserProfile)`` ordered by tutor ID
+        """
+        busy_tutors = select(Booking.tutor_id).where(
+            booking_conflict_filter(start_time, end_time)
+        )
+        query = (
+            self.db.query(Tutor, User, UserProfile)
+            .join(User, Tutor.user_id == User.id)
+            .join(UserProfile, User.id == UserProfile.user_id)
+            .filter(
+                User.is_active,
+                Tutor.is_verified,
+                tutor_subject_filter(subject),
+                Tutor.user_id.not_in(busy_tutors),
+            )
+        )
+        if after is not None:
+            query = query.filter(Tutor.user_id > after)
+        return query.order_by(Tutor.user_id)
+
+    def find_available_tutors(
+        self,
+        subject: str,
+        start_time: datetime,
+        end_time: datetime,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Find verified tutors teaching ``subject`` who are free for the window.
+
+        Candidates come from ``candidates_query`` in batches; each batch is
+        then checked in memory for the window lying inside the tutor's weekly
+        schedule.
+
+        Args:
+            subject: Subject to match
+            start_time: Session start time
+            end_time: Session end time
+            limit: Maximum number of tutors to return
+            cursor: Cursor returned by a previous call
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[str]]: Matching tutors and
+            the cursor for the next page, or None when there are no more
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = None
+        if cursor:
+            try:
+                after = UUID(str(decode_cursor(cursor)[0]))
+            except IndexError as exc:
+                raise ValueError("Invalid cursor") from exc
+        batch_size = max(limit * 2, 50)
+        tutors: List[Dict[str, Any]] = []
+        has_more = True
+
+        while has_more and len(tutors) < limit:
+            batch = (
+                self.candidates_query(subject, start_time, end_time, after)
+                .limit(batch_size)
+                .all()
+            )
+            has_more = len(batch) == batch_size
+            for index, (tutor, user, profile) in enumerate(batch):
+                after = tutor.user_id
+                grid = AvailabilityGrid(tutor.availability_schedule)
+                if not grid.is_open(start_time, end_time):
+                    continue
+                tutors.append(
+                    {
+                        "id": tutor.user_id,
+                        "email": user.email,
+                        "first_name": profile.first_name,
+                        "last_name": profile.last_name,
+                        "avatar_url": profile.avatar_url,
+                        "subjects": tutor.subjects,
+                        "hourly_rate": tutor.hourly_rate,
+                        "rating": tutor.rating,
+                        "total_sessions": tutor.total_sessions,
+                    }
+                )
+                if len(tutors) == limit:
+                    has_more = has_more or index < len(batch) - 1
+                    break
+
+        next_cursor = encode_cursor([str(after)]) if has_more else None
+        return tutors, next_cursor
+
+
+# FTS5 column weights for the unindexed tutor ID, name, subjects and bio,
+# mirroring the A/A/B weights of the Postgres search vector
+FTS_WEIGHTS = (0.0, 10.0, 10.0, 4.0)
+
+
+def fts_match_expression(terms: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query that requires every word.
+
+    Each word is quoted, so user input cannot use FTS5 query syntax.
+
+    Args:
+        terms: Free-text query
+
+    Returns:
+        Optional[str]: FTS5 MATCH expression, or None if there are no words
+    """
+    words = re.findall(r"\w+", terms)
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words)
+
+
+def text_search_query(dialect: str, terms: str, limit: int, offset: int = 0):
+    """
+    Build the ranked full-text tutor search as one statement.
+
+    Active, verified tutors whose search document matches every word are
+    ordered by relevance, then by ID for a stable order between pages. Each
+    row also carries the total number of matches.
+
+    Args:
+        dialect: Database dialect name, ``postgresql`` or ``sqlite``
+        terms: Free-text query
+        limit: Maximum number of rows
+        offset: Number of rows to skip
+
+    Returns:
+        Select: Rows of ``(Tutor, User, UserProfile, rank, total)``, or None
+        if ``terms`` cannot match anything
+
+    Raises:
+        ValueError: If the dialect has no full-text support here
+    """
+    if dialect == "postgresql":
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, terms)
+        documents = tutor_search_documents
+        rank = func.ts_rank_cd(documents.c.search_vector, tsquery)
+        match = documents.c.search_vector.op("@@")(tsquery)
+        join_on = documents.c.tutor_id == Tutor.user_id
+    elif dialect == "sqlite":
+        expression = fts_match_expression(terms)
+        if expression is None:
+            return None
+        fts = literal_column("tutor_search_fts")
+        # bm25() only works in the FTS scan itself and is lower for better
+        # matches, so rank in a subquery and negate
+        documents = (
+            select(
+                tutor_search_fts.c.tutor_id,
+                (-func.bm25(fts, *FTS_WEIGHTS)).label("rank"),
+            )
+            .where(fts.op("MATCH")(expression))
+            .subquery("matches")
+        )
+        rank = documents.c.rank
+        match = true()
+        join_on = documents.c.tutor_id == Tutor.user_id
+    else:
+        raise ValueError(f"Full-text search is not supported on {dialect}")
+
+    return (
+        select(
+            Tutor,
+            User,
+            UserProfile,
+            rank.label("rank"),
+            func.count().over().label("total"),
+        )
+        .select_from(Tutor)
+        .join(documents, join_on)
+        .join(User, Tutor.user_id == User.id)
+        .join(UserProfile, User.id == UserProfile.user_id)
+        .where(match, User.is_active, Tutor.is_verified)
+        .order_by(rank.desc(), Tutor.user_id)
+        .limit(limit)
+        .offset(offset)
+    )
+
+
+def text_search_total_query(query):
+    """
+    Build the query counting every match of a ``text_search_query`` page.
+
+    The page carries the total in its rows, so this is only needed when the
+    page is empty because its offset is past the last match.
+
+    Args:
+        query: Statement from ``text_search_query``
+
+    Returns:
+        Select: Single row holding the number of matches
+    """
+    matches = query.limit(None).offset(None).order_by(None).subquery()
+    return select(func.count()).select_from(matches)
@@ -0,0 +1,61 @@
+"""
+Admin user search service for TutorFlow backend.
+
+Admins search users by a fragment or a misspelling of their email or full
+name. On Postgres both columns have ``pg_trgm`` GIN indexes: substrings are
+matched with ``ILIKE`` and misspellings with the word similarity operator
+``%>``, and each table is searched through its own index before the matches
+are combined, so no search scans the users table. On SQLite, used in tests
+and local development, the same predicates run as a scan, with word
+similarity provided by a Python function registered on every connection.
+"""
+
+from sqlalchemy import ColumnElement, event, func, literal_column, or_, select, union
+from sqlalchemy.engine import Engine
+
+from app.models.user import User, UserProfile
+from app.utils.trigrams import WORD_SIMILARITY_THRESHOLD, word_similarity
+
+# Full name as indexed by ix_user_profiles_name_trgm; the separator is inlined
+# so the expression still matches the index under prepared statements
+PROFILE_FULL_NAME = (
+    UserProfile.first_name + literal_column("' '") + UserProfile.last_name
+)
+
+
+@event.listens_for(Engine, "connect")
+def _register_word_similarity(dbapi_connection, connection_record) -> None:
+    """Provide ``word_similarity`` on SQLite connections."""
+    # Only the SQLite drivers (sqlite3 and the aiosqlite adapter) have this
+    if hasattr(dbapi_connection, "create_function"):
+        dbapi_connection.create_function(
+            "word_similarity", 2, word_similarity, deterministic=True
+        )
+
+
+def _matches(dialect: str, column: ColumnElement, term: str) -> ColumnElement:
+    """Match ``term`` as a substring of ``column`` or a similar word in it."""
+    if dialect == "postgresql":
+        fuzzy = column.op("%>")(term)
+    else:
+        fuzzy = func.word_similarity(term, column) >= WORD_SIMILARITY_THRESHOLD
+    return or_(column.icontains(term, autoescape=True), fuzzy)
+
+
+def user_search_filter(dialect: str, term: str) -> ColumnElement:
+    """
+    Build the filter keeping users whose email or name matches ``term``.
+
+    Args:
+        dialect: Database dialect name
+        term: Search term
+
+    Returns:
+        ColumnElement: Condition on ``User.id``
+    """
+    term = term.strip()
+    by_email = select(User.id).where(_matches(dialect, User.email, term))
+    by_name = select(UserProfile.user_id).where(
+        _matches(dialect, PROFILE_FULL_NAME, term)
+    )
+    return User.id.in_(union(by_email, by_name))
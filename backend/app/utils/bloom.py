@@ -0,0 +1,61 @@
+"""
+Bloom filter utilities for TutorFlow backend.
+
+This module contains a small Bloom filter used to answer "definitely not
+present" membership questions without a round trip to a shared store.
+"""
+
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        """
+        Size the filter for ``capacity`` items at ``error_rate`` false positives.
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false positive probability, between 0 and 1
+
+        Raises:
+            ValueError: If capacity or error rate is out of range
+        """
+        if capacity < 1:
+            raise ValueError("Bloom filter capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("Bloom filter error rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        """Bit positions for ``item`` using double hashing of one SHA-256."""
+        digest = hashlib.sha256(item.encode()).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:16], "little") | 1
+        return (
+            (first + index * second) % self.num_bits for index in range(self.num_hashes)
+        )
+
+    def add(self, item: str) -> None:
+        """Add ``item`` to the filter."""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        """Return False if ``item`` was never added; True means "maybe"."""
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def __len__(self) -> int:
+        return self.count
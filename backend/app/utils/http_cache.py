@@ -0,0 +1,105 @@
+"""
+HTTP caching utilities for TutorFlow backend.
+
+This module contains helpers for entity tags and conditional requests.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+
+def make_etag(body: bytes, weak: bool = False) -> str:
+    """
+    Derive an entity tag from a response body.
+
+    Args:
+        body: Encoded response body
+        weak: Whether to mark the tag as weak (``W/"..."``)
+
+    Returns:
+        str: Quoted entity tag
+    """
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an ``If-None-Match`` header against the current entity tag.
+
+    Uses the weak comparison required for ``If-None-Match``: tags match if
+    their opaque parts are equal, whether or not either is weak.
+
+    Args:
+        if_none_match: Raw header value, or None if the header is absent
+        etag: Current entity tag of the resource
+
+    Returns:
+        bool: True if the client's copy is current and 304 may be returned
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def version_etag(resource: str, *versions: Optional[datetime]) -> str:
+    """
+    Derive a weak entity tag from a resource's version timestamps.
+
+    Args:
+        resource: Resource identity, e.g. ``booking:42``
+        versions: ``updated_at`` of every row the representation is built from
+
+    Returns:
+        str: Weak entity tag that changes whenever any version changes
+    """
+    key = "|".join([resource, *(v.isoformat() if v else "-" for v in versions)])
+    return make_etag(key.encode(), weak=True)
+
+
+def http_date(moment: datetime) -> str:
+    """
+    Format a naive UTC timestamp as an HTTP date.
+
+    Args:
+        moment: Naive UTC timestamp, as stored in ``updated_at``
+
+    Returns:
+        str: Date such as ``Mon, 07 Jan 2030 10:00:00 GMT``
+    """
+    return format_datetime(moment.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def modified_since(if_modified_since: Optional[str], last_modified: datetime) -> bool:
+    """
+    Check an ``If-Modified-Since`` header against the last modification.
+
+    HTTP dates have one-second resolution, so a change in the same second
+    as the client's copy is not detected; clients that also send
+    ``If-None-Match`` are not affected, as it takes precedence.
+
+    Args:
+        if_modified_since: Raw header value, or None if the header is absent
+        last_modified: Naive UTC time of the last modification
+
+    Returns:
+        bool: False if the client's copy is current and 304 may be returned
+    """
+    if not if_modified_since:
+        return True
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return True
+    if since.tzinfo is None:
+        return True
+    since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return last_modified.replace(microsecond=0) > since
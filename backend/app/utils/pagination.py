@@ -0,0 +1,187 @@
+"""
+Pagination utilities for TutorFlow backend.
+
+This module contains helpers for opaque cursor-based pagination.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Select, tuple_
+
+# Response header carrying the cursor of the next page of a list endpoint
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode the sort key of the last returned row as an opaque cursor.
+
+    Args:
+        values: JSON-serializable sort key values
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: Cursor string from a previous response
+
+    Returns:
+        List[Any]: Sort key values
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def keyset_filter(
+    columns: Sequence[ColumnElement], values: Sequence[Any], descending: bool = False
+) -> ColumnElement:
+    """
+    Filter for rows strictly after ``values`` in ``columns`` order.
+
+    The row-value comparison ``(a, b) > (x, y)`` lets Postgres and SQLite
+    seek straight to the first row of the page through an index on the same
+    columns, however deep the page is.
+
+    Args:
+        columns: Sort key columns, ending with a unique column
+        values: Sort key of the last row of the previous page
+        descending: Whether the key is sorted in descending order
+
+    Returns:
+        ColumnElement: Row-value comparison against ``values``
+    """
+    key = tuple_(*columns)
+    bound = tuple(values)
+    return key < bound if descending else key > bound
+
+
+def _to_json(value: Any) -> Any:
+    """Convert a sort key value to a JSON-serializable one."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_keyset(values: Sequence[Any]) -> str:
+    """
+    Encode a sort key of datetimes, UUIDs and numbers as a cursor.
+
+    Args:
+        values: Sort key of the last returned row
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    return encode_cursor([_to_json(value) for value in values])
+
+
+def decode_keyset(cursor: str, types: Sequence[type]) -> List[Any]:
+    """
+    Decode a cursor made by ``encode_keyset`` back into typed values.
+
+    Args:
+        cursor: Cursor string from a previous response
+        types: Expected type of each sort key value
+
+    Returns:
+        List[Any]: Sort key values
+
+    Raises:
+        ValueError: If the cursor is malformed or has the wrong shape
+    """
+    values = decode_cursor(cursor)
+    if len(values) != len(types):
+        raise ValueError("Invalid cursor")
+    try:
+        return [
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for kind, value in zip(types, values)
+        ]
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def paginate(
+    query: Select,
+    columns: Sequence[ColumnElement],
+    types: Sequence[type],
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: Optional[int] = None,
+    descending: bool = False,
+) -> Select:
+    """
+    Order ``query`` by a unique sort key and restrict it to one page.
+
+    Pages are selected by cursor, or by ``skip`` for legacy offset clients.
+    One row more than ``limit`` is fetched so that ``split_page`` can tell
+    whether another page follows.
+
+    Args:
+        query: Filtered query without ordering or limits
+        columns: Sort key columns, ending with a unique column
+        types: Type of each sort key value, used to decode the cursor
+        limit: Page size
+        cursor: Cursor from the previous page
+        skip: Number of rows to skip instead of a cursor
+        descending: Whether to sort newest or largest first
+
+    Returns:
+        Select: Query for the page
+
+    Raises:
+        ValueError: If the cursor is malformed or both modes are requested
+    """
+    if cursor is not None and skip is not None:
+        raise ValueError("Use either cursor or skip, not both")
+    order = [column.desc() for column in columns] if descending else list(columns)
+    query = query.order_by(*order).limit(limit + 1)
+    if skip is not None:
+        return query.offset(skip)
+    if cursor:
+        after = decode_keyset(cursor, types)
+        query = query.where(keyset_filter(columns, after, descending))
+    return query
+
+
+def split_page(
+    rows: Sequence[Any], limit: int, key: Callable[[Any], Sequence[Any]]
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Split rows fetched by ``paginate`` into the page and the next cursor.
+
+    Args:
+        rows: Rows returned by the paginated query
+        limit: Page size
+        key: Function returning the sort key of a row
+
+    Returns:
+        Tuple[List[Any], Optional[str]]: The page, and the cursor for the
+        next page or None if this is the last one
+    """
+    page = list(rows[:limit])
+    next_cursor = encode_keyset(key(page[-1])) if len(rows) > limit else None
+    return page, next_cursor
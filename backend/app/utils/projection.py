@@ -0,0 +1,52 @@
+"""
+Projection utilities for TutorFlow backend.
+
+List endpoints select only the columns their response needs, labelled with
+the response field names, instead of loading whole ORM entities. Rows come
+back as plain tuples, which skips identity map bookkeeping and attribute
+instrumentation and leaves wide Text columns such as booking notes or the
+tutor availability schedule in the database.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, Row, Select, select
+
+
+def projection(
+    fields: Mapping[str, ColumnElement], schema: Optional[Type[BaseModel]] = None
+) -> Select:
+    """
+    Select ``fields`` as columns labelled with their response field names.
+
+    Args:
+        fields: Response field name to column or SQL expression
+        schema: Response model whose fields must all be provided
+
+    Returns:
+        Select: Query returning one row tuple per result
+
+    Raises:
+        ValueError: If ``fields`` does not cover every field of ``schema``
+    """
+    if schema is not None:
+        missing = set(schema.model_fields) - set(fields)
+        if missing:
+            raise ValueError(
+                f"Projection for {schema.__name__} is missing {sorted(missing)}"
+            )
+    return select(*(column.label(name) for name, column in fields.items()))
+
+
+def row_dicts(rows: Iterable[Row]) -> List[Dict[str, Any]]:
+    """
+    Convert projected rows to response dictionaries.
+
+    Args:
+        rows: Rows of a ``projection`` query
+
+    Returns:
+        List[Dict[str, Any]]: One dictionary of field values per row
+    """
+    return [row._asdict() for row in rows]
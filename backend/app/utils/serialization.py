@@ -0,0 +1,77 @@
+"""
+JSON serialization utilities for TutorFlow backend.
+
+Responses are encoded with orjson, which serializes UUIDs, datetimes, enums
+and dataclasses natively and much faster than ``jsonable_encoder`` followed
+by the standard library encoder. List endpoints hand their projected rows
+straight to ``ORJSONResponse``: the rows already carry exactly the response
+fields (see ``app.utils.projection``), so validating them against the
+response model and walking them with ``jsonable_encoder`` only repeats work.
+"""
+
+import time
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.metrics import SERIALIZATION_DURATION
+
+# Dictionaries keyed by UUIDs or dates are encoded like jsonable_encoder did
+DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """
+    Encode values orjson does not handle natively.
+
+    Args:
+        value: Value orjson could not serialize
+
+    Returns:
+        Any: JSON-compatible replacement
+
+    Raises:
+        TypeError: If the value cannot be serialized
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize ``content`` to compact UTF-8 JSON.
+
+    Args:
+        content: Response content
+
+    Returns:
+        bytes: Encoded JSON
+    """
+    started = time.perf_counter()
+    body = orjson.dumps(content, default=_default, option=DUMPS_OPTIONS)
+    SERIALIZATION_DURATION.observe(time.perf_counter() - started)
+    return body
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        """
+        Encode the response body.
+
+        Args:
+            content: Response content
+
+        Returns:
+            bytes: Encoded JSON body
+        """
+        return dumps(content)
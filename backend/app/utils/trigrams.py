@@ -0,0 +1,68 @@
+"""
+Trigram utilities for TutorFlow backend.
+
+A Python version of the ``pg_trgm`` word similarity, registered as a SQL
+function on SQLite connections so that fuzzy user search behaves the same
+in tests and local development as on Postgres.
+"""
+
+import re
+from typing import List, Optional
+
+# Same default as pg_trgm.word_similarity_threshold
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: Optional[str]) -> List[str]:
+    """
+    Split ``text`` into trigrams the way ``pg_trgm`` does.
+
+    Each lowercased word is padded with two spaces in front and one behind,
+    so ``"Ada"`` gives ``"  a"``, ``" ad"``, ``"ada"`` and ``"da "``.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        List[str]: Trigrams in order of appearance, with repeats
+    """
+    grams: List[str] = []
+    for word in _WORD.findall((text or "").lower()):
+        padded = f"  {word} "
+        grams.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(query: Optional[str], text: Optional[str]) -> float:
+    """
+    Return the greatest similarity between ``query`` and a part of ``text``.
+
+    Compares the trigram set of ``query`` with every continuous run of
+    trigrams in ``text``, as ``pg_trgm``'s ``word_similarity`` does, so a
+    query matches a misspelt word inside a longer email or full name.
+
+    Args:
+        query: Search term
+        text: Text searched, e.g. an email or full name
+
+    Returns:
+        float: Similarity between 0 and 1
+    """
+    wanted = set(trigrams(query))
+    grams = trigrams(text)
+    if not wanted or not grams:
+        return 0.0
+    best = 0.0
+    for start in range(len(grams)):
+        if grams[start] not in wanted:
+            continue
+        extent = set()
+        common = 0
+        for gram in grams[start:]:
+            if gram not in extent:
+                extent.add(gram)
+                common += gram in wanted
+            best = max(best, common / (len(wanted) + len(extent) - common))
+    return best
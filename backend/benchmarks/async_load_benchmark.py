@@ -0,0 +1,189 @@
+"""
+Async database layer load test for TutorFlow backend.
+
+Serves the slot lookup for one tutor at increasing concurrency, once through
+the real async route and once through a copy of the old handler that calls a
+sync ``Session`` from inside ``async def``. Every statement is delayed by
+``--latency-ms`` to stand in for the round trip to a remote database: the
+blocking handler stalls the event loop for each one and flatlines, while the
+async route keeps other requests running and scales with concurrency.
+
+Usage (from the backend directory):
+    SECRET_KEY=bench DATABASE_URL=sqlite:// python -m benchmarks.async_load_benchmark
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time as clock
+import uuid
+from datetime import date, datetime, time, timedelta
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.main import app
+from app.models.user import (
+    Booking,
+    BookingStatus,
+    Tutor,
+    User,
+    UserRole,
+    active_booking_filter,
+)
+from app.services.slot_engine import BOOKING_BUFFER, AvailabilityGrid
+
+DAY = date(2030, 1, 7)  # a Monday
+SCHEDULE = '{"monday": [["08:00", "20:00"]]}'
+
+
+def seed(session_factory) -> uuid.UUID:
+    """Create one tutor with a handful of bookings on ``DAY``."""
+    with session_factory() as db:
+        tutor = User(email="tutor@bench.example.com", password_hash="x")
+        tutor.role = UserRole.TUTOR
+        db.add(tutor)
+        db.flush()
+        db.add(
+            Tutor(
+                user_id=tutor.id,
+                subjects='["Math"]',
+                hourly_rate=40.0,
+                availability_schedule=SCHEDULE,
+                is_verified=True,
+            )
+        )
+        for hour in (9, 12, 15, 18):
+            start = datetime.combine(DAY, time(hour, 0))
+            db.add(
+                Booking(
+                    student_id=tutor.id,
+                    tutor_id=tutor.id,
+                    subject="Math",
+                    start_time=start,
+                    end_time=start + timedelta(hours=1),
+                    status=BookingStatus.CONFIRMED,
+                )
+            )
+        db.commit()
+        return tutor.id
+
+
+def blocking_app(session_factory) -> FastAPI:
+    """Build an app serving the slot lookup the old, blocking way."""
+    legacy = FastAPI()
+
+    @legacy.get("/slots/{tutor_id}")
+    async def slots(tutor_id: uuid.UUID, date_str: str, duration: int = 60):
+        day_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        with session_factory() as db:
+            tutor = db.get(Tutor, tutor_id)
+            grid = AvailabilityGrid(tutor.availability_schedule)
+            day_start = datetime.combine(day_date, time(0, 0))
+            bookings = (
+                db.query(Booking.start_time, Booking.end_time)
+                .filter(
+                    Booking.tutor_id == tutor_id,
+                    Booking.start_time < day_start + timedelta(days=1),
+                    Booking.end_time > day_start - BOOKING_BUFFER,
+                    active_booking_filter(),
+                )
+                .all()
+            )
+        for start_time, end_time in bookings:
+            grid.add_booking(start_time, end_time)
+        return {"slots": grid.available_slots(day_date, duration)}
+
+    return legacy
+
+
+async def throughput(target: FastAPI, path: str, concurrency: int, total: int):
+    """Send ``total`` requests with ``concurrency`` in flight; return req/s."""
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://localhost"
+    ) as http:
+        queue = iter(range(total))
+
+        async def worker():
+            for _ in queue:
+                response = await http.get(path, params={"date_str": DAY.isoformat()})
+                response.raise_for_status()
+
+        started = clock.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (clock.perf_counter() - started)
+
+
+async def run(args, database_path: str) -> None:
+    """Compare both handlers at each concurrency level."""
+    latency = args.latency_ms / 1000
+
+    def delay(_statement):
+        clock.sleep(latency)
+
+    engine = create_engine(f"sqlite:///{database_path}")
+    app_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database_path}", pool_size=max(args.concurrency)
+    )
+
+    @event.listens_for(engine, "connect")
+    def sync_latency(dbapi_connection, connection_record):
+        dbapi_connection.set_trace_callback(delay)
+
+    @event.listens_for(app_engine.sync_engine, "connect")
+    def async_latency(dbapi_connection, connection_record):
+        dbapi_connection.run_async(lambda conn: conn.set_trace_callback(delay))
+
+    session_factory = sessionmaker(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    tutor_id = seed(session_factory)
+    app_sessions = async_sessionmaker(app_engine, expire_on_commit=False)
+
+    async def override_get_db():
+        async with app_sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    legacy = blocking_app(session_factory)
+    print(f"{args.latency_ms:g} ms simulated latency per statement")
+    print(f"{'concurrency':>11} | {'blocking req/s':>14} | {'async req/s':>11}")
+    try:
+        for concurrency in args.concurrency:
+            total = max(args.requests, concurrency)
+            blocking = await throughput(
+                legacy, f"/slots/{tutor_id}", concurrency, total
+            )
+            async_rate = await throughput(
+                app, f"/api/v1/bookings/slots/{tutor_id}", concurrency, total
+            )
+            print(f"{concurrency:>11} | {blocking:>14.1f} | {async_rate:>11.1f}")
+    finally:
+        app.dependency_overrides.clear()
+        await app_engine.dispose()
+        engine.dispose()
+
+
+def main() -> None:
+    """Parse arguments and run the load test against a temporary database."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    handle, database_path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    try:
+        asyncio.run(run(args, database_path))
+    finally:
+        os.remove(database_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Booking export benchmark for TutorFlow backend.
+
+Seeds a database with bookings, then streams them through
+``stream_booking_export`` and reports throughput and peak traced memory. With
+``--compare`` it also runs the old admin path, which loads every ``Booking``
+and builds every ``BookingList`` before serializing, to show memory growing
+with the table instead of staying flat.
+
+Usage (from the backend directory):
+    SECRET_KEY=bench DATABASE_URL=sqlite:// \
+        python -m benchmarks.booking_export_benchmark \
+        --bookings 1000000
+
+Pass ``--database-url postgresql://...`` to run against a local Postgres
+instead of the default temporary SQLite file. Tables are created on the
+target database and all rows are removed again afterwards.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time as clock
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_async_database_url
+from app.models.user import Booking, BookingStatus, User, UserRole
+from app.schemas.booking import BookingList
+from app.services.booking_export import booking_export_query, stream_booking_export
+
+CHUNK = 50_000
+
+
+def seed(session_factory, bookings: int) -> None:
+    """Insert one user and ``bookings`` consecutive hour-long sessions."""
+    now = datetime.utcnow()
+    start = datetime(2030, 1, 7, 8, 0)
+    with session_factory() as db:
+        user_id = uuid.uuid4()
+        db.execute(
+            insert(User).values(
+                id=user_id,
+                email=f"{user_id.hex}@bench.example.com",
+                password_hash="x",
+                role=UserRole.TUTOR,
+                created_at=now,
+                updated_at=now,
+            )
+        )
+        for offset in range(0, bookings, CHUNK):
+            db.execute(
+                insert(Booking),
+                [
+                    {
+                        "student_id": user_id,
+                        "tutor_id": user_id,
+                        "subject": "Math",
+                        "start_time": start + timedelta(hours=n),
+                        "end_time": start + timedelta(hours=n + 1),
+                        "status": BookingStatus.COMPLETED,
+                        "notes": "Chapter review",
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for n in range(offset, min(offset + CHUNK, bookings))
+                ],
+            )
+        db.commit()
+
+
+async def streamed(db: AsyncSession, batch_size: int) -> int:
+    """Drain the streaming NDJSON export and return the bytes produced."""
+    size = 0
+    async for chunk in stream_booking_export(
+        db, booking_export_query(), "ndjson", batch_size
+    ):
+        size += len(chunk)
+    return size
+
+
+async def materialized(db: AsyncSession, batch_size: int) -> int:
+    """The old admin path: load every booking, then serialize the list."""
+    bookings = (await db.scalars(select(Booking))).all()
+    items = [
+        BookingList(
+            id=booking.id,
+            student_id=booking.student_id,
+            tutor_id=booking.tutor_id,
+            subject=booking.subject,
+            start_time=booking.start_time,
+            end_time=booking.end_time,
+            status=booking.status,
+            created_at=booking.created_at,
+        )
+        for booking in bookings
+    ]
+    return len(json.dumps([item.model_dump(mode="json") for item in items]))
+
+
+async def measure(label: str, engine, export, batch_size: int) -> None:
+    """Run ``export`` in a fresh session and print its time and peak memory."""
+    async with AsyncSession(engine) as db:
+        tracemalloc.start()
+        started = clock.perf_counter()
+        try:
+            size = await export(db, batch_size)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    elapsed = clock.perf_counter() - started
+    print(
+        f"{label:<14} {elapsed:8.2f} s  {size / 2**20:9.1f} MiB out  "
+        f"peak {peak / 2**20:8.1f} MiB"
+    )
+
+
+def main() -> None:
+    """Seed the database and measure the booking export."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--bookings", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--compare", action="store_true")
+    args = parser.parse_args()
+
+    temp_path = None
+    database_url = args.database_url
+    if database_url is None:
+        handle, temp_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        database_url = f"sqlite:///{temp_path}"
+
+    engine = create_engine(database_url)
+    async_engine = create_async_engine(get_async_database_url(database_url))
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    try:
+        started = clock.perf_counter()
+        seed(session_factory, args.bookings)
+        print(
+            f"seeded {args.bookings} bookings on {engine.dialect.name} "
+            f"in {clock.perf_counter() - started:.1f} s"
+        )
+        asyncio.run(measure("streamed", async_engine, streamed, args.batch_size))
+        if args.compare:
+            asyncio.run(
+                measure("materialized", async_engine, materialized, args.batch_size)
+            )
+    finally:
+        asyncio.run(async_engine.dispose())
+        with session_factory() as db:
+            for model in (Booking, User):
+                db.execute(delete(model))
+            db.commit()
+        engine.dispose()
+        if temp_path:
+            os.remove(temp_path)
+
+
+if __name__ == "__main__":
+    main()
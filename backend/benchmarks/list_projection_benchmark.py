@@ -0,0 +1,237 @@
+"""
+List hydration benchmark for TutorFlow backend.
+
+Seeds a database with tutors and bookings, then builds the booking and tutor
+list responses two ways: the old way, loading full ORM entities (with their
+notes, bios and availability schedules) and copying fields out of them, and
+through the column projections the list endpoints now use.
+
+Usage (from the backend directory):
+    SECRET_KEY=bench DATABASE_URL=sqlite:// \
+        python -m benchmarks.list_projection_benchmark \
+        --rows 10000
+
+Pass ``--database-url postgresql://...`` to run against a local Postgres
+instead of the default temporary SQLite file. Tables are created on the
+target database and all rows are removed again afterwards.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time as clock
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.bookings import BOOKING_LIST_FIELDS
+from app.api.v1.users import TUTOR_LIST_FIELDS
+from app.database import Base
+from app.models.user import (
+    Booking,
+    BookingStatus,
+    Tutor,
+    User,
+    UserProfile,
+    UserRole,
+)
+from app.schemas.booking import BookingList
+from app.utils.projection import projection, row_dicts
+
+# A week of 30-minute windows, as a busy tutor's schedule would store it
+SCHEDULE = json.dumps(
+    {
+        day: [[f"{hour:02d}:00", f"{hour:02d}:30"] for hour in range(8, 20)]
+        for day in ("monday", "tuesday", "wednesday", "thursday", "friday")
+    }
+)
+NOTES = "Please review chapters 3 and 4 before the session. " * 8
+BIO = "Experienced tutor with a decade of classroom teaching. " * 10
+
+
+def seed(session_factory, rows: int) -> None:
+    """Insert ``rows`` tutors with profiles and ``rows`` bookings."""
+    now = datetime.utcnow()
+    start = datetime(2030, 1, 7, 8, 0)
+    ids = [uuid.uuid4() for _ in range(rows)]
+    with session_factory() as db:
+        db.execute(
+            insert(User),
+            [
+                {
+                    "id": user_id,
+                    "email": f"{user_id.hex}@bench.example.com",
+                    "password_hash": "x",
+                    "role": UserRole.TUTOR,
+                    "is_active": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for user_id in ids
+            ],
+        )
+        db.execute(
+            insert(UserProfile),
+            [
+                {
+                    "user_id": user_id,
+                    "first_name": "Bench",
+                    "last_name": "Tutor",
+                    "bio": BIO,
+                }
+                for user_id in ids
+            ],
+        )
+        db.execute(
+            insert(Tutor),
+            [
+                {
+                    "user_id": user_id,
+                    "subjects": '["Math"]',
+                    "hourly_rate": 40.0,
+                    "availability_schedule": SCHEDULE,
+                    "is_verified": True,
+                    "total_sessions": 0,
+                    "created_at": now,
+                }
+                for user_id in ids
+            ],
+        )
+        db.execute(
+            insert(Booking),
+            [
+                {
+                    "student_id": ids[0],
+                    "tutor_id": ids[0],
+                    "subject": "Math",
+                    "start_time": start + timedelta(hours=n),
+                    "end_time": start + timedelta(hours=n + 1),
+                    "status": BookingStatus.COMPLETED,
+                    "notes": NOTES,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for n in range(rows)
+            ],
+        )
+        db.commit()
+
+
+def orm_bookings(db) -> list:
+    """The previous booking list: entities copied into response models."""
+    return [
+        BookingList(
+            id=booking.id,
+            student_id=booking.student_id,
+            tutor_id=booking.tutor_id,
+            subject=booking.subject,
+            start_time=booking.start_time,
+            end_time=booking.end_time,
+            status=booking.status,
+            created_at=booking.created_at,
+        ).model_dump()
+        for booking in db.scalars(select(Booking)).all()
+    ]
+
+
+def projected_bookings(db) -> list:
+    """The projected booking list, validated once by the response model."""
+    rows = db.execute(projection(BOOKING_LIST_FIELDS, BookingList)).all()
+    return [BookingList.model_validate(item).model_dump() for item in row_dicts(rows)]
+
+
+def orm_tutors(db) -> list:
+    """The previous tutor list: three entities per row copied into a dict."""
+    rows = db.execute(
+        select(Tutor, User, UserProfile)
+        .join(User, Tutor.user_id == User.id)
+        .join(UserProfile, User.id == UserProfile.user_id)
+    ).all()
+    return [
+        {
+            "id": tutor.user_id,
+            "email": user.email,
+            "first_name": profile.first_name,
+            "last_name": profile.last_name,
+            "bio": profile.bio,
+            "avatar_url": profile.avatar_url,
+            "subjects": tutor.subjects,
+            "hourly_rate": tutor.hourly_rate,
+            "rating": tutor.rating,
+            "total_sessions": tutor.total_sessions,
+            "is_verified": tutor.is_verified,
+            "created_at": tutor.created_at,
+        }
+        for tutor, user, profile in rows
+    ]
+
+
+def projected_tutors(db) -> list:
+    """The projected tutor list."""
+    rows = db.execute(
+        projection(TUTOR_LIST_FIELDS)
+        .select_from(Tutor)
+        .join(User, Tutor.user_id == User.id)
+        .join(UserProfile, User.id == UserProfile.user_id)
+    ).all()
+    return row_dicts(rows)
+
+
+def timed(label: str, session_factory, build, repeat: int) -> float:
+    """Build a list ``repeat`` times in fresh sessions; print the mean time."""
+    elapsed = 0.0
+    for _ in range(repeat):
+        with session_factory() as db:
+            started = clock.perf_counter()
+            items = build(db)
+            elapsed += clock.perf_counter() - started
+    elapsed /= repeat
+    print(f"{label:<20} {elapsed * 1e3:9.1f} ms  {len(items):6d} rows")
+    return elapsed
+
+
+def main() -> None:
+    """Seed the database and compare ORM and projected list hydration."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    temp_path = None
+    database_url = args.database_url
+    if database_url is None:
+        handle, temp_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        database_url = f"sqlite:///{temp_path}"
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    try:
+        seed(session_factory, args.rows)
+        print(f"seeded {args.rows} tutors and bookings on {engine.dialect.name}")
+        for name, orm, projected in (
+            ("bookings", orm_bookings, projected_bookings),
+            ("tutors", orm_tutors, projected_tutors),
+        ):
+            baseline = timed(f"ORM {name}", session_factory, orm, args.repeat)
+            optimized = timed(
+                f"projected {name}", session_factory, projected, args.repeat
+            )
+            print(f"speedup: {baseline / optimized:.1f}x")
+    finally:
+        with session_factory() as db:
+            for model in (Booking, Tutor, UserProfile, User):
+                db.execute(delete(model))
+            db.commit()
+        engine.dispose()
+        if temp_path:
+            os.remove(temp_path)
+
+
+if __name__ == "__main__":
+    main()
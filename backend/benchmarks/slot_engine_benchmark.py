@@ -0,0 +1,146 @@
+"""
+Slot engine micro-benchmark for TutorFlow backend.
+
+Compares the original per-request slot generation (schedule re-parsed,
+``strptime`` per block, nested slot x booking loop) with the bitmap-based
+``AvailabilityGrid`` for a tutor with hundreds of bookings per week.
+
+Usage (from the backend directory):
+    SECRET_KEY=bench python -m benchmarks.slot_engine_benchmark
+"""
+
+import json
+import random
+import timeit
+from datetime import date, datetime, time, timedelta
+
+from app.services.slot_engine import AvailabilityGrid
+
+SCHEDULE = json.dumps(
+    {
+        day: [["07:00", "12:00"], ["13:00", "22:00"]]
+        for day in (
+            "monday",
+            "tuesday",
+            "wednesday",
+            "thursday",
+            "friday",
+            "saturday",
+            "sunday",
+        )
+    }
+)
+WEEK_START = date(2030, 1, 7)
+
+
+def make_bookings(per_week: int, seed: int = 7) -> list[tuple[datetime, datetime]]:
+    """
+    Generate up to ``per_week`` non-overlapping 15-60 minute bookings.
+
+    Bookings are placed at random 5-minute offsets between 06:00 and 23:00,
+    as the conflict check on creation would keep them, and the generator stops
+    once the week is too full to place more.
+    """
+    rng = random.Random(seed)
+    bookings: list[tuple[datetime, datetime]] = []
+    attempts = 0
+    while len(bookings) < per_week and attempts < per_week * 50:
+        attempts += 1
+        day = WEEK_START + timedelta(days=rng.randrange(7))
+        start = datetime.combine(day, time(6, 0)) + timedelta(
+            minutes=5 * rng.randrange(17 * 12)
+        )
+        end = start + timedelta(minutes=rng.choice((15, 30, 60)))
+        if all(end <= b_start or start >= b_end for b_start, b_end in bookings):
+            bookings.append((start, end))
+    return bookings
+
+
+def bookings_by_day(
+    bookings: list[tuple[datetime, datetime]],
+) -> dict[date, list[tuple[datetime, datetime]]]:
+    """Group bookings the way the per-day database query returns them."""
+    grouped: dict[date, list[tuple[datetime, datetime]]] = {}
+    for start, end in bookings:
+        grouped.setdefault(start.date(), []).append((start, end))
+    return grouped
+
+
+def legacy_slots(
+    schedule_json: str,
+    bookings: list[tuple[datetime, datetime]],
+    day_date: date,
+    duration: int,
+) -> list[str]:
+    """Original ``get_available_slots`` algorithm, minus the database."""
+    schedule = json.loads(schedule_json)
+    day_blocks = schedule.get(day_date.strftime("%A").lower(), [])
+    booking_blocks = [(start, end + timedelta(minutes=15)) for start, end in bookings]
+    slots = []
+    for block in day_blocks:
+        block_start = datetime.combine(
+            day_date, datetime.strptime(block[0], "%H:%M").time()
+        )
+        block_end = datetime.combine(
+            day_date, datetime.strptime(block[1], "%H:%M").time()
+        )
+        slot = block_start
+        while slot + timedelta(minutes=duration) <= block_end:
+            slot_end = slot + timedelta(minutes=duration)
+            conflict = False
+            for b_start, b_end in booking_blocks:
+                if slot < b_end and slot_end > b_start:
+                    conflict = True
+                    break
+            if not conflict:
+                slots.append(slot.strftime("%H:%M"))
+            slot += timedelta(minutes=15)
+    return slots
+
+
+def grid_slots(
+    schedule_json: str,
+    bookings: list[tuple[datetime, datetime]],
+    day_date: date,
+    duration: int,
+) -> list[str]:
+    """Bitmap engine answering the same question."""
+    return AvailabilityGrid(schedule_json, bookings).available_slots(day_date, duration)
+
+
+def run(per_week: int, repeat: int = 200) -> None:
+    """Time both implementations answering every day of one week."""
+    bookings = make_bookings(per_week)
+    by_day = bookings_by_day(bookings)
+    days = [WEEK_START + timedelta(days=offset) for offset in range(7)]
+
+    for day in days:
+        day_bookings = by_day.get(day, [])
+        assert legacy_slots(SCHEDULE, day_bookings, day, 60) == grid_slots(
+            SCHEDULE, day_bookings, day, 60
+        )
+
+    legacy = timeit.timeit(
+        lambda: [legacy_slots(SCHEDULE, by_day.get(d, []), d, 60) for d in days],
+        number=repeat,
+    )
+    engine = timeit.timeit(
+        lambda: [grid_slots(SCHEDULE, by_day.get(d, []), d, 60) for d in days],
+        number=repeat,
+    )
+    grid = AvailabilityGrid(SCHEDULE, bookings)
+    lookup = timeit.timeit(
+        lambda: [grid.available_slots(d, 60) for d in days], number=repeat
+    )
+
+    print(
+        f"{len(bookings):>4} bookings/week"
+        f" | legacy {legacy / repeat * 1e3:7.3f} ms"
+        f" | grid {engine / repeat * 1e3:6.3f} ms ({legacy / engine:5.1f}x)"
+        f" | prebuilt grid {lookup / repeat * 1e3:6.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    for per_week in (50, 100, 200, 400):
+        run(per_week)
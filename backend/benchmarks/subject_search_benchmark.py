@@ -0,0 +1,174 @@
+"""
+Subject search benchmark for TutorFlow backend.
+
+Seeds a database with tutors teaching a mix of common and rare subjects,
+then compares the old ``LIKE '%subject%'`` scan over the JSON subject column
+with the indexed ``tutor_subjects`` filter, for exact and prefix matches.
+
+Usage (from the backend directory):
+    SECRET_KEY=bench DATABASE_URL=sqlite:// \
+        python -m benchmarks.subject_search_benchmark \
+        --tutors 100000
+
+Pass ``--database-url postgresql://...`` to run against a local Postgres
+instead of the default temporary SQLite file. Tables are created on the
+target database and all rows are removed again afterwards.
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time as clock
+import uuid
+from datetime import datetime
+
+from sqlalchemy import create_engine, delete, func, insert, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.user import (
+    Tutor,
+    TutorSubject,
+    User,
+    UserRole,
+    normalize_subject,
+    tutor_subject_filter,
+)
+
+COMMON_SUBJECTS = ["Math", "Physics", "Chemistry", "Biology", "English", "History"]
+RARE_SUBJECTS = [f"Subject {n:03d}" for n in range(500)] + ["Mathematics history"]
+CHUNK = 20_000
+
+
+def seed(session_factory, tutors: int, seed_value: int = 11) -> None:
+    """Insert tutors with one common and two rare subjects each."""
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    with session_factory() as db:
+        for offset in range(0, tutors, CHUNK):
+            ids = [uuid.uuid4() for _ in range(min(CHUNK, tutors - offset))]
+            subjects = {
+                tutor_id: [rng.choice(COMMON_SUBJECTS), *rng.sample(RARE_SUBJECTS, 2)]
+                for tutor_id in ids
+            }
+            db.execute(
+                insert(User),
+                [
+                    {
+                        "id": tutor_id,
+                        "email": f"{tutor_id.hex}@bench.example.com",
+                        "password_hash": "x",
+                        "role": UserRole.TUTOR,
+                        "is_active": True,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for tutor_id in ids
+                ],
+            )
+            db.execute(
+                insert(Tutor),
+                [
+                    {
+                        "user_id": tutor_id,
+                        "subjects": json.dumps(subjects[tutor_id]),
+                        "hourly_rate": 40.0,
+                        "is_verified": True,
+                        "total_sessions": 0,
+                    }
+                    for tutor_id in ids
+                ],
+            )
+            db.execute(
+                insert(TutorSubject),
+                [
+                    {"tutor_id": tutor_id, "subject": normalize_subject(subject)}
+                    for tutor_id in ids
+                    for subject in subjects[tutor_id]
+                ],
+            )
+        db.commit()
+
+
+def like_query(subject: str):
+    """The previous filter: substring match on the JSON text."""
+    return select(Tutor.user_id).where(
+        Tutor.is_verified,
+        func.lower(Tutor.subjects).like(f"%{subject.lower()}%"),
+    )
+
+
+def indexed_query(subject: str, prefix: bool = False):
+    """The normalized filter served by ``ix_tutor_subjects_subject``."""
+    return select(Tutor.user_id).where(
+        Tutor.is_verified, tutor_subject_filter(subject, prefix=prefix)
+    )
+
+
+def explain(db, query) -> str:
+    """Return the database's plan for ``query`` on one line."""
+    compiled = query.compile(db.bind, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN QUERY PLAN " if db.bind.dialect.name == "sqlite" else "EXPLAIN "
+    rows = db.execute(text(prefix + str(compiled))).all()
+    return " | ".join(str(row[-1]) for row in rows)
+
+
+def timed(label: str, db, query, repeat: int) -> float:
+    """Run ``query`` ``repeat`` times and print the mean latency and row count."""
+    started = clock.perf_counter()
+    for _ in range(repeat):
+        rows = db.execute(query).all()
+    elapsed = (clock.perf_counter() - started) / repeat
+    print(f"{label:<34} {elapsed * 1e3:9.2f} ms  {len(rows):6d} rows")
+    return elapsed
+
+
+def main() -> None:
+    """Seed the database and compare both subject filters."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--tutors", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    temp_path = None
+    database_url = args.database_url
+    if database_url is None:
+        handle, temp_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        database_url = f"sqlite:///{temp_path}"
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    try:
+        started = clock.perf_counter()
+        seed(session_factory, args.tutors)
+        print(
+            f"seeded {args.tutors} tutors on {engine.dialect.name} "
+            f"in {clock.perf_counter() - started:.1f} s"
+        )
+        with session_factory() as db:
+            db.execute(text("ANALYZE"))
+            print("plan:", explain(db, indexed_query("Subject 042")))
+            for subject in ("Subject 042", "Math"):
+                baseline = timed(f"LIKE '%{subject}%'", db, like_query(subject), 1)
+                optimized = timed(
+                    f"exact '{subject}'", db, indexed_query(subject), args.repeat
+                )
+                print(f"speedup: {baseline / optimized:.1f}x")
+            timed("prefix 'Subject 04'", db, indexed_query("Subject 04", True), 1)
+    finally:
+        with session_factory() as db:
+            for model in (TutorSubject, Tutor, User):
+                db.execute(delete(model))
+            db.commit()
+        engine.dispose()
+        if temp_path:
+            os.remove(temp_path)
+
+
+if __name__ == "__main__":
+    main()
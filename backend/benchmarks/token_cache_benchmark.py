@@ -0,0 +1,69 @@
+"""
+Decoded token cache benchmark for TutorFlow backend.
+
+Measures the CPU time ``get_current_user`` spends per request when the same
+bearer token is presented repeatedly, as on a page load, with the decoded
+token cache disabled (every request runs ``jwt.decode``) and enabled. The
+principal is cached in both runs, so no database work is included.
+
+Usage (from the backend directory):
+    SECRET_KEY=bench DATABASE_URL=sqlite:// python -m benchmarks.token_cache_benchmark
+"""
+
+import argparse
+import asyncio
+import time as clock
+import uuid
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import auth
+from app.core.principals import Principal, principal_cache
+from app.core.token_cache import DecodedTokenCache
+from app.models.user import UserRole
+
+
+async def authenticate(credentials: HTTPAuthorizationCredentials, requests: int):
+    """Authenticate ``requests`` times and return CPU seconds per request."""
+    started = clock.process_time()
+    for _ in range(requests):
+        await auth.get_current_user(credentials=credentials, db=None)
+    return (clock.process_time() - started) / requests
+
+
+def main() -> None:
+    """Compare per-request auth CPU with and without the token cache."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=50_000)
+    args = parser.parse_args()
+
+    principal = Principal(
+        id=uuid.uuid4(),
+        email="student@bench.example.com",
+        role=UserRole.STUDENT,
+        is_active=True,
+        token_version=0,
+    )
+    principal_cache.put(principal)
+    token = auth.create_access_token(
+        data={
+            "sub": principal.email,
+            "uid": str(principal.id),
+            "role": principal.role.value,
+            "ver": 0,
+        }
+    )
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    results = {}
+    for label, size in (("jwt.decode every request", 0), ("decoded token cache", 1)):
+        auth.token_cache = DecodedTokenCache(size)
+        results[label] = asyncio.run(authenticate(credentials, args.requests))
+        print(f"{label:<26} {results[label] * 1e6:8.2f} us/request")
+
+    baseline, cached = results.values()
+    print(f"speedup: {baseline / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
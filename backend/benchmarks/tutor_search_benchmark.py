@@ -0,0 +1,242 @@
+"""
+Tutor search benchmark for TutorFlow backend.
+
+Seeds a database with tutors and bookings, then compares finding a page of
+free tutors the old way (list tutors, then one availability query per tutor)
+with ``TutorSearchService.find_available_tutors``.
+
+Usage (from the backend directory):
+    SECRET_KEY=bench DATABASE_URL=sqlite:// \
+        python -m benchmarks.tutor_search_benchmark \
+        --tutors 10000 --bookings 1000000
+
+Pass ``--database-url postgresql://...`` to run against a local Postgres
+instead of the default temporary SQLite file. Tables are created on the
+target database and all rows are removed again afterwards.
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time as clock
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, delete, func, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.user import (
+    Booking,
+    BookingStatus,
+    Tutor,
+    TutorSubject,
+    User,
+    UserProfile,
+    UserRole,
+    normalize_subject,
+)
+from app.services.tutor_search import TutorSearchService
+
+SUBJECTS = ["Math", "Physics", "Chemistry", "Biology", "English", "History"]
+SCHEDULE = json.dumps(
+    {
+        day: [["08:00", "20:00"]]
+        for day in ("monday", "tuesday", "wednesday", "thursday", "friday")
+    }
+)
+# 2030-01-07 is a Monday
+SEARCH_START = datetime(2030, 1, 9, 15, 0)
+CHUNK = 50_000
+
+
+def seed(session_factory, tutors: int, bookings: int, seed_value: int = 11) -> None:
+    """Insert tutors with profiles and random bookings over four weeks."""
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    tutor_ids = [uuid.uuid4() for _ in range(tutors)]
+    with session_factory() as db:
+        for offset in range(0, tutors, CHUNK):
+            ids = tutor_ids[offset : offset + CHUNK]
+            db.execute(
+                insert(User),
+                [
+                    {
+                        "id": tutor_id,
+                        "email": f"{tutor_id.hex}@bench.example.com",
+                        "password_hash": "x",
+                        "role": UserRole.TUTOR,
+                        "is_active": True,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for tutor_id in ids
+                ],
+            )
+            db.execute(
+                insert(UserProfile),
+                [
+                    {"user_id": tutor_id, "first_name": "Bench", "last_name": "Tutor"}
+                    for tutor_id in ids
+                ],
+            )
+            subjects = {tutor_id: rng.sample(SUBJECTS, 2) for tutor_id in ids}
+            db.execute(
+                insert(Tutor),
+                [
+                    {
+                        "user_id": tutor_id,
+                        "subjects": json.dumps(subjects[tutor_id]),
+                        "hourly_rate": 40.0,
+                        "availability_schedule": SCHEDULE,
+                        "is_verified": True,
+                        "total_sessions": 0,
+                    }
+                    for tutor_id in ids
+                ],
+            )
+            # Bulk inserts bypass the flush hook that maintains subject rows
+            db.execute(
+                insert(TutorSubject),
+                [
+                    {"tutor_id": tutor_id, "subject": normalize_subject(subject)}
+                    for tutor_id in ids
+                    for subject in subjects[tutor_id]
+                ],
+            )
+        # Hour-aligned slots, drawn without repeats, satisfy the no-overlap rule
+        if bookings > tutors * 28 * 12:
+            raise ValueError("Too many bookings for four weeks of hourly slots")
+        taken = set()
+        for offset in range(0, bookings, CHUNK):
+            rows = []
+            for _ in range(min(CHUNK, bookings - offset)):
+                slot = (rng.randrange(tutors), rng.randrange(28), rng.randrange(12))
+                while slot in taken:
+                    slot = (rng.randrange(tutors), rng.randrange(28), rng.randrange(12))
+                taken.add(slot)
+                tutor_index, day, hour = slot
+                start = datetime(2030, 1, 7, 8, 0) + timedelta(days=day, hours=hour)
+                rows.append(
+                    {
+                        "student_id": rng.choice(tutor_ids),
+                        "tutor_id": tutor_ids[tutor_index],
+                        "subject": "Math",
+                        "start_time": start,
+                        "end_time": start + timedelta(minutes=60),
+                        "status": BookingStatus.CONFIRMED,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+            db.execute(insert(Booking), rows)
+        db.commit()
+
+
+def n_plus_one_search(db, subject: str, start: datetime, end: datetime, limit: int):
+    """List tutors page by page and probe each one's bookings separately."""
+    found = []
+    skip = 0
+    while len(found) < limit:
+        page = (
+            db.query(Tutor)
+            .join(User, Tutor.user_id == User.id)
+            .filter(
+                User.is_active,
+                Tutor.is_verified,
+                func.lower(Tutor.subjects).like(f"%{subject.lower()}%"),
+            )
+            .offset(skip)
+            .limit(100)
+            .all()
+        )
+        if not page:
+            break
+        skip += len(page)
+        for tutor in page:
+            clashes = (
+                db.query(Booking)
+                .filter(
+                    Booking.tutor_id == tutor.user_id,
+                    Booking.start_time < end,
+                    Booking.end_time > start - timedelta(minutes=15),
+                    Booking.status.in_(
+                        [BookingStatus.CONFIRMED, BookingStatus.PENDING]
+                    ),
+                )
+                .count()
+            )
+            if clashes == 0:
+                found.append(tutor.user_id)
+                if len(found) == limit:
+                    break
+    return found
+
+
+def timed(label: str, func_, repeat: int) -> float:
+    """Run ``func_`` ``repeat`` times and print the mean latency."""
+    started = clock.perf_counter()
+    for _ in range(repeat):
+        func_()
+    elapsed = (clock.perf_counter() - started) / repeat
+    print(f"{label:<28} {elapsed * 1e3:9.2f} ms")
+    return elapsed
+
+
+def main() -> None:
+    """Seed the database and compare both search strategies."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--tutors", type=int, default=10_000)
+    parser.add_argument("--bookings", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    temp_path = None
+    database_url = args.database_url
+    if database_url is None:
+        handle, temp_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        database_url = f"sqlite:///{temp_path}"
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    try:
+        started = clock.perf_counter()
+        seed(session_factory, args.tutors, args.bookings)
+        print(
+            f"seeded {args.tutors} tutors / {args.bookings} bookings on "
+            f"{engine.dialect.name} in {clock.perf_counter() - started:.1f} s"
+        )
+        end = SEARCH_START + timedelta(minutes=60)
+        with session_factory() as db:
+            service = TutorSearchService(db)
+            baseline = timed(
+                "list + per-tutor probe",
+                lambda: n_plus_one_search(db, "Math", SEARCH_START, end, args.limit),
+                args.repeat,
+            )
+            optimized = timed(
+                "anti-join search",
+                lambda: service.find_available_tutors(
+                    "Math", SEARCH_START, end, limit=args.limit
+                ),
+                args.repeat,
+            )
+        print(f"speedup: {baseline / optimized:.1f}x")
+    finally:
+        with session_factory() as db:
+            for model in (Booking, TutorSubject, Tutor, UserProfile, User):
+                db.execute(delete(model))
+            db.commit()
+        engine.dispose()
+        if temp_path:
+            os.remove(temp_path)
+
+
+if __name__ == "__main__":
+    main()
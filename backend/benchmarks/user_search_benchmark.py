@@ -0,0 +1,143 @@
+"""
+Admin user search benchmark for TutorFlow backend.
+
+Seeds a database with users and profiles, then times the admin user list
+search for substrings of emails and names and for misspelt names, using the
+same query as the ``GET /users/`` endpoint.
+
+Usage (from the backend directory):
+    SECRET_KEY=bench DATABASE_URL=sqlite:// python -m benchmarks.user_search_benchmark \
+        --users 1000000 --database-url postgresql://localhost/tutorflow_bench
+
+On Postgres the trigram indexes are created with the tables and the plan of
+each search is printed, which should show bitmap scans of
+``ix_users_email_trgm`` and ``ix_user_profiles_name_trgm``. The default
+temporary SQLite database has no trigram indexes and scans, so keep
+``--users`` small there. All rows are removed again afterwards.
+"""
+
+import argparse
+import os
+import random
+import string
+import tempfile
+import time as clock
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, delete, insert, text
+from sqlalchemy.orm import sessionmaker
+
+import app.models.search  # noqa: F401 - registers the trigram index DDL
+from app.api.v1.users import USER_LIST_FIELDS
+from app.database import Base
+from app.models.user import User, UserProfile, UserRole
+from app.schemas.user import UserList
+from app.services.user_search import user_search_filter
+from app.utils.projection import projection
+
+FIRST_NAMES = ["Ada", "Grace", "Alan", "Edsger", "Barbara", "Donald", "Frances"]
+SEARCHES = ("kowalczyk", "ada.kowal", "Kowalcyzk", "zz-no-match")
+
+
+def random_word(rng: random.Random, length: int) -> str:
+    """Return a random lowercase word."""
+    return "".join(rng.choices(string.ascii_lowercase, k=length))
+
+
+def seed(session_factory, users: int, batch_size: int = 10_000) -> None:
+    """Insert ``users`` users with profiles; one in a thousand is a Kowalczyk."""
+    rng = random.Random(42)
+    created = datetime(2025, 1, 1)
+    for offset in range(0, users, batch_size):
+        user_rows, profile_rows = [], []
+        for n in range(offset, min(offset + batch_size, users)):
+            first = rng.choice(FIRST_NAMES)
+            last = "Kowalczyk" if n % 1000 == 0 else random_word(rng, 8).title()
+            user_id = uuid.uuid4()
+            user_rows.append(
+                {
+                    "id": user_id,
+                    "email": f"{first.lower()}.{last.lower()}{n}@bench.example.com",
+                    "password_hash": "x",
+                    "role": UserRole.STUDENT,
+                    "is_active": True,
+                    "token_version": 0,
+                    "created_at": created + timedelta(seconds=n),
+                    "updated_at": created,
+                }
+            )
+            profile_rows.append(
+                {"user_id": user_id, "first_name": first, "last_name": last}
+            )
+        with session_factory() as db:
+            db.execute(insert(User), user_rows)
+            db.execute(insert(UserProfile), profile_rows)
+            db.commit()
+
+
+def search_query(dialect: str, term: str, limit: int = 100):
+    """The admin user list query for ``term``."""
+    return (
+        projection(USER_LIST_FIELDS, UserList)
+        .outerjoin(UserProfile, User.id == UserProfile.user_id)
+        .where(user_search_filter(dialect, term))
+        .order_by(User.created_at, User.id)
+        .limit(limit)
+    )
+
+
+def main() -> None:
+    """Seed the database and time admin user searches."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    temp_path = None
+    database_url = args.database_url
+    if database_url is None:
+        handle, temp_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        database_url = f"sqlite:///{temp_path}"
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    dialect = engine.dialect.name
+    try:
+        seed(session_factory, args.users)
+        with engine.begin() as connection:
+            if dialect == "postgresql":
+                connection.execute(text("ANALYZE users"))
+                connection.execute(text("ANALYZE user_profiles"))
+        print(f"seeded {args.users} users on {dialect}")
+        for term in SEARCHES:
+            query = search_query(dialect, term)
+            with engine.connect() as connection:
+                started = clock.perf_counter()
+                for _ in range(args.repeat):
+                    rows = connection.execute(query).all()
+                elapsed = (clock.perf_counter() - started) / args.repeat
+                print(f"{term!r:<16} {elapsed * 1e3:9.1f} ms  {len(rows):4d} rows")
+                if dialect == "postgresql":
+                    compiled = query.compile(connection)
+                    plan = connection.exec_driver_sql(
+                        f"EXPLAIN {compiled}", compiled.params
+                    )
+                    for (line,) in plan:
+                        if "Index" in line:
+                            print(f"    {line.strip()}")
+    finally:
+        with session_factory() as db:
+            for model in (UserProfile, User):
+                db.execute(delete(model))
+            db.commit()
+        engine.dispose()
+        if temp_path:
+            os.remove(temp_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,35 +5,66 @@ This module contains pytest fixtures and configuration
 for running tests.
 """
 
+import json
+import os
+import tempfile
+import uuid
+
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, delete, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_session_factory
 from app.config import settings
+from app.core.principals import principal_cache
+from app.core.query_budget import QueryBudgetMiddleware
+from app.core.response_cache import InMemoryResponseCacheBackend, response_cache
+from app.core.revocation import InMemoryRevocationBackend, revocation_store
+from app.core.token_cache import token_cache
+from app.models.user import (
+    Booking,
+    BookingStatus,
+    Tutor,
+    User,
+    UserProfile,
+    UserRole,
+)
 
-
-# Create in-memory SQLite database for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# The app talks to the database through aiosqlite while fixtures use a sync
+# session, so both share one SQLite file instead of a private :memory: db
+_db_fd, SQLITE_PATH = tempfile.mkstemp(suffix=".db")
+os.close(_db_fd)
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
+    f"sqlite:///{SQLITE_PATH}",
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Each TestClient runs its own event loop, so connections are not pooled
+async_engine = create_async_engine(
+    f"sqlite+aiosqlite:///{SQLITE_PATH}", poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+# WAL lets the app write while a fixture session holds a read transaction
+@event.listens_for(engine, "connect")
+def _enable_wal(dbapi_connection, connection_record):
+    dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
 
-def override_get_db():
+async def override_get_db():
     """Override database dependency for testing."""
-    try:
-        db = TestingSessionLocal()
+    async with TestingAsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 @pytest.fixture(scope="session")
@@ -42,29 +73,53 @@ def db_engine():
     Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    os.remove(SQLITE_PATH)
+
+
+@pytest.fixture(scope="session")
+def async_db_engine(db_engine):
+    """Async engine the application uses during tests."""
+    return async_engine
 
 
 @pytest.fixture
 def db_session(db_engine):
     """Create database session for testing."""
-    connection = db_engine.connect()
-    transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
+    session = TestingSessionLocal()
 
     yield session
 
     session.close()
-    transaction.rollback()
-    connection.close()
+    # Data is committed so the app can see it; wipe it after every test
+    with db_engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(delete(table))
+
+
+@pytest_asyncio.fixture
+async def async_db_session(db_session):
+    """Create an async database session on the same database as ``db_session``."""
+    async with TestingAsyncSessionLocal() as session:
+        yield session
 
 
 @pytest.fixture
 def client(db_session):
-    """Create test client with database override."""
-    app.dependency_overrides[get_db] = lambda: db_session
-    with TestClient(app) as test_client:
+    """Create test client with database override and query budgets enforced."""
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingAsyncSessionLocal
+    with TestClient(
+        QueryBudgetMiddleware(app), base_url="http://localhost"
+    ) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+    principal_cache.clear()
+    token_cache.clear()
+    revocation_store.backend = InMemoryRevocationBackend()
+    revocation_store.clear()
+    response_cache.backend = InMemoryResponseCacheBackend(settings.response_cache_size)
+    response_cache.reset_stats()
 
 
 @pytest.fixture
@@ -101,3 +156,67 @@ def test_admin_data():
         "last_name": "Admin",
         "role": "admin",
     }
+
+
+@pytest.fixture
+def create_tutor(db_session):
+    """Factory creating an active tutor with a user profile."""
+
+    def _create_tutor(
+        subjects=("Math",),
+        availability_schedule=None,
+        is_verified=True,
+        hourly_rate=50.0,
+        **profile_fields,
+    ) -> User:
+        user = User(
+            id=uuid.uuid4(),
+            email=f"tutor-{uuid.uuid4().hex}@example.com",
+            password_hash="x",
+            role=UserRole.TUTOR,
+        )
+        db_session.add(user)
+        db_session.flush()
+        db_session.add(
+            UserProfile(
+                user_id=user.id,
+                first_name=profile_fields.pop("first_name", "Test"),
+                last_name=profile_fields.pop("last_name", "Tutor"),
+                **profile_fields,
+            )
+        )
+        db_session.add(
+            Tutor(
+                user_id=user.id,
+                subjects=json.dumps(list(subjects)),
+                hourly_rate=hourly_rate,
+                availability_schedule=availability_schedule,
+                is_verified=is_verified,
+            )
+        )
+        db_session.commit()
+        return user
+
+    return _create_tutor
+
+
+@pytest.fixture
+def create_booking(db_session):
+    """Factory creating a booking for a tutor."""
+
+    def _create_booking(
+        tutor, start_time, end_time, status=BookingStatus.CONFIRMED, student=None
+    ) -> Booking:
+        booking = Booking(
+            student_id=(student or tutor).id,
+            tutor_id=tutor.id,
+            subject="Math",
+            start_time=start_time,
+            end_time=end_time,
+            status=status,
+        )
+        db_session.add(booking)
+        db_session.commit()
+        return booking
+
+    return _create_booking
@@ -0,0 +1,152 @@
+"""
+Async database layer tests for TutorFlow backend.
+
+This module contains tests for the async engine URL mapping, the async
+booking service, and a check that slow queries no longer serialize
+concurrent requests on the event loop.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+from app.database import get_async_database_url
+from app.main import app
+from app.models.user import Booking, BookingStatus
+from app.schemas.booking import BookingCreate
+from app.services.booking_service import (
+    AsyncBookingService,
+    BookingConflictError,
+    async_save_booking,
+)
+
+SLOT_START = datetime(2030, 1, 7, 10, 0)
+SLOT_END = datetime(2030, 1, 7, 11, 0)
+
+
+@pytest.mark.parametrize(
+    "url, async_url",
+    [
+        (
+            "postgresql://user:pw@localhost:5432/tutorflow",
+            "postgresql+asyncpg://user:pw@localhost:5432/tutorflow",
+        ),
+        (
+            "postgresql+psycopg2://user:pw@localhost/tutorflow",
+            "postgresql+asyncpg://user:pw@localhost/tutorflow",
+        ),
+        ("sqlite:////tmp/tutorflow.db", "sqlite+aiosqlite:////tmp/tutorflow.db"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ],
+)
+def test_async_database_url(url, async_url):
+    """Test that sync URLs are mapped to their async driver."""
+    rendered = get_async_database_url(url).render_as_string(hide_password=False)
+
+    assert rendered == async_url
+
+
+@pytest.mark.asyncio
+async def test_async_check_availability_includes_buffer(
+    async_db_session, create_tutor, create_booking
+):
+    """Test that the async availability check honours the booking buffer."""
+    tutor = create_tutor()
+    create_booking(tutor, SLOT_START, SLOT_END)
+    service = AsyncBookingService(async_db_session)
+
+    assert not await service.check_availability(
+        tutor.id, SLOT_END, SLOT_END + timedelta(hours=1)
+    )
+    assert await service.check_availability(
+        tutor.id,
+        SLOT_END + timedelta(minutes=15),
+        SLOT_END + timedelta(minutes=75),
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_create_and_cancel_booking(async_db_session, create_tutor):
+    """Test creating, double-booking and cancelling through the async service."""
+    tutor = create_tutor()
+    service = AsyncBookingService(async_db_session)
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(days=7)
+    booking_data = BookingCreate(
+        tutor_id=tutor.id,
+        subject="Math",
+        start_time=start,
+        end_time=start + timedelta(hours=1),
+    )
+
+    booking = await service.create_booking(booking_data, tutor.id)
+    with pytest.raises(ValueError, match="not available"):
+        await service.create_booking(booking_data, tutor.id)
+    cancelled = await service.cancel_booking(booking.id, tutor.id, tutor.role)
+
+    assert booking.status == BookingStatus.CANCELLED
+    assert cancelled.id == booking.id
+    assert await service.get_tutor_bookings(tutor.id) == [booking]
+
+
+@pytest.mark.asyncio
+async def test_async_save_booking_maps_overlap(async_db_session, create_tutor):
+    """Test that the async insert path reports overlaps as conflicts."""
+    tutor = create_tutor()
+
+    def booking():
+        return Booking(
+            student_id=tutor.id,
+            tutor_id=tutor.id,
+            subject="Math",
+            start_time=SLOT_START,
+            end_time=SLOT_END,
+            status=BookingStatus.PENDING,
+        )
+
+    await async_save_booking(async_db_session, booking())
+    with pytest.raises(BookingConflictError):
+        await async_save_booking(async_db_session, booking())
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_do_not_block_event_loop(
+    async_db_engine, create_tutor, client
+):
+    """Test that concurrent requests overlap while waiting on the database."""
+    latency = 0.05
+    tutor = create_tutor(availability_schedule='{"monday": [["09:00", "17:00"]]}')
+    path = f"/api/v1/bookings/slots/{tutor.id}"
+    params = {"date_str": "2030-01-07"}
+
+    # SQLite runs the trace callback in aiosqlite's worker thread, so the
+    # sleep stands in for network time spent waiting on a remote database
+    def add_latency(dbapi_connection, connection_record):
+        dbapi_connection.run_async(
+            lambda conn: conn.set_trace_callback(lambda _: time.sleep(latency))
+        )
+
+    # The client fixture installs the async test session for get_db
+    event.listen(async_db_engine.sync_engine, "connect", add_latency)
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://localhost"
+        ) as http:
+            started = time.perf_counter()
+            assert (await http.get(path, params=params)).status_code == 200
+            single = time.perf_counter() - started
+
+            started = time.perf_counter()
+            responses = await asyncio.gather(
+                *(http.get(path, params=params) for _ in range(10))
+            )
+            concurrent = time.perf_counter() - started
+    finally:
+        event.remove(async_db_engine.sync_engine, "connect", add_latency)
+
+    assert all(response.status_code == 200 for response in responses)
+    assert concurrent < single * 10 / 3
@@ -0,0 +1,185 @@
+"""
+Booking export tests for TutorFlow backend.
+
+This module contains tests for the streaming NDJSON and CSV booking export.
+"""
+
+import csv
+import io
+import json
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.auth import create_access_token, token_claims
+from app.models.user import Booking, BookingStatus, User, UserRole
+from app.core.pool import TimedAsyncAdaptedQueuePool, pool_stats
+from app.services.booking_export import (
+    EXPORT_FIELDS,
+    booking_export_query,
+    stream_booking_export,
+)
+from tests.conftest import SQLITE_PATH, TestingAsyncSessionLocal
+
+EXPORT_URL = "/api/v1/bookings/export"
+
+
+def _headers(db_session, role):
+    user = User(
+        email=f"{role.value}-{uuid.uuid4().hex}@example.com",
+        password_hash="x",
+        role=role,
+    )
+    db_session.add(user)
+    db_session.commit()
+    return {"Authorization": f"Bearer {create_access_token(data=token_claims(user))}"}
+
+
+def _seed(db_session, count, first=0):
+    """Bulk insert ``count`` completed bookings with one tutor and student."""
+    user_id = db_session.scalar(
+        insert(User)
+        .values(
+            id=uuid.uuid4(),
+            email=f"seed-{uuid.uuid4().hex}@example.com",
+            password_hash="x",
+            role=UserRole.TUTOR,
+        )
+        .returning(User.id)
+    )
+    start = datetime(2030, 1, 7, 8, 0)
+    db_session.execute(
+        insert(Booking),
+        [
+            {
+                "student_id": user_id,
+                "tutor_id": user_id,
+                "subject": "Math",
+                "start_time": start + timedelta(hours=first + n),
+                "end_time": start + timedelta(hours=first + n + 1),
+                "status": BookingStatus.COMPLETED,
+                "notes": 'Bring, "quotes"\nand newlines',
+            }
+            for n in range(count)
+        ],
+    )
+    db_session.commit()
+
+
+def test_export_ndjson(client, db_session, create_tutor, create_booking):
+    """Test that every booking is exported as one JSON object per line."""
+    tutor = create_tutor()
+    start = datetime(2030, 1, 7, 10, 0)
+    ids = [
+        create_booking(
+            tutor, start + timedelta(hours=n), start + timedelta(hours=n, minutes=30)
+        ).id
+        for n in range(3)
+    ]
+
+    response = client.get(EXPORT_URL, headers=_headers(db_session, UserRole.ADMIN))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == ids
+    assert set(rows[0]) == set(EXPORT_FIELDS)
+    assert rows[0]["tutor_id"] == str(tutor.id)
+    assert rows[0]["status"] == "confirmed"
+    assert rows[0]["start_time"] == start.isoformat()
+
+
+def test_export_csv_with_filters(client, db_session, create_tutor, create_booking):
+    """Test the CSV format, quoting and the status filter."""
+    _seed(db_session, 2)
+    create_booking(create_tutor(), datetime(2030, 2, 1, 9), datetime(2030, 2, 1, 10))
+
+    response = client.get(
+        EXPORT_URL,
+        params={"format": "csv", "status": "completed"},
+        headers=_headers(db_session, UserRole.ADMIN),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "bookings.csv" in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 2
+    assert {row["status"] for row in rows} == {"completed"}
+    assert rows[0]["notes"] == 'Bring, "quotes"\nand newlines'
+
+
+def test_export_is_admin_only(client, db_session):
+    """Test that other roles and unknown formats are rejected."""
+    for role in (UserRole.STUDENT, UserRole.TUTOR):
+        response = client.get(EXPORT_URL, headers=_headers(db_session, role))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = client.get(
+        EXPORT_URL,
+        params={"format": "xml"},
+        headers=_headers(db_session, UserRole.ADMIN),
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def _export_peak(expected_rows):
+    """Drain an NDJSON export and return the peak traced memory in bytes."""
+    lines = 0
+    tracemalloc.start()
+    try:
+        stream = stream_booking_export(
+            TestingAsyncSessionLocal, booking_export_query(), "ndjson", 500
+        )
+        async for chunk in stream:
+            lines += chunk.count("\n")
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert lines == expected_rows
+    return peak
+
+
+@pytest.mark.asyncio
+async def test_export_memory_stays_flat(db_session):
+    """Test that exporting ten times as many rows needs no more memory."""
+    _seed(db_session, 2_000)
+    small = await _export_peak(2_000)
+    _seed(db_session, 18_000, first=2_000)
+    large = await _export_peak(20_000)
+
+    assert large < small * 2
+
+
+@pytest.mark.asyncio
+async def test_export_returns_its_connection(db_session):
+    """Test that finished and abandoned exports check their connection back in."""
+    _seed(db_session, 50)
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{SQLITE_PATH}", poolclass=TimedAsyncAdaptedQueuePool
+    )
+    session_factory = async_sessionmaker(engine)
+    try:
+        chunks = [
+            chunk
+            async for chunk in stream_booking_export(
+                session_factory, booking_export_query(), "csv", 10
+            )
+        ]
+        assert len(chunks) == 6
+        assert pool_stats(engine).checked_out == 0
+
+        stream = stream_booking_export(
+            session_factory, booking_export_query(), "ndjson", 10
+        )
+        await stream.__anext__()
+        assert pool_stats(engine).checked_out == 1
+        await stream.aclose()
+        assert pool_stats(engine).checked_out == 0
+    finally:
+        await engine.dispose()
@@ -0,0 +1,280 @@
+"""
+Booking overlap tests for TutorFlow backend.
+
+This module contains tests for the database-enforced rule that a tutor's
+active bookings are at least the booking buffer apart, including a stress
+test that races many booking requests for the same slot.
+"""
+
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.auth import create_access_token
+from app.database import Base, get_db
+from app.main import app
+from app.models.user import (
+    BOOKING_BUFFER,
+    Booking,
+    BookingStatus,
+    Tutor,
+    User,
+    UserRole,
+)
+from app.services.booking_service import BookingConflictError, save_booking
+
+MIGRATION = (
+    Path(__file__).resolve().parent.parent
+    / "alembic"
+    / "versions"
+    / "b3f08a6c4e17_add_booking_no_overlap_constraint.py"
+)
+SLOT_START = datetime(2030, 1, 7, 10, 0)
+SLOT_END = datetime(2030, 1, 7, 11, 0)
+
+
+def _booking(tutor, start=SLOT_START, end=SLOT_END, **kwargs):
+    return Booking(
+        student_id=tutor.id,
+        tutor_id=tutor.id,
+        subject="Math",
+        start_time=start,
+        end_time=end,
+        status=kwargs.get("status", BookingStatus.PENDING),
+    )
+
+
+def test_save_booking_rejects_overlap(db_session, create_tutor, create_booking):
+    """Test that an overlapping active booking is rejected by the database."""
+    tutor = create_tutor()
+    create_booking(tutor, SLOT_START, SLOT_END)
+
+    with pytest.raises(BookingConflictError):
+        save_booking(
+            db_session,
+            _booking(tutor, datetime(2030, 1, 7, 10, 30), datetime(2030, 1, 7, 11, 30)),
+        )
+
+
+def test_save_booking_allows_buffered_and_cancelled(
+    db_session, create_tutor, create_booking
+):
+    """Test that bookings a buffer apart and cancelled bookings do not conflict."""
+    tutor = create_tutor()
+    create_booking(tutor, SLOT_START, SLOT_END, status=BookingStatus.CANCELLED)
+    create_booking(tutor, datetime(2030, 1, 7, 9, 0), SLOT_START - BOOKING_BUFFER)
+    create_booking(tutor, SLOT_END + BOOKING_BUFFER, datetime(2030, 1, 7, 12, 0))
+
+    booking = save_booking(db_session, _booking(tutor))
+
+    assert booking.id is not None
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        (datetime(2030, 1, 7, 9, 0), SLOT_START),
+        (SLOT_END + BOOKING_BUFFER - timedelta(seconds=1), datetime(2030, 1, 7, 12)),
+    ],
+)
+def test_save_booking_rejects_within_buffer(
+    db_session, create_tutor, create_booking, start, end
+):
+    """Test that the buffer must separate bookings on either side."""
+    tutor = create_tutor()
+    create_booking(tutor, SLOT_START, SLOT_END)
+
+    with pytest.raises(BookingConflictError):
+        save_booking(db_session, _booking(tutor, start, end))
+
+
+def test_reactivating_overlapping_booking_rejected(
+    db_session, create_tutor, create_booking
+):
+    """Test that updates are checked as well as inserts."""
+    tutor = create_tutor()
+    create_booking(tutor, SLOT_START, SLOT_END)
+    cancelled = create_booking(
+        tutor, SLOT_START, SLOT_END, status=BookingStatus.CANCELLED
+    )
+
+    cancelled.status = BookingStatus.CONFIRMED
+    with pytest.raises(BookingConflictError):
+        save_booking(db_session, cancelled)
+
+
+def test_create_booking_conflict_returns_409(
+    client, create_tutor, create_booking, test_user_data
+):
+    """Test that the endpoint translates the constraint violation to 409."""
+    tutor = create_tutor()
+    create_booking(tutor, SLOT_START, SLOT_END)
+    token = client.post("/api/v1/auth/register", json=test_user_data).json()[
+        "access_token"
+    ]
+
+    response = client.post(
+        "/api/v1/bookings",
+        json={
+            "tutor_id": str(tutor.id),
+            "subject": "Math",
+            "start_time": "2030-01-07T10:15:00",
+            "end_time": "2030-01-07T10:45:00",
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert "conflicts" in response.json()["detail"]
+
+
+@pytest.mark.slow
+def test_concurrent_bookings_for_same_slot(tmp_path):
+    """Test that exactly one of many parallel requests gets the slot."""
+    database = tmp_path / "stress.db"
+    engine = create_engine(f"sqlite:///{database}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    with session_factory() as db:
+        tutor = User(email="tutor@example.com", password_hash="x", role=UserRole.TUTOR)
+        student = User(
+            email="student@example.com", password_hash="x", role=UserRole.STUDENT
+        )
+        db.add_all([tutor, student])
+        db.flush()
+        db.add(Tutor(user_id=tutor.id, subjects='["Math"]', hourly_rate=40.0))
+        db.commit()
+        tutor_id = str(tutor.id)
+        token = create_access_token(data={"sub": student.email})
+
+    app_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database}",
+        connect_args={"timeout": 30},
+        pool_size=32,
+    )
+    app_session_factory = async_sessionmaker(app_engine, expire_on_commit=False)
+
+    async def override_get_db():
+        async with app_session_factory() as db:
+            yield db
+
+    payload = {
+        "tutor_id": tutor_id,
+        "subject": "Math",
+        "start_time": SLOT_START.isoformat(),
+        "end_time": SLOT_END.isoformat(),
+    }
+    headers = {"Authorization": f"Bearer {token}"}
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with TestClient(app, base_url="http://localhost") as client:
+            with ThreadPoolExecutor(max_workers=32) as pool:
+                codes = list(
+                    pool.map(
+                        lambda _: client.post(
+                            "/api/v1/bookings", json=payload, headers=headers
+                        ).status_code,
+                        range(200),
+                    )
+                )
+            client.portal.call(app_engine.dispose)
+    finally:
+        app.dependency_overrides.clear()
+
+    with session_factory() as db:
+        stored = db.query(func.count(Booking.id)).scalar()
+    engine.dispose()
+
+    assert codes.count(status.HTTP_200_OK) == 1
+    assert codes.count(status.HTTP_409_CONFLICT) == 199
+    assert stored == 1
+
+
+def _migration_engine():
+    """In-memory database with the schema but without the overlap triggers."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        triggers = {
+            row[0]: row[1]
+            for row in connection.exec_driver_sql(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+                "AND name LIKE 'bookings_no_overlap%'"
+            )
+        }
+        for name in triggers:
+            connection.exec_driver_sql(f"DROP TRIGGER {name}")
+    return engine, triggers
+
+
+def _load_migration(connection):
+    spec = importlib.util.spec_from_file_location("overlap_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    migration.op = Operations(MigrationContext.configure(connection))
+    return migration
+
+
+def test_overlap_migration_upgrade_and_downgrade():
+    """Test that the migration creates the model's triggers and drops them."""
+    engine, model_triggers = _migration_engine()
+
+    def triggers(connection):
+        rows = connection.exec_driver_sql(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger'"
+        )
+        return dict(rows.all())
+
+    with engine.connect() as connection:
+        migration = _load_migration(connection)
+
+        migration.upgrade()
+        created = triggers(connection)
+        migration.downgrade()
+        dropped = triggers(connection)
+
+    assert set(model_triggers) == {
+        "bookings_no_overlap_insert",
+        "bookings_no_overlap_update",
+    }
+    # The frozen DDL still matches the model
+    assert {name: created[name] for name in model_triggers} == model_triggers
+    assert not set(model_triggers) & set(dropped)
+
+
+def test_overlap_migration_refuses_existing_conflicts():
+    """Test that bookings breaking the rule abort the migration with their IDs."""
+    engine, _ = _migration_engine()
+    tutor = User(email="tutor@example.com", password_hash="x", role=UserRole.TUTOR)
+    with sessionmaker(bind=engine)() as db:
+        db.add(tutor)
+        db.flush()
+        db.add_all(
+            [
+                _booking(tutor),
+                _booking(tutor, SLOT_END, datetime(2030, 1, 7, 12, 0)),
+                _booking(tutor, SLOT_START, SLOT_END, status=BookingStatus.CANCELLED),
+            ]
+        )
+        db.commit()
+
+    with engine.connect() as connection:
+        migration = _load_migration(connection)
+        with pytest.raises(RuntimeError, match=r"booking IDs 1/2\)"):
+            migration.upgrade()
@@ -0,0 +1,186 @@
+"""
+Response compression tests for TutorFlow backend.
+
+This module contains tests for content coding negotiation, the size and
+content type rules, and incremental compression of streamed responses.
+"""
+
+import gzip
+import zlib
+from datetime import datetime
+
+import pytest
+from fastapi import status
+
+from app.core.auth import create_access_token, token_claims
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+from app.models.user import BookingStatus
+from tests.test_response_cache import _admin
+
+BIO = "Patient tutor who explains every step twice. " * 20
+
+
+def _app(content_type, chunks):
+    """An ASGI app answering with ``chunks`` as one (streamed) body."""
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", content_type.encode()),
+                    (b"etag", b'"abc"'),
+                ],
+            }
+        )
+        for index, chunk in enumerate(chunks):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": index < len(chunks) - 1,
+                }
+            )
+
+    return app
+
+
+async def _call(middleware, accept_encoding="gzip"):
+    """Run ``middleware`` for a GET and collect the messages it sends."""
+    messages = []
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, None, send)
+    return messages[0], messages[1:]
+
+
+def test_negotiate_encoding():
+    """Test q-values, wildcards and refusals in Accept-Encoding."""
+    encodings = ("br", "gzip")
+
+    assert negotiate_encoding("gzip, deflate, br", encodings) == "br"
+    assert negotiate_encoding("gzip, deflate", encodings) == "gzip"
+    assert negotiate_encoding("br;q=0.5, gzip", encodings) == "gzip"
+    assert negotiate_encoding("*", encodings) == "br"
+    assert negotiate_encoding("*, br;q=0", encodings) == "gzip"
+    assert negotiate_encoding("gzip;q=0", ("gzip",)) is None
+    assert negotiate_encoding("identity", encodings) is None
+    assert negotiate_encoding("", encodings) is None
+
+
+@pytest.mark.asyncio
+async def test_small_and_excluded_bodies_are_not_compressed():
+    """Test the minimum size and the content type allowlist."""
+    body = b"x" * 2000
+    small = CompressionMiddleware(_app("application/json", [b"{}"]), minimum_size=1024)
+    image = CompressionMiddleware(_app("image/png", [body]), minimum_size=1024)
+
+    start, (message,) = await _call(small)
+    assert message["body"] == b"{}"
+    assert "content-encoding" not in dict(start["headers"])
+    assert dict(start["headers"])[b"vary"] == b"Accept-Encoding"
+
+    start, (message,) = await _call(image)
+    assert message["body"] == body
+    assert b"vary" not in dict(start["headers"])
+
+
+@pytest.mark.asyncio
+async def test_complete_body_is_compressed():
+    """Test a compressed body with its length, coding and weakened ETag."""
+    body = b'{"bio": "' + BIO.encode() + b'"}'
+    middleware = CompressionMiddleware(
+        _app("application/json; charset=utf-8", [body]), minimum_size=100
+    )
+
+    start, (message,) = await _call(middleware, "gzip, deflate")
+    headers = dict(start["headers"])
+
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"content-length"] == str(len(message["body"])).encode()
+    assert headers[b"etag"] == b'W/"abc"'
+    assert gzip.decompress(message["body"]) == body
+
+
+@pytest.mark.asyncio
+async def test_stream_is_compressed_chunk_by_chunk():
+    """Test that every streamed chunk can be decoded as soon as it arrives."""
+    chunks = [f'{{"id": {n}, "notes": "{BIO}"}}\n'.encode() for n in range(3)]
+    middleware = CompressionMiddleware(
+        _app("application/x-ndjson", chunks + [b""]), minimum_size=10**9
+    )
+
+    start, messages = await _call(middleware)
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    assert dict(start["headers"])[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in dict(start["headers"])
+    for chunk, message in zip(chunks, messages):
+        assert decoder.decompress(message["body"]) == chunk
+    assert decoder.decompress(messages[-1]["body"]) == b""
+    assert decoder.eof
+
+
+def test_brotli_is_preferred_when_installed(client, create_tutor):
+    """Test that clients accepting Brotli get it when it is available."""
+    brotli = pytest.importorskip("brotli")
+    create_tutor(bio=BIO)
+
+    response = client.get(
+        "/api/v1/users/tutors", headers={"Accept-Encoding": "gzip, br"}
+    )
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.json()[0]["bio"] == BIO
+    assert brotli is not None
+
+
+def test_tutor_list_is_compressed(client, create_tutor):
+    """Test the app's middleware on a large list and its revalidation."""
+    for _ in range(3):
+        create_tutor(bio=BIO)
+
+    response = client.get("/api/v1/users/tutors", headers={"Accept-Encoding": "gzip"})
+    repeat = client.get(
+        "/api/v1/users/tutors",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]},
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].startswith('W/"')
+    assert [item["bio"] for item in response.json()] == [BIO] * 3
+    assert repeat.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_booking_export_is_compressed(client, db_session, create_tutor, create_booking):
+    """Test that a streamed NDJSON export arrives gzip-encoded."""
+    tutor = create_tutor()
+    for hour in range(8, 18):
+        create_booking(
+            tutor,
+            datetime(2030, 1, 7, hour),
+            datetime(2030, 1, 7, hour, 30),
+            status=BookingStatus.COMPLETED,
+        )
+    admin = _admin(db_session)
+
+    response = client.get(
+        "/api/v1/bookings/export",
+        headers={
+            "Authorization": f"Bearer {create_access_token(data=token_claims(admin))}",
+            "Accept-Encoding": "gzip",
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.text.splitlines()) == 10
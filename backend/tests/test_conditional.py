@@ -0,0 +1,144 @@
+"""
+Conditional request tests for TutorFlow backend.
+
+This module contains tests for ETag and Last-Modified validators and the
+304 responses of the booking and profile read endpoints.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+
+from app.core.auth import create_access_token, token_claims
+from app.models.user import Booking, User, UserProfile, UserRole
+from app.utils.http_cache import http_date, modified_since, version_etag
+from tests.test_query_plans import captured_statements
+
+STAMP = datetime(2030, 1, 7, 10, 0, 0, 250_000)
+
+
+def _headers(user):
+    return {"Authorization": f"Bearer {create_access_token(data=token_claims(user))}"}
+
+
+def _user(db_session, role=UserRole.STUDENT, profile=True):
+    user = User(
+        email=f"{role.value}-{uuid.uuid4().hex}@example.com",
+        password_hash="x",
+        role=role,
+    )
+    db_session.add(user)
+    db_session.flush()
+    if profile:
+        db_session.add(UserProfile(user_id=user.id, first_name="Ada", last_name="L"))
+    db_session.commit()
+    return user
+
+
+def test_validators_from_versions():
+    """Test weak ETags and second-resolution If-Modified-Since checks."""
+    etag = version_etag("booking:1", STAMP)
+
+    assert etag.startswith('W/"')
+    assert version_etag("booking:1", STAMP + timedelta(microseconds=1)) != etag
+    assert version_etag("booking:2", STAMP) != etag
+    assert http_date(STAMP) == "Mon, 07 Jan 2030 10:00:00 GMT"
+    assert not modified_since(http_date(STAMP), STAMP)
+    assert modified_since(http_date(STAMP - timedelta(seconds=1)), STAMP)
+    assert modified_since("not a date", STAMP)
+    assert modified_since(None, STAMP)
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["/api/v1/auth/me", "/api/v1/users/profile", "/api/v1/users/tutor/profile"],
+)
+def test_profile_reads_answer_304(client, db_session, create_tutor, url):
+    """Test that unchanged profile reads return 304 without a body."""
+    user = create_tutor()
+    headers = _headers(user)
+
+    first = client.get(url, headers=headers)
+    etag = first.headers["etag"]
+    repeat = client.get(url, headers={**headers, "If-None-Match": etag})
+    by_date = client.get(
+        url, headers={**headers, "If-Modified-Since": first.headers["last-modified"]}
+    )
+
+    assert first.status_code == status.HTTP_200_OK
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert repeat.status_code == by_date.status_code == status.HTTP_304_NOT_MODIFIED
+    assert repeat.content == b""
+    assert repeat.headers["etag"] == etag
+
+
+def test_profile_change_changes_validators(client, db_session):
+    """Test that a name change is not answered with 304."""
+    user = _user(db_session)
+    headers = _headers(user)
+    etag = client.get("/api/v1/auth/me", headers=headers).headers["etag"]
+
+    client.put("/api/v1/users/profile", headers=headers, json={"first_name": "Grace"})
+    response = client.get("/api/v1/auth/me", headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["first_name"] == "Grace"
+    assert response.headers["etag"] != etag
+
+
+def test_profile_without_profile_row(client, db_session):
+    """Test the profile read for a user who has no profile row yet."""
+    user = _user(db_session, profile=False)
+
+    response = client.get("/api/v1/users/profile", headers=_headers(user))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["first_name"] == ""
+    assert response.headers["last-modified"] == http_date(user.updated_at)
+
+
+def test_booking_304_reads_only_the_version(
+    client, async_db_engine, db_session, create_tutor, create_booking
+):
+    """Test that an unchanged booking is answered from its version alone."""
+    tutor = create_tutor()
+    booking = create_booking(tutor, datetime(2030, 1, 7, 10), datetime(2030, 1, 7, 11))
+    url = f"/api/v1/bookings/{booking.id}"
+    headers = _headers(tutor)
+    etag = client.get(url, headers=headers).headers["etag"]
+
+    with captured_statements(async_db_engine.sync_engine, "bookings") as statements:
+        response = client.get(url, headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    (statement,) = [sql for sql, _ in statements]
+    assert "bookings.notes" not in statement
+
+    db_session.get(Booking, booking.id).notes = "Bring a calculator"
+    db_session.commit()
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["notes"] == "Bring a calculator"
+
+
+def test_booking_access_is_checked_before_304(
+    client, db_session, create_tutor, create_booking
+):
+    """Test that a stranger cannot probe a booking's version."""
+    tutor = create_tutor()
+    booking = create_booking(tutor, datetime(2030, 1, 7, 10), datetime(2030, 1, 7, 11))
+    url = f"/api/v1/bookings/{booking.id}"
+    etag = client.get(url, headers=_headers(tutor)).headers["etag"]
+
+    response = client.get(
+        url, headers={**_headers(_user(db_session)), "If-None-Match": etag}
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert (
+        client.get("/api/v1/bookings/999999", headers=_headers(tutor)).status_code
+        == 404
+    )
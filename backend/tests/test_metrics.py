@@ -0,0 +1,146 @@
+"""
+Metrics tests for TutorFlow backend.
+
+This module contains tests for the Prometheus text exposition, for the
+per-route request and SQL metrics recorded by the middleware, and for the
+``/metrics`` endpoint.
+"""
+
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.hashing import password_hasher
+from app.core.metrics import (
+    CONTENT_TYPE_LATEST,
+    PASSWORD_HASH_DURATION,
+    REQUEST_DB_QUERIES,
+    REQUEST_DURATION,
+    SERIALIZATION_DURATION,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsMiddleware,
+    MetricsRegistry,
+    StatsCollector,
+    instrument_engine,
+)
+from app.utils.serialization import dumps
+
+
+@dataclass
+class _Stats:
+    size: int
+    hits: int
+
+
+def test_text_exposition_format():
+    """Test the rendered families, labels, buckets and escaping."""
+    registry = MetricsRegistry()
+    requests = registry.register(Counter("requests_total", "Requests", ("path",)))
+    in_flight = registry.register(Gauge("in_flight", "In flight"))
+    latency = registry.register(
+        Histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+    )
+    registry.register(StatsCollector("cache", "Cache", lambda: _Stats(3, 7), ("hits",)))
+
+    requests.labels('/a"b').inc()
+    requests.labels('/a"b').inc(2)
+    in_flight.inc()
+    for value in (0.05, 0.1, 5):
+        latency.observe(value)
+
+    assert registry.render().decode().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{path="/a\\"b"} 3.0',
+        "# HELP in_flight In flight",
+        "# TYPE in_flight gauge",
+        "in_flight 1.0",
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1.0"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.15",
+        "latency_seconds_count 3",
+        "# HELP cache_size Cache: size",
+        "# TYPE cache_size gauge",
+        "cache_size 3.0",
+        "# HELP cache_hits_total Cache: hits",
+        "# TYPE cache_hits_total counter",
+        "cache_hits_total 7.0",
+    ]
+    with pytest.raises(ValueError):
+        registry.register(Gauge("in_flight", "Again"))
+    with pytest.raises(ValueError):
+        requests.labels()
+
+
+def test_middleware_records_route_latency_and_queries(async_db_engine):
+    """Test per-route latency and statement counts, keyed by template."""
+    instrument_engine(async_db_engine.sync_engine)
+    router = APIRouter()
+
+    @router.get("/items/{queries}")
+    async def run(queries: int):
+        async with async_db_engine.connect() as connection:
+            for _ in range(queries):
+                await connection.execute(text("SELECT 1"))
+        return {"queries": queries}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    route = "/api/items/{queries}"
+    queries = REQUEST_DB_QUERIES.labels("GET", route)
+    served = REQUEST_DURATION.labels("GET", route, "200")
+    unmatched = REQUEST_DURATION.labels("GET", "unmatched", "404")
+    before = (queries.count, queries.sum, served.count, unmatched.count)
+
+    with TestClient(MetricsMiddleware(app)) as client:
+        assert client.get("/api/items/3").status_code == 200
+        assert client.get("/api/items/1").status_code == 200
+        assert client.get("/api/nowhere/1").status_code == 404
+
+    assert (queries.count, queries.sum, served.count, unmatched.count) == (
+        before[0] + 2,
+        before[1] + 4,
+        before[2] + 2,
+        before[3] + 1,
+    )
+
+
+def test_hashing_and_serialization_are_timed():
+    """Test that password hashing and response encoding record durations."""
+    hashed = PASSWORD_HASH_DURATION.labels("hash")
+    before = (hashed.count, SERIALIZATION_DURATION.labels().count)
+
+    asyncio.run(password_hasher.hash("correct horse"))
+    dumps({"status": "healthy"})
+
+    assert (hashed.count, SERIALIZATION_DURATION.labels().count) == (
+        before[0] + 1,
+        before[1] + 1,
+    )
+
+
+def test_metrics_endpoint(client):
+    """Test that the app serves its metrics in the Prometheus text format."""
+    assert client.get("/health").status_code == 200
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE_LATEST
+    body = response.text
+    assert (
+        'tutorflow_http_request_duration_seconds_count{method="GET",'
+        'route="/health",status="200"}' in body
+    )
+    assert "# TYPE tutorflow_http_requests_in_flight gauge" in body
+    assert "tutorflow_password_hasher_completed_total " in body
+    assert "tutorflow_response_cache_hits_total " in body
@@ -0,0 +1,192 @@
+"""
+Keyset pagination tests for TutorFlow backend.
+
+This module contains tests for the cursor helpers and for cursor and
+legacy offset pagination of the user, tutor and booking lists.
+"""
+
+import importlib.util
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from fastapi import status
+from sqlalchemy import create_engine, inspect, update
+from sqlalchemy.pool import StaticPool
+
+from app.core.auth import create_access_token, token_claims
+from app.database import Base
+from app.models.user import Tutor, User, UserRole
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_keyset, encode_keyset
+from tests.test_query_plans import assert_no_full_scan, captured_statements
+
+MIGRATION = (
+    Path(__file__).resolve().parent.parent
+    / "alembic"
+    / "versions"
+    / "e3a7c5f9b1d4_add_keyset_pagination_indexes.py"
+)
+CREATED = datetime(2030, 1, 1, 9, 0)
+
+
+def _user(db_session, role):
+    user = User(
+        email=f"{role.value}-{uuid.uuid4().hex}@example.com",
+        password_hash="x",
+        role=role,
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+def _headers(user):
+    return {"Authorization": f"Bearer {create_access_token(data=token_claims(user))}"}
+
+
+def _pages(client, url, headers=None, **params):
+    """Follow ``X-Next-Cursor`` headers and return every page's IDs."""
+    pages = []
+    cursor = None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get(url, params=query, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+
+
+def test_keyset_cursor_roundtrip():
+    """Test that datetimes, UUIDs and integers survive a cursor."""
+    key = (CREATED, uuid.uuid4(), 7)
+
+    assert decode_keyset(encode_keyset(key), (datetime, uuid.UUID, int)) == list(key)
+    with pytest.raises(ValueError):
+        decode_keyset(encode_keyset(key), (datetime, uuid.UUID))
+    with pytest.raises(ValueError):
+        decode_keyset(encode_keyset(["soon", 1]), (datetime, int))
+
+
+def test_bookings_pages_are_stable_and_complete(
+    client, db_session, create_tutor, create_booking
+):
+    """Test that bookings page newest first, with ties broken by ID."""
+    student = _user(db_session, UserRole.STUDENT)
+    expected = []
+    for day in range(3):
+        start = datetime(2030, 1, 7 + day, 10, 0)
+        for _ in range(2):
+            booking = create_booking(
+                create_tutor(), start, start + timedelta(hours=1), student=student
+            )
+            expected.append((start, booking.id))
+    expected.sort(reverse=True)
+
+    pages = _pages(client, "/api/v1/bookings", _headers(student), limit=4)
+
+    assert [len(page) for page in pages] == [4, 2]
+    assert sum(pages, []) == [booking_id for _, booking_id in expected]
+
+
+def test_tutors_pages_break_created_at_ties(client, db_session, create_tutor):
+    """Test that tutors created at the same instant are neither lost nor repeated."""
+    ids = [create_tutor().id for _ in range(5)]
+    db_session.execute(update(Tutor).values(created_at=CREATED))
+    db_session.commit()
+
+    pages = _pages(client, "/api/v1/users/tutors", limit=2)
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert sum(pages, []) == sorted(str(tutor_id) for tutor_id in ids)
+
+
+def test_users_pages_for_admin(client, db_session):
+    """Test that the admin user list pages through every account."""
+    admin = _user(db_session, UserRole.ADMIN)
+    ids = [admin.id] + [_user(db_session, UserRole.STUDENT).id for _ in range(4)]
+
+    pages = _pages(client, "/api/v1/users/", _headers(admin), limit=2)
+
+    assert sorted(sum(pages, [])) == sorted(str(user_id) for user_id in ids)
+    assert len(sum(pages, [])) == 5
+
+
+def test_offset_mode_and_bad_cursors(client, db_session, create_tutor):
+    """Test the legacy offset mode and rejection of bad parameters."""
+    for _ in range(3):
+        create_tutor()
+    url = "/api/v1/users/tutors"
+
+    everything = client.get(url).json()
+    legacy = client.get(url, params={"skip": 1, "limit": 1})
+
+    assert legacy.status_code == status.HTTP_200_OK
+    assert [tutor["id"] for tutor in legacy.json()] == [everything[1]["id"]]
+    both = client.get(
+        url, params={"skip": 1, "cursor": legacy.headers[NEXT_CURSOR_HEADER]}
+    )
+    assert both.status_code == status.HTTP_400_BAD_REQUEST
+    assert client.get(url, params={"cursor": "!!"}).status_code == 400
+
+
+def test_deep_booking_page_seeks_by_index(
+    client, async_db_engine, db_session, create_tutor, create_booking
+):
+    """Test that a cursor page is read through the keyset index, not scanned."""
+    admin = _user(db_session, UserRole.ADMIN)
+    tutor = create_tutor()
+    create_booking(tutor, datetime(2030, 1, 7, 10), datetime(2030, 1, 7, 11))
+    cursor = encode_keyset((datetime(2030, 2, 1), 10**6))
+
+    with captured_statements(async_db_engine.sync_engine, "bookings") as statements:
+        response = client.get(
+            "/api/v1/bookings", params={"cursor": cursor}, headers=_headers(admin)
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == 1
+    assert_no_full_scan(db_session, statements, "bookings")
+
+
+def test_keyset_index_migration_upgrade_and_downgrade():
+    """Test that the migration creates and drops the sort key indexes."""
+    spec = importlib.util.spec_from_file_location("keyset_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+
+    def index_names(connection):
+        inspector = inspect(connection)
+        return {
+            index["name"]
+            for table in ("users", "tutors", "bookings")
+            for index in inspector.get_indexes(table)
+        }
+
+    names = {name for name, _, _ in migration.INDEXES}
+    with engine.connect() as connection:
+        for name in names:
+            connection.exec_driver_sql(f"DROP INDEX {name}")
+        migration.op = Operations(MigrationContext.configure(connection))
+        # Autocommit blocks need the connection outside a transaction
+        connection.commit()
+
+        migration.upgrade()
+        created = index_names(connection)
+        connection.commit()
+        migration.downgrade()
+        dropped = index_names(connection)
+
+    assert names <= created
+    assert not names & dropped
@@ -0,0 +1,146 @@
+"""
+Password hashing pool tests for TutorFlow backend.
+
+This module contains tests for the bounded bcrypt worker pool, its queue
+metrics, and transparent rehashing of outdated hashes on login.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import status
+from passlib.context import CryptContext
+from sqlalchemy import select
+
+import app.core.hashing as hashing
+from app.core.hashing import PasswordHasher
+from app.models.user import User, UserProfile, UserRole
+
+
+@pytest.fixture
+def fast_context(monkeypatch):
+    """Use a cheap bcrypt cost so tests do not spend seconds hashing."""
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5)
+    monkeypatch.setattr(hashing, "pwd_context", context)
+    return context
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_roundtrip(fast_context):
+    """Test hashing and verifying through the pool."""
+    hasher = PasswordHasher(2)
+    try:
+        password_hash = await hasher.hash("TestPassword123")
+
+        assert password_hash.startswith("$2b$05$")
+        assert await hasher.verify_and_update("TestPassword123", password_hash) == (
+            True,
+            None,
+        )
+        assert (await hasher.verify_and_update("wrong", password_hash))[0] is False
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_and_queue_metrics(monkeypatch):
+    """Test that at most ``max_concurrency`` hashes run and the rest queue."""
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_hash(password):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return password
+
+    monkeypatch.setattr(hashing, "hash_password", slow_hash)
+    hasher = PasswordHasher(2)
+    try:
+        results = await asyncio.gather(*(hasher.hash(str(n)) for n in range(8)))
+    finally:
+        hasher.shutdown()
+    stats = hasher.stats()
+
+    assert results == [str(n) for n in range(8)]
+    assert peak == 2
+    assert stats.max_queued >= 6
+    assert stats.completed == 8
+    assert stats.in_flight == 0
+    assert stats.queued == 0
+    assert stats.total_wait_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_hashing_does_not_block_event_loop():
+    """Test that the loop keeps running while bcrypt works."""
+    hasher = PasswordHasher(1)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    try:
+        await hasher.hash("TestPassword123")
+    finally:
+        task.cancel()
+        hasher.shutdown()
+
+    assert ticks > 5
+
+
+@pytest.mark.asyncio
+async def test_process_executor_roundtrip():
+    """Test that the process pool hashes with the configured context."""
+    hasher = PasswordHasher(1, executor="process")
+    try:
+        password_hash = await hasher.hash("TestPassword123")
+        verified, _ = await hasher.verify_and_update("TestPassword123", password_hash)
+    finally:
+        hasher.shutdown()
+
+    assert verified
+
+
+def test_invalid_pool_configuration():
+    """Test that a bad executor kind or concurrency is rejected."""
+    with pytest.raises(ValueError):
+        PasswordHasher(2, executor="fiber")
+    with pytest.raises(ValueError):
+        PasswordHasher(0)
+
+
+def test_login_rehashes_outdated_cost(client, db_session, fast_context):
+    """Test that logging in replaces a hash made with an old bcrypt cost."""
+    old_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    user = User(
+        email="old@example.com",
+        password_hash=old_context.hash("TestPassword123"),
+        role=UserRole.STUDENT,
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserProfile(user_id=user.id, first_name="Old", last_name="Hash"))
+    db_session.commit()
+
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"email": "old@example.com", "password": "TestPassword123"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    db_session.expire_all()
+    stored = db_session.scalar(select(User.password_hash).where(User.id == user.id))
+    assert stored.startswith("$2b$05$")
+    assert fast_context.verify("TestPassword123", stored)
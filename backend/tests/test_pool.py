@@ -0,0 +1,113 @@
+"""
+Connection pool tests for TutorFlow backend.
+
+This module contains tests for the pool configuration built from the
+settings, the pool occupancy and checkout time telemetry, and the readiness
+endpoint.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import app.main as main
+from app.config import settings
+from app.core.pool import (
+    POOL_CHECKOUT_DURATION,
+    PoolStats,
+    TimedAsyncAdaptedQueuePool,
+    TimedNullPool,
+    TimedQueuePool,
+    pool_stats,
+)
+from app.database import engine_options
+
+
+def test_engine_options_from_settings(monkeypatch):
+    """Test pooled, in-memory and external pooler configurations."""
+    monkeypatch.setattr(settings, "database_pool_size", 20)
+    monkeypatch.setattr(settings, "database_max_overflow", 5)
+    monkeypatch.setattr(settings, "database_pool_recycle", 1800)
+    postgres = make_url("postgresql+asyncpg://tutorflow@db/tutorflow")
+
+    pooled = engine_options(postgres, "async")
+    assert pooled["poolclass"] is TimedAsyncAdaptedQueuePool
+    assert (pooled["pool_size"], pooled["max_overflow"]) == (20, 5)
+    assert (pooled["pool_recycle"], pooled["pool_timeout"]) == (1800, 30.0)
+    assert pooled["pool_logging_name"] == "async"
+    assert engine_options(make_url("sqlite:///app.db"), "sync")["poolclass"] is (
+        TimedQueuePool
+    )
+    assert engine_options(make_url("sqlite://"), "sync")["poolclass"] is StaticPool
+
+    monkeypatch.setattr(settings, "database_external_pooler", True)
+    external = engine_options(postgres, "async")
+    assert external["poolclass"] is TimedNullPool
+    assert external["connect_args"]["statement_cache_size"] == 0
+    assert "pool_size" not in external
+
+
+def test_pool_stats_and_checkout_time(tmp_path):
+    """Test occupancy while connections are checked out, and checkout timing."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=2,
+        max_overflow=1,
+        pool_logging_name="pool-test",
+    )
+    checkouts = POOL_CHECKOUT_DURATION.labels("pool-test")
+    try:
+        connections = [engine.connect() for _ in range(3)]
+        stats = pool_stats(engine)
+        assert stats == PoolStats(
+            size=2, max_overflow=1, checked_out=3, idle=0, overflow=1, saturation=1.0
+        )
+        for connection in connections:
+            connection.close()
+        assert pool_stats(engine).checked_out == 0
+        assert pool_stats(engine).idle == 2
+        assert checkouts.count == 3
+    finally:
+        engine.dispose()
+
+    assert pool_stats(create_engine("sqlite://", poolclass=TimedNullPool)) == (
+        PoolStats(0, 0, 0, 0, 0, 0.0)
+    )
+
+
+def test_ready_reports_pool(client):
+    """Test that a reachable database with a free pool is ready."""
+    response = client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert set(response.json()["pool"]) == {
+        "size",
+        "max_overflow",
+        "checked_out",
+        "idle",
+        "overflow",
+        "saturation",
+    }
+
+
+@pytest.mark.parametrize(
+    "saturation, reachable, database",
+    [(1.0, True, "saturated"), (0.0, False, "unavailable")],
+)
+def test_not_ready(client, monkeypatch, tmp_path, saturation, reachable, database):
+    """Test that a saturated pool or an unreachable database fails readiness."""
+    monkeypatch.setattr(
+        main, "pool_stats", lambda engine: PoolStats(5, 0, 5, 0, 0, saturation)
+    )
+    if not reachable:
+        broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/x.db")
+        monkeypatch.setattr(main, "async_engine", broken)
+
+    response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["database"] == database
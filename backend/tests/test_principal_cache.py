@@ -0,0 +1,189 @@
+"""
+Principal cache tests for TutorFlow backend.
+
+This module contains tests for the TTL/LRU principal cache and for
+authenticating requests from token claims without a user lookup.
+"""
+
+from contextlib import contextmanager
+from uuid import uuid4
+
+import pytest
+from fastapi import status
+from sqlalchemy import event, update
+
+from app.core.auth import create_access_token, token_claims
+from app.core.principals import Principal, PrincipalCache, principal_cache
+from app.models.user import User, UserRole
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _principal(**overrides):
+    values = {
+        "id": uuid4(),
+        "email": "user@example.com",
+        "role": UserRole.STUDENT,
+        "is_active": True,
+        "token_version": 0,
+    }
+    values.update(overrides)
+    return Principal(**values)
+
+
+@contextmanager
+def user_queries(engine):
+    """Collect statements that read the users table."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Drive the global principal cache from a fake clock."""
+    clock = FakeClock()
+    monkeypatch.setattr(principal_cache, "_clock", clock)
+    principal_cache.clear()
+    yield clock
+    principal_cache.clear()
+
+
+@pytest.fixture
+def create_user(db_session):
+    """Factory creating a user and returning it with a bearer header."""
+
+    def _create_user(role=UserRole.STUDENT):
+        user = User(
+            email=f"{role.value}-{uuid4().hex}@example.com",
+            password_hash="x",
+            role=role,
+        )
+        db_session.add(user)
+        db_session.commit()
+        token = create_access_token(data=token_claims(user))
+        return user, {"Authorization": f"Bearer {token}"}
+
+    return _create_user
+
+
+def test_cache_expires_entries():
+    """Test that entries are dropped once their TTL has passed."""
+    clock = FakeClock()
+    cache = PrincipalCache(max_size=10, ttl_seconds=30, clock=clock)
+    principal = _principal()
+    cache.put(principal)
+
+    clock.now = 29.9
+    assert cache.get(principal.id) == principal
+    clock.now = 30.0
+    assert cache.get(principal.id) is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    """Test that the least recently used entry is evicted when full."""
+    cache = PrincipalCache(max_size=2, ttl_seconds=30)
+    first, second, third = _principal(), _principal(), _principal()
+    cache.put(first)
+    cache.put(second)
+    cache.get(first.id)
+    cache.put(third)
+
+    assert cache.get(first.id) == first
+    assert cache.get(second.id) is None
+    assert cache.get(third.id) == third
+
+
+def test_cache_invalidate():
+    """Test that invalidating drops a single principal."""
+    cache = PrincipalCache(max_size=10, ttl_seconds=30)
+    principal = _principal()
+    cache.put(principal)
+    cache.invalidate(principal.id)
+
+    assert cache.get(principal.id) is None
+
+
+def test_repeat_requests_skip_user_lookup(
+    client, async_db_engine, create_user, fake_clock
+):
+    """Test that only the first request with a token loads the user."""
+    _, headers = create_user()
+
+    with user_queries(async_db_engine.sync_engine) as statements:
+        first = client.get("/api/v1/auth/me", headers=headers)
+        second = client.get("/api/v1/auth/me", headers=headers)
+
+    assert first.status_code == status.HTTP_200_OK
+    assert second.status_code == status.HTTP_200_OK
+    assert len(statements) == 1
+
+
+def test_role_change_revokes_existing_tokens(client, create_user, fake_clock):
+    """Test that tokens issued before a role change stop working at once."""
+    student, student_headers = create_user()
+    _, admin_headers = create_user(UserRole.ADMIN)
+    assert client.get("/api/v1/auth/me", headers=student_headers).status_code == 200
+
+    response = client.put(
+        f"/api/v1/users/{student.id}/role",
+        params={"role": "tutor"},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response = client.get("/api/v1/auth/me", headers=student_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_deactivation_elsewhere_applies_after_ttl(
+    client, db_session, create_user, fake_clock
+):
+    """Test that a change made by another worker is seen within the TTL."""
+    student, headers = create_user()
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    # Another worker deactivates the user; this worker's cache is untouched
+    db_session.execute(
+        update(User)
+        .where(User.id == student.id)
+        .values(is_active=False, token_version=User.token_version + 1)
+    )
+    db_session.commit()
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    fake_clock.now += principal_cache.ttl_seconds
+    response = client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_login_token_carries_identity_claims(client, test_user_data, fake_clock):
+    """Test that issued tokens authenticate and refresh with the new claims."""
+    tokens = client.post("/api/v1/auth/register", json=test_user_data).json()
+
+    refreshed = client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    headers = {"Authorization": f"Bearer {refreshed.json()['access_token']}"}
+    response = client.get("/api/v1/auth/me", headers=headers)
+
+    assert refreshed.status_code == status.HTTP_200_OK
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["id"] == tokens["user_id"]
@@ -0,0 +1,108 @@
+"""
+Projected list query tests for TutorFlow backend.
+
+This module checks that the list endpoints read only the columns their
+responses need, and that the responses keep their shape.
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import status
+
+from app.api.v1.bookings import BOOKING_LIST_FIELDS
+from app.core.auth import create_access_token, token_claims
+from app.models.user import User, UserRole
+from app.schemas.booking import BookingList
+from app.utils.projection import projection
+from tests.test_query_plans import captured_statements
+
+
+def _admin_headers(db_session):
+    admin = User(
+        email=f"admin-{uuid.uuid4().hex}@example.com",
+        password_hash="x",
+        role=UserRole.ADMIN,
+    )
+    db_session.add(admin)
+    db_session.commit()
+    return {"Authorization": f"Bearer {create_access_token(data=token_claims(admin))}"}
+
+
+def test_projection_must_cover_schema():
+    """Test that a projection missing a response field is rejected."""
+    fields = dict(BOOKING_LIST_FIELDS)
+    del fields["status"]
+
+    with pytest.raises(ValueError, match="status"):
+        projection(fields, BookingList)
+
+
+def test_list_bookings_skips_unused_columns(
+    client, async_db_engine, db_session, create_tutor, create_booking
+):
+    """Test that booking lists neither read notes nor change shape."""
+    tutor = create_tutor()
+    booking = create_booking(tutor, datetime(2030, 1, 7, 10), datetime(2030, 1, 7, 11))
+    headers = _admin_headers(db_session)
+
+    with captured_statements(async_db_engine.sync_engine, "bookings") as statements:
+        response = client.get("/api/v1/bookings", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {
+            "id": booking.id,
+            "student_id": str(tutor.id),
+            "tutor_id": str(tutor.id),
+            "subject": "Math",
+            "start_time": "2030-01-07T10:00:00",
+            "end_time": "2030-01-07T11:00:00",
+            "status": "confirmed",
+            "created_at": booking.created_at.isoformat(),
+        }
+    ]
+    assert statements
+    assert [sql for sql, _ in statements if "bookings.notes" in sql] == []
+
+
+def test_list_tutors_skips_unused_columns(client, async_db_engine, create_tutor):
+    """Test that tutor lists do not read the availability schedule."""
+    tutor = create_tutor(subjects=["Math"], bio="Patient")
+
+    with captured_statements(async_db_engine.sync_engine, "tutors") as statements:
+        response = client.get("/api/v1/users/tutors")
+
+    assert response.status_code == status.HTTP_200_OK
+    (item,) = response.json()
+    assert item["id"] == str(tutor.id)
+    assert item["bio"] == "Patient"
+    assert set(item) == {
+        "id",
+        "email",
+        "first_name",
+        "last_name",
+        "bio",
+        "avatar_url",
+        "subjects",
+        "hourly_rate",
+        "rating",
+        "total_sessions",
+        "is_verified",
+        "created_at",
+    }
+    assert statements
+    assert [sql for sql, _ in statements if "availability_schedule" in sql] == []
+
+
+def test_list_users_fills_missing_profile_names(client, db_session):
+    """Test that users without a profile are listed with empty names."""
+    headers = _admin_headers(db_session)
+
+    response = client.get("/api/v1/users/", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    (item,) = response.json()
+    assert item["first_name"] == "" and item["last_name"] == ""
+    assert item["role"] == UserRole.ADMIN.value
@@ -0,0 +1,96 @@
+"""
+Query budget tests for TutorFlow backend.
+
+This module contains tests for the N+1 detector that enforces the query
+budgets declared by endpoints, and for the eager loading on the paths that
+used to issue one query per related row.
+"""
+
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from sqlalchemy.exc import InvalidRequestError
+
+from app.core.auth import create_access_token, token_claims
+from app.core.query_budget import (
+    QueryBudgetExceeded,
+    QueryBudgetMiddleware,
+    query_budget,
+)
+from app.models.user import User, UserProfile, UserRole
+from tests.test_response_cache import _admin
+
+
+def _budget_app(engine):
+    """An app whose endpoints run as many queries as they are asked to."""
+    app = FastAPI()
+
+    async def run(queries):
+        async with engine.connect() as connection:
+            for _ in range(queries):
+                await connection.execute(text("SELECT 1"))
+        return {"queries": queries}
+
+    @app.get("/budgeted")
+    @query_budget(2)
+    async def budgeted(queries: int):
+        return await run(queries)
+
+    @app.get("/unbudgeted")
+    async def unbudgeted(queries: int):
+        return await run(queries)
+
+    return app
+
+
+def test_budget_exceeded_fails_the_request(async_db_engine):
+    """Test that going over a declared budget raises with the statements."""
+    app = _budget_app(async_db_engine)
+
+    with TestClient(QueryBudgetMiddleware(app)) as client:
+        assert client.get("/budgeted", params={"queries": 2}).status_code == 200
+        assert client.get("/unbudgeted", params={"queries": 5}).status_code == 200
+        with pytest.raises(QueryBudgetExceeded, match="ran 3 statements, budget is 2"):
+            client.get("/budgeted", params={"queries": 3})
+
+
+def test_relationships_are_never_lazy_loaded(db_session, create_tutor):
+    """Test that a relationship without a loader option fails loudly."""
+    tutor = create_tutor()
+    db_session.expire_all()
+    user = db_session.scalar(select(User).where(User.id == tutor.id))
+
+    with pytest.raises(InvalidRequestError):
+        user.profile
+
+
+def test_user_detail_loads_profile_eagerly(client, db_session):
+    """Test the admin user detail, which reads the profile in the same query."""
+    user = User(
+        email=f"student-{uuid.uuid4().hex}@example.com",
+        password_hash="x",
+        role=UserRole.STUDENT,
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserProfile(user_id=user.id, first_name="Ada", last_name="L"))
+    db_session.commit()
+    admin = _admin(db_session)
+    headers = {
+        "Authorization": f"Bearer {create_access_token(data=token_claims(admin))}"
+    }
+
+    response = client.get(f"/api/v1/users/{user.id}", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["id"] == str(user.id)
+    assert (response.json()["first_name"], response.json()["last_name"]) == (
+        "Ada",
+        "L",
+    )
+    assert (
+        client.get(f"/api/v1/users/{uuid.uuid4()}", headers=headers).status_code == 404
+    )
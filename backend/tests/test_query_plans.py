@@ -0,0 +1,234 @@
+"""
+Query plan regression tests for TutorFlow backend.
+
+This module runs the hot booking and tutor queries, asks the database for
+their plans and fails if any of them falls back to a full table scan. It
+also checks that the index migration creates and drops its indexes.
+"""
+
+import importlib.util
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.services.booking_service import BookingService
+
+MIGRATION = (
+    Path(__file__).resolve().parent.parent
+    / "alembic"
+    / "versions"
+    / "7c1e5b9d2a41_add_booking_overlap_indexes.py"
+)
+NEW_INDEXES = {
+    "bookings": {
+        "ix_bookings_tutor_active_time",
+        "ix_bookings_tutor_start",
+        "ix_bookings_student_start",
+    },
+    "tutors": {"ix_tutors_verified_rate"},
+}
+
+
+@contextmanager
+def captured_statements(engine, table):
+    """Collect ``(statement, parameters)`` for every SELECT reading ``table``."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if statement.lstrip().upper().startswith("SELECT") and (
+            f"FROM {table}" in statement or f"JOIN {table}" in statement
+        ):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def assert_no_full_scan(db_session, statements, table):
+    """Explain each statement and fail if ``table`` is read by a full scan."""
+    assert statements, f"no query against {table} was executed"
+    connection = db_session.connection()
+    for statement, parameters in statements:
+        if connection.dialect.name == "postgresql":
+            connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            rows = connection.exec_driver_sql("EXPLAIN " + statement, parameters)
+            plan = "\n".join(row[0] for row in rows)
+            assert f"Seq Scan on {table}" not in plan, plan
+        else:
+            rows = connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN " + statement, parameters
+            )
+            plan = "\n".join(str(row[-1]) for row in rows)
+            assert not any(
+                line.startswith(f"SCAN {table}") for line in plan.splitlines()
+            ), plan
+
+
+def test_create_booking_uses_index(
+    client, async_db_engine, db_session, create_tutor, test_user_data
+):
+    """Test the reads issued while inserting a booking."""
+    tutor = create_tutor()
+    token = client.post("/api/v1/auth/register", json=test_user_data).json()[
+        "access_token"
+    ]
+
+    with captured_statements(async_db_engine.sync_engine, "bookings") as statements:
+        response = client.post(
+            "/api/v1/bookings",
+            json={
+                "tutor_id": str(tutor.id),
+                "subject": "Math",
+                "start_time": "2030-01-07T10:00:00",
+                "end_time": "2030-01-07T11:00:00",
+            },
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    assert response.status_code == 200
+    assert_no_full_scan(db_session, statements, "bookings")
+
+
+def test_overlap_trigger_uses_index(db_session, create_tutor):
+    """Test the overlap check run by the SQLite insert trigger."""
+    connection = db_session.connection()
+    trigger_sql = connection.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE name = 'bookings_no_overlap_insert'"
+    ).scalar()
+    check = trigger_sql[trigger_sql.index("SELECT 1") : trigger_sql.index("BEGIN")]
+    check = re.sub(r"NEW\.\w+", "?", check.rstrip().rstrip(")"))
+
+    assert_no_full_scan(
+        db_session,
+        [
+            (
+                check,
+                (
+                    create_tutor().id.hex,
+                    "2030-01-07 11:00:00.000000",
+                    "2030-01-07 10:00:00.000000",
+                    None,
+                ),
+            )
+        ],
+        "bookings",
+    )
+
+
+def test_check_availability_uses_index(db_engine, db_session, create_tutor):
+    """Test the booking service availability check."""
+    tutor = create_tutor()
+
+    with captured_statements(db_engine, "bookings") as statements:
+        BookingService(db_session).check_availability(
+            tutor.id, datetime(2030, 1, 7, 10), datetime(2030, 1, 7, 11)
+        )
+
+    assert_no_full_scan(db_session, statements, "bookings")
+
+
+@pytest.mark.parametrize(
+    "path, params",
+    [
+        ("/api/v1/bookings/slots/{id}", {"date_str": "2030-01-07"}),
+        (
+            "/api/v1/bookings/slots/{id}/range",
+            {"date_from": "2030-01-07", "date_to": "2030-01-13"},
+        ),
+    ],
+)
+def test_slot_lookups_use_index(
+    client, async_db_engine, db_session, create_tutor, path, params
+):
+    """Test the single-day and range slot lookups."""
+    tutor = create_tutor(availability_schedule='{"monday": [["09:00", "17:00"]]}')
+
+    with captured_statements(async_db_engine.sync_engine, "bookings") as statements:
+        response = client.get(path.format(id=tutor.id), params=params)
+
+    assert response.status_code == 200
+    assert_no_full_scan(db_session, statements, "bookings")
+
+
+def test_tutor_and_student_bookings_use_index(db_engine, db_session, create_tutor):
+    """Test the per-tutor and per-student booking listings."""
+    tutor = create_tutor()
+    service = BookingService(db_session)
+
+    with captured_statements(db_engine, "bookings") as statements:
+        service.get_tutor_bookings(tutor.id, start_date=datetime(2030, 1, 1))
+        service.get_student_bookings(tutor.id, start_date=datetime(2030, 1, 1))
+
+    assert len(statements) == 2
+    assert_no_full_scan(db_session, statements, "bookings")
+
+
+def test_list_tutors_uses_index(client, async_db_engine, db_session, create_tutor):
+    """Test the verified tutor listing filtered by rate."""
+    create_tutor()
+
+    with captured_statements(async_db_engine.sync_engine, "tutors") as statements:
+        response = client.get("/api/v1/users/tutors", params={"min_rate": 10})
+
+    assert response.status_code == 200
+    assert_no_full_scan(db_session, statements, "tutors")
+
+
+def test_plan_check_detects_full_scan(db_engine, db_session):
+    """Test that the plan check fails on an unindexed filter."""
+    with captured_statements(db_engine, "bookings") as statements:
+        db_session.connection().exec_driver_sql(
+            "SELECT id FROM bookings WHERE subject = 'Math'"
+        )
+
+    with pytest.raises(AssertionError):
+        assert_no_full_scan(db_session, statements, "bookings")
+
+
+def test_index_migration_upgrade_and_downgrade():
+    """Test that the migration creates and drops the composite indexes."""
+    spec = importlib.util.spec_from_file_location("index_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+
+    def index_names(connection):
+        inspector = inspect(connection)
+        return {
+            table: {index["name"] for index in inspector.get_indexes(table)}
+            for table in NEW_INDEXES
+        }
+
+    with engine.connect() as connection:
+        for table, names in NEW_INDEXES.items():
+            for name in names:
+                connection.exec_driver_sql(f"DROP INDEX {name}")
+        connection.commit()
+        migration.op = Operations(MigrationContext.configure(connection))
+
+        migration.upgrade()
+        created = index_names(connection)
+        connection.commit()
+        migration.downgrade()
+        dropped = index_names(connection)
+
+    for table, names in NEW_INDEXES.items():
+        assert names <= created[table]
+        assert not names & dropped[table]
@@ -0,0 +1,136 @@
+"""
+Query statistics tests for TutorFlow backend.
+
+This module contains tests for SQL fingerprinting, the bounded fingerprint
+table and slow query log, and the admin endpoint listing the most expensive
+queries.
+"""
+
+import logging
+
+import pytest
+from fastapi import status
+
+from app.core.auth import create_access_token, token_claims
+from app.core.query_stats import (
+    QueryStatsTable,
+    fingerprint,
+    query_stats,
+    redact_parameters,
+    track_queries,
+)
+from app.models.user import UserRole
+from tests.test_conditional import _user
+from tests.test_response_cache import _admin
+
+QUERIES_URL = "/api/v1/admin/queries"
+
+
+@pytest.mark.parametrize(
+    "statement, expected",
+    [
+        (
+            "SELECT users.id FROM users\n  WHERE users.email = ? LIMIT ? OFFSET ?",
+            "SELECT users.id FROM users WHERE users.email = ? LIMIT ? OFFSET ?",
+        ),
+        (
+            "SELECT * FROM bookings WHERE id IN ($1, $2, $3) AND status = 'pending'",
+            "SELECT * FROM bookings WHERE id IN (...) AND status = ?",
+        ),
+        (
+            "UPDATE users SET token_version=%(token_version)s WHERE users.id = 42",
+            "UPDATE users SET token_version=? WHERE users.id = ?",
+        ),
+        (
+            "INSERT INTO tutors (a, b) VALUES (?, ?), (?, ?), (?, ?)",
+            "INSERT INTO tutors (a, b) VALUES (?, ?), ...",
+        ),
+        (
+            "SELECT created_at::date, name_1 FROM t WHERE x = :x",
+            "SELECT created_at::date, name_1 FROM t WHERE x = ?",
+        ),
+    ],
+)
+def test_fingerprint(statement, expected):
+    """Test that literals, parameters and lists are normalized away."""
+    assert fingerprint(statement) == expected
+
+
+def test_redact_parameters():
+    """Test that logged parameters keep their shape but not their values."""
+    assert redact_parameters(("ada@example.com", 3)) == ["str", "int"]
+    assert redact_parameters({"email_1": "ada@example.com"}) == {"email_1": "str"}
+    assert redact_parameters([(1,), (2,)]) == "<2 parameter sets>"
+
+
+def test_table_percentiles_and_eviction():
+    """Test rolling percentiles and that the cheapest fingerprint is evicted."""
+    table = QueryStatsTable(max_fingerprints=2, window=100, slow_threshold_seconds=0)
+    for millis in range(1, 201):
+        table.record("SELECT * FROM bookings WHERE id = ?", (millis,), millis / 1000)
+    table.record("SELECT 1", (), 0.5)
+    table.record("SELECT 2", (), 0.001)
+
+    top = table.top(order_by="total_seconds")
+
+    assert [stats.fingerprint for stats in top] == [
+        "SELECT * FROM bookings WHERE id = ?",
+        "SELECT ?",
+    ]
+    bookings = top[0]
+    assert bookings.count == 200
+    assert bookings.max_seconds == pytest.approx(0.2)
+    # Percentiles cover the last 100 runs, 101 ms to 200 ms
+    assert bookings.p50_seconds == pytest.approx(0.15)
+    assert bookings.p95_seconds == pytest.approx(0.195)
+    assert bookings.p99_seconds == pytest.approx(0.199)
+    assert top[1].count == 2
+    with pytest.raises(ValueError):
+        table.top(order_by="fingerprint")
+
+
+def test_slow_queries_are_logged_redacted(caplog):
+    """Test that slow statements are logged without their parameter values."""
+    table = QueryStatsTable(max_fingerprints=10, window=10, slow_threshold_seconds=0.1)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.query_stats"):
+        table.record("SELECT * FROM users WHERE email = ?", ("ada@example.com",), 0.05)
+        table.record("SELECT * FROM users WHERE email = ?", ("ada@example.com",), 0.25)
+
+    assert len(caplog.records) == 1
+    message = caplog.records[0].getMessage()
+    assert "250.0 ms" in message and "['str']" in message
+    assert "ada@example.com" not in message
+    assert table.top()[0].slow_count == 1
+
+
+def test_admin_lists_most_expensive_queries(client, db_session, async_db_engine):
+    """Test the admin endpoint over statements the API just ran."""
+    track_queries(async_db_engine.sync_engine)
+    query_stats.clear()
+    admin = _admin(db_session)
+    headers = {
+        "Authorization": f"Bearer {create_access_token(data=token_claims(admin))}"
+    }
+    assert client.get("/api/v1/users/", headers=headers).status_code == 200
+
+    response = client.get(QUERIES_URL, params={"order_by": "count"}, headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    entries = response.json()
+    assert entries
+    assert any("FROM users" in entry["fingerprint"] for entry in entries)
+    assert all(entry["count"] >= 1 for entry in entries)
+    assert entries == sorted(entries, key=lambda e: e["count"], reverse=True)
+
+    student = _user(db_session, UserRole.STUDENT)
+    student_headers = {
+        "Authorization": f"Bearer {create_access_token(data=token_claims(student))}"
+    }
+    assert client.get(QUERIES_URL, headers=student_headers).status_code == 403
+    assert (
+        client.get(
+            QUERIES_URL, params={"order_by": "name"}, headers=headers
+        ).status_code
+        == 422
+    )
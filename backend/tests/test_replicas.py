@@ -0,0 +1,152 @@
+"""
+Read replica routing tests for TutorFlow backend.
+
+This module contains tests for the replica router and for ``get_read_db``,
+with two SQLite databases standing in for the primary and a replica that
+has not caught up.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+import app.database as database
+from app.core.auth import create_access_token, token_claims
+from app.core.replicas import ReplicaRouter
+from app.database import Base, get_db
+from app.main import app
+from tests.conftest import TestingAsyncSessionLocal
+from tests.test_revocation import FakeClock
+
+BOOKINGS_URL = "/api/v1/bookings/"
+
+
+def _headers(user):
+    return {"Authorization": f"Bearer {create_access_token(data=token_claims(user))}"}
+
+
+@pytest.fixture
+def replica_engine(tmp_path):
+    """An empty replica database with the schema, as if replication lagged."""
+    path = tmp_path / "replica.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+    return create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+
+
+@pytest.fixture
+def broken_engine(tmp_path):
+    """A replica that cannot be connected to."""
+    return create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db")
+
+
+@pytest.fixture
+def routed(client, monkeypatch):
+    """Route reads through a router on a fake clock, with write tracking on."""
+    clock = FakeClock()
+
+    def install(*replicas):
+        router = ReplicaRouter(
+            replicas, sticky_seconds=5, failure_cooldown_seconds=30, clock=clock
+        )
+        monkeypatch.setattr(database, "replica_router", router)
+        return router
+
+    # The real get_db records writes; point it at the test primary
+    monkeypatch.setattr(database, "AsyncSessionLocal", TestingAsyncSessionLocal)
+    monkeypatch.delitem(app.dependency_overrides, get_db)
+    return install, clock
+
+
+def test_router_rotates_and_skips_failed_replicas():
+    """Test round robin, failover cool-down and sticky windows."""
+    clock = FakeClock()
+    first, second = object(), object()
+    router = ReplicaRouter(
+        [first, second], sticky_seconds=5, failure_cooldown_seconds=30, clock=clock
+    )
+
+    assert router.candidates(None) == [first, second]
+    assert router.candidates(None) == [second, first]
+
+    router.mark_down(first)
+    assert router.candidates(None) == [second]
+    assert router.candidates(None) == [second]
+    clock.now += 30
+    assert router.candidates(None) == [first, second]
+
+    router.record_write(b"client")
+    assert router.candidates(b"client") == []
+    assert router.candidates(b"other") != []
+    clock.now += 5
+    assert router.candidates(b"client") != []
+
+    stats = router.stats()
+    assert (stats.replicas, stats.healthy, stats.failovers) == (2, 2, 1)
+    assert stats.sticky_reads == 1
+    assert ReplicaRouter([], 5, 30).candidates(b"client") == []
+
+
+def test_reads_go_to_replica_until_the_client_writes(
+    routed, client, create_tutor, create_booking, replica_engine
+):
+    """Test replica reads, read-your-writes stickiness and its expiry."""
+    install, clock = routed
+    router = install(replica_engine)
+    tutor = create_tutor()
+    start = datetime(2030, 1, 7, 10)
+    create_booking(tutor, start, start + timedelta(hours=1))
+    other = create_tutor()
+    create_booking(other, start, start + timedelta(hours=1))
+
+    headers, other_headers = _headers(tutor), _headers(other)
+
+    # The replica has not caught up with the bookings yet
+    assert client.get(BOOKINGS_URL, headers=headers).json() == []
+
+    response = client.put(
+        "/api/v1/users/profile", json={"first_name": "Ada"}, headers=headers
+    )
+    assert response.status_code == 200
+
+    assert len(client.get(BOOKINGS_URL, headers=headers).json()) == 1
+    assert client.get(BOOKINGS_URL, headers=other_headers).json() == []
+    clock.now += 5
+    assert client.get(BOOKINGS_URL, headers=headers).json() == []
+    stats = router.stats()
+    assert (stats.replica_reads, stats.sticky_reads) == (3, 1)
+
+
+def test_reads_fail_over_to_next_replica_and_primary(
+    routed, client, create_tutor, create_booking, replica_engine, broken_engine
+):
+    """Test that an unreachable replica is skipped, then the primary is used."""
+    install, _ = routed
+    tutor = create_tutor()
+    start = datetime(2030, 1, 7, 10)
+    create_booking(tutor, start, start + timedelta(hours=1))
+
+    router = install(broken_engine, replica_engine)
+    assert client.get(BOOKINGS_URL, headers=_headers(tutor)).json() == []
+    assert router.stats().healthy == 1
+
+    router = install(broken_engine)
+    assert len(client.get(BOOKINGS_URL, headers=_headers(tutor)).json()) == 1
+    stats = router.stats()
+    assert (stats.failovers, stats.primary_reads) == (1, 1)
+
+
+def test_cached_catalog_reads_the_primary(routed, client, create_tutor, replica_engine):
+    """Test that cached tutor pages are not rendered from a lagging replica."""
+    install, _ = routed
+    router = install(replica_engine)
+    tutor = create_tutor()
+
+    response = client.get(f"/api/v1/users/tutors/{tutor.id}")
+
+    assert response.status_code == 200
+    assert router.stats().replica_reads == 0
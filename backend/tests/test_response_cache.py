@@ -0,0 +1,241 @@
+"""
+Response cache tests for TutorFlow backend.
+
+This module contains tests for the response cache backends, entity tags,
+and the cached tutor catalog with its write-through invalidation.
+"""
+
+import uuid
+
+import pytest
+from fastapi import status
+
+from app.core.auth import create_access_token, token_claims
+from app.core.response_cache import (
+    CachedResponse,
+    InMemoryResponseCacheBackend,
+    RedisResponseCacheBackend,
+    ResponseCache,
+    cache_key,
+    response_cache,
+)
+from app.models.user import User, UserRole
+from app.utils.http_cache import etag_matches, make_etag
+from tests.test_query_plans import captured_statements
+from tests.test_revocation import FakeClock
+
+TUTORS_URL = "/api/v1/users/tutors"
+
+
+class FakeRedis:
+    """The subset of ``redis.asyncio.Redis`` used by the response backend."""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex):
+        self.values[key] = value.encode()
+
+    async def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(member.encode())
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.sets.pop(key, None)
+
+
+def _headers(user):
+    return {"Authorization": f"Bearer {create_access_token(data=token_claims(user))}"}
+
+
+def _admin(db_session):
+    admin = User(
+        email=f"admin-{uuid.uuid4().hex}@example.com",
+        password_hash="x",
+        role=UserRole.ADMIN,
+    )
+    db_session.add(admin)
+    db_session.commit()
+    return admin
+
+
+def test_etag_comparison():
+    """Test weak comparison of If-None-Match lists and wildcards."""
+    etag = make_etag(b"[]")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+    assert make_etag(b"[]", weak=True) == f"W/{etag}"
+
+
+def test_cache_key_ignores_order_and_missing_params():
+    """Test that equivalent requests share a cache key."""
+    assert cache_key("tutors", limit=10, subject="math", skip=None) == cache_key(
+        "tutors", subject="math", limit=10
+    )
+    assert cache_key("tutors", verified_only=True) == "tutors?verified_only=true"
+    assert cache_key("tutors", subject="a&b=c") == "tutors?subject=a%26b%3Dc"
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_evicts_and_expires():
+    """Test LRU eviction, TTL expiry and tag index cleanup."""
+    clock = FakeClock()
+    backend = InMemoryResponseCacheBackend(2, clock=clock)
+    entries = {
+        name: CachedResponse.render([name], tags=[f"tag:{name}", "shared"])
+        for name in "abc"
+    }
+
+    await backend.set("a", entries["a"], 10)
+    await backend.set("b", entries["b"], 10)
+    assert await backend.get("a") == entries["a"]
+    await backend.set("c", entries["c"], 10)
+
+    assert await backend.get("b") is None
+    assert len(backend) == 2
+    clock.now += 10
+    assert await backend.get("a") is None
+    await backend.invalidate(["shared"])
+    assert len(backend) == 0
+    assert backend._tags == {}
+
+
+@pytest.mark.asyncio
+async def test_put_after_invalidation_is_dropped():
+    """Test that a response read before an invalidation is not stored."""
+    cache = ResponseCache(InMemoryResponseCacheBackend(10), ttl_seconds=60)
+    epoch = cache.epoch()
+
+    await cache.invalidate("tutor:1")
+    await cache.put("key", CachedResponse.render({}), epoch)
+
+    assert await cache.get("key") is None
+    await cache.put("key", CachedResponse.render({}), cache.epoch())
+    assert await cache.get("key") is not None
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_invalidates_by_tag():
+    """Test that the shared backend round-trips entries and drops by tag."""
+    backend = RedisResponseCacheBackend(FakeRedis())
+    kept = CachedResponse.render([1], tags=["tutor:1"], headers={"X-Next-Cursor": "c"})
+    dropped = CachedResponse.render([2], tags=["tutor:2"])
+
+    await backend.set("one", kept, 60)
+    await backend.set("two", dropped, 60)
+    await backend.invalidate(["tutor:2"])
+
+    assert await backend.get("one") == kept
+    assert await backend.get("two") is None
+
+
+def test_tutor_list_is_served_from_cache(client, async_db_engine, create_tutor):
+    """Test that a repeated list request does not query the database."""
+    create_tutor()
+
+    with captured_statements(async_db_engine.sync_engine, "tutors") as statements:
+        first = client.get(TUTORS_URL, params={"limit": 10, "subject": "Math"})
+        second = client.get(TUTORS_URL, params={"subject": "MATH ", "limit": 10})
+
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert len(statements) == 1
+    assert response_cache.stats().hits == 1
+
+
+def test_unchanged_responses_return_304(client, create_tutor):
+    """Test If-None-Match on the tutor list and detail endpoints."""
+    tutor = create_tutor()
+
+    for url in (TUTORS_URL, f"{TUTORS_URL}/{tutor.id}"):
+        etag = client.get(url).headers["etag"]
+        response = client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+
+def test_profile_update_invalidates_only_that_tutor(client, create_tutor):
+    """Test that a name change refreshes the tutor's pages and no others."""
+    tutor = create_tutor(first_name="Ada")
+    other = create_tutor()
+    detail_url = f"{TUTORS_URL}/{tutor.id}"
+    client.get(TUTORS_URL)
+    client.get(detail_url)
+    other_etag = client.get(f"{TUTORS_URL}/{other.id}").headers["etag"]
+
+    response = client.put(
+        "/api/v1/users/profile", headers=_headers(tutor), json={"first_name": "Grace"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert client.get(detail_url).json()["first_name"] == "Grace"
+    names = {item["id"]: item["first_name"] for item in client.get(TUTORS_URL).json()}
+    assert names[str(tutor.id)] == "Grace"
+    hits = response_cache.stats().hits
+    cached = client.get(
+        f"{TUTORS_URL}/{other.id}", headers={"If-None-Match": other_etag}
+    )
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response_cache.stats().hits == hits + 1
+
+
+def test_tutor_profile_change_updates_filtered_lists(client, create_tutor):
+    """Test that a rate change moves the tutor between cached list pages."""
+    tutor = create_tutor(hourly_rate=30.0)
+    params = {"min_rate": 40}
+    assert client.get(TUTORS_URL, params=params).json() == []
+
+    response = client.post(
+        "/api/v1/users/tutor/profile",
+        headers=_headers(tutor),
+        json={"subjects": ["Math"], "hourly_rate": 45},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in client.get(TUTORS_URL, params=params).json()] == [
+        str(tutor.id)
+    ]
+
+
+def test_admin_changes_invalidate_catalog(client, db_session, create_tutor):
+    """Test that verification and status changes reach cached pages."""
+    tutor = create_tutor()
+    headers = _headers(_admin(db_session))
+    detail_url = f"{TUTORS_URL}/{tutor.id}"
+    assert len(client.get(TUTORS_URL).json()) == 1
+    assert client.get(detail_url).json()["is_verified"] is True
+
+    client.put(
+        f"{TUTORS_URL}/{tutor.id}/verify",
+        params={"is_verified": False},
+        headers=headers,
+    )
+
+    assert client.get(TUTORS_URL).json() == []
+    assert client.get(detail_url).json()["is_verified"] is False
+
+    client.put(
+        f"/api/v1/users/{tutor.id}/status",
+        params={"is_active": False},
+        headers=headers,
+    )
+
+    assert client.get(detail_url).status_code == status.HTTP_404_NOT_FOUND
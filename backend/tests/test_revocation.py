@@ -0,0 +1,193 @@
+"""
+Token revocation tests for TutorFlow backend.
+
+This module contains tests for the Bloom filter, the revocation backends,
+the revocation store in front of them, and logout.
+"""
+
+import pytest
+from fastapi import status
+
+from app.core.revocation import (
+    InMemoryRevocationBackend,
+    RedisRevocationBackend,
+    RevocationStore,
+    revocation_store,
+)
+from app.utils.bloom import BloomFilter
+
+
+class FakeClock:
+    """Manually set clock."""
+
+    def __init__(self, now=1_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """The subset of ``redis.asyncio.Redis`` used by the Redis backend."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.keys = {}
+        self.sorted_sets = {}
+        self.calls = 0
+
+    async def set(self, key, value, ex):
+        self.calls += 1
+        self.keys[key] = self.clock() + ex
+
+    async def exists(self, key):
+        self.calls += 1
+        return int(self.keys.get(key, 0) > self.clock())
+
+    async def zadd(self, key, mapping):
+        self.calls += 1
+        self.sorted_sets.setdefault(key, {}).update(mapping)
+
+    async def zremrangebyscore(self, key, low, high):
+        self.calls += 1
+        members = self.sorted_sets.get(key, {})
+        for member, score in list(members.items()):
+            if score <= high:
+                del members[member]
+
+    async def zrangebyscore(self, key, low, high):
+        self.calls += 1
+        return [
+            member.encode()
+            for member, score in self.sorted_sets.get(key, {}).items()
+            if score >= low
+        ]
+
+
+class CountingBackend(InMemoryRevocationBackend):
+    """In-memory backend that counts point lookups."""
+
+    def __init__(self, clock):
+        super().__init__(clock)
+        self.lookups = 0
+
+    async def contains(self, jti):
+        self.lookups += 1
+        return await super().contains(jti)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test that every added item is reported and few others are."""
+    bloom = BloomFilter(1_000, error_rate=0.01)
+    added = [f"jti-{n}" for n in range(1_000)]
+    for item in added:
+        bloom.add(item)
+
+    assert all(item in bloom for item in added)
+    false_positives = sum(f"other-{n}" in bloom for n in range(10_000))
+    assert false_positives < 300
+    assert len(bloom) == 1_000
+
+
+def test_bloom_filter_rejects_bad_sizing():
+    """Test that capacity and error rate are validated."""
+    with pytest.raises(ValueError):
+        BloomFilter(0)
+    with pytest.raises(ValueError):
+        BloomFilter(10, error_rate=1.0)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_expires_entries():
+    """Test that records disappear when the token would have expired."""
+    clock = FakeClock()
+    backend = InMemoryRevocationBackend(clock)
+    await backend.add("a", clock.now + 10)
+    await backend.add("b", clock.now + 100)
+
+    assert await backend.contains("a")
+    clock.now += 50
+    assert not await backend.contains("a")
+    assert await backend.active() == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_unrevoked_tokens_skip_the_backend():
+    """Test that the prefilter answers "not revoked" without a lookup."""
+    clock = FakeClock()
+    backend = CountingBackend(clock)
+    store = RevocationStore(backend, filter_capacity=100, clock=clock)
+    await store.revoke("revoked", clock.now + 60)
+
+    for n in range(100):
+        assert not await store.is_revoked(f"live-{n}")
+    assert await store.is_revoked("revoked")
+
+    assert backend.lookups <= 2
+    stats = store.stats()
+    assert stats.filtered >= 99
+    assert stats.revoked == 1
+
+
+@pytest.mark.asyncio
+async def test_revocation_reaches_other_workers_after_refresh():
+    """Test that a shared backend propagates revocations within the interval."""
+    clock = FakeClock()
+    backend = RedisRevocationBackend(FakeRedis(clock), clock=clock)
+    worker_a = RevocationStore(backend, refresh_seconds=5, clock=clock)
+    worker_b = RevocationStore(backend, refresh_seconds=5, clock=clock)
+    assert not await worker_b.is_revoked("token")
+
+    await worker_a.revoke("token", clock.now + 60)
+
+    assert await worker_a.is_revoked("token")
+    assert not await worker_b.is_revoked("token")
+    clock.now += 5
+    assert await worker_b.is_revoked("token")
+    clock.now += 60
+    assert not await worker_b.is_revoked("token")
+
+
+def test_logout_revokes_access_and_refresh_tokens(client, test_user_data):
+    """Test that tokens stop working after logout."""
+    tokens = client.post("/api/v1/auth/register", json=test_user_data).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    response = client.post(
+        "/api/v1/auth/logout",
+        headers=headers,
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    me = client.get("/api/v1/auth/me", headers=headers)
+    assert me.status_code == status.HTTP_401_UNAUTHORIZED
+    refresh = client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert refresh.status_code == status.HTTP_401_UNAUTHORIZED
+    assert revocation_store.stats().revoked >= 2
+
+
+def test_logout_without_body_keeps_other_sessions(client, test_user_data):
+    """Test that logging out one session leaves a second login usable."""
+    client.post("/api/v1/auth/register", json=test_user_data)
+    credentials = {
+        "email": test_user_data["email"],
+        "password": test_user_data["password"],
+    }
+    first = client.post("/api/v1/auth/login", json=credentials).json()
+    second = client.post("/api/v1/auth/login", json=credentials).json()
+
+    response = client.post(
+        "/api/v1/auth/logout",
+        headers={"Authorization": f"Bearer {first['access_token']}"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    other = client.get(
+        "/api/v1/auth/me",
+        headers={"Authorization": f"Bearer {second['access_token']}"},
+    )
+    assert other.status_code == status.HTTP_200_OK
@@ -0,0 +1,67 @@
+"""
+JSON serialization tests for TutorFlow backend.
+
+This module checks that orjson-encoded responses match what
+``jsonable_encoder`` and the standard library encoder produced before.
+"""
+
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app.models.user import BookingStatus
+from app.schemas.booking import BookingList
+from app.utils.serialization import ORJSONResponse, dumps
+
+
+def test_dumps_matches_jsonable_encoder():
+    """Test that common response values encode as they did before."""
+    booking = BookingList(
+        id=1,
+        student_id=uuid.uuid4(),
+        tutor_id=uuid.uuid4(),
+        subject="Math",
+        start_time=datetime(2030, 1, 7, 10, 0, 0, 250_000),
+        end_time=datetime(2030, 1, 7, 11),
+        status=BookingStatus.CONFIRMED,
+        created_at=datetime(2030, 1, 1),
+    )
+    content = {
+        "booking": booking,
+        "row": booking.model_dump(),
+        "rate": Decimal("42.5"),
+        "by_day": {date(2030, 1, 7): ["10:00"]},
+        "missing": None,
+    }
+
+    assert json.loads(dumps(content)) == jsonable_encoder(content)
+    assert dumps(booking.model_dump()) == booking.model_dump_json().encode()
+
+
+def test_dumps_rejects_unknown_types():
+    """Test that unsupported values fail loudly instead of being dropped."""
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+
+def test_routes_default_to_orjson(client, create_tutor, monkeypatch):
+    """Test that endpoints in included routers render through orjson."""
+    rendered = []
+    render = ORJSONResponse.render
+    monkeypatch.setattr(
+        ORJSONResponse,
+        "render",
+        lambda self, content: rendered.append(content) or render(self, content),
+    )
+    tutor = create_tutor()
+
+    response = client.get(
+        f"/api/v1/bookings/slots/{tutor.id}", params={"date_str": "2030-01-07"}
+    )
+
+    assert response.status_code == 200
+    assert rendered == [response.json()]
@@ -0,0 +1,256 @@
+"""
+Slot engine tests for TutorFlow backend.
+
+This module contains tests for the bitmap-based availability grid
+and the slot lookup endpoint built on top of it.
+"""
+
+import json
+from datetime import date, datetime, timedelta
+
+from fastapi import status
+
+from app.config import settings
+
+from app.models.user import BookingStatus
+from app.services.booking_service import BookingService
+from app.services.slot_engine import (
+    AvailabilityGrid,
+    interval_mask,
+    iter_available_slots,
+    mask_to_times,
+    range_mask,
+    start_mask,
+    weekly_masks,
+)
+
+# 2030-01-07 is a Monday
+MONDAY = date(2030, 1, 7)
+SCHEDULE = json.dumps({"monday": [["09:00", "11:00"]], "tuesday": []})
+
+
+def _at(hour: int, minute: int = 0, day: date = MONDAY) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, minute)
+
+
+def test_weekly_masks_parses_blocks():
+    """Test that schedule blocks become the expected open slots."""
+    masks = weekly_masks(SCHEDULE)
+
+    assert mask_to_times(masks[0]) == [
+        "09:00",
+        "09:15",
+        "09:30",
+        "09:45",
+        "10:00",
+        "10:15",
+        "10:30",
+        "10:45",
+    ]
+    assert masks[1] == 0
+
+
+def test_weekly_masks_rounds_unaligned_blocks_inwards():
+    """Test that blocks off slot boundaries are shrunk to whole slots."""
+    masks = weekly_masks(json.dumps({"monday": [["09:10", "10:05"]]}))
+
+    assert mask_to_times(masks[0]) == ["09:15", "09:30", "09:45"]
+
+
+def test_weekly_masks_invalid_schedule():
+    """Test that malformed schedules yield no open slots."""
+    assert weekly_masks("not json") == (0,) * 7
+    assert weekly_masks(None) == (0,) * 7
+    assert weekly_masks(json.dumps({"monday": [["25:00", "26:00"]]})) == (0,) * 7
+
+
+def test_start_mask_requires_consecutive_free_slots():
+    """Test that a 60-minute session needs four consecutive free slots."""
+    free = range_mask(36, 40) | range_mask(41, 44)
+
+    assert mask_to_times(start_mask(free, 30)) == [
+        "09:00",
+        "09:15",
+        "09:30",
+        "10:15",
+        "10:30",
+    ]
+    assert mask_to_times(start_mask(free, 60)) == ["09:00"]
+
+
+def test_interval_mask_clips_to_day():
+    """Test that intervals spanning midnight only cover the given day."""
+    mask = interval_mask(_at(23, 30), _at(0, 30, MONDAY + timedelta(days=1)), MONDAY)
+
+    assert mask_to_times(mask) == ["23:30", "23:45"]
+
+
+def test_grid_blocks_booking_and_buffer():
+    """Test that a booking and the buffers on both sides are unavailable."""
+    grid = AvailabilityGrid(SCHEDULE, [(_at(9, 30), _at(10, 0))])
+
+    assert grid.available_slots(MONDAY, 30) == ["10:15", "10:30"]
+    assert not grid.is_free(_at(10, 0), _at(10, 15))
+    assert not grid.is_free(_at(9, 0), _at(9, 30))
+    assert grid.is_free(_at(9, 0), _at(9, 15))
+    assert grid.is_free(_at(10, 15), _at(10, 45))
+
+
+def test_grid_booking_across_midnight():
+    """Test that a buffered booking running past midnight blocks the next day."""
+    sunday = MONDAY - timedelta(days=1)
+    grid = AvailabilityGrid(
+        json.dumps({"monday": [["00:00", "01:00"]]}),
+        [(_at(23, 30, sunday), _at(23, 55, sunday))],
+    )
+
+    assert grid.available_slots(MONDAY, 30) == ["00:15", "00:30"]
+
+
+def test_get_available_slots_endpoint(client, create_tutor, create_booking):
+    """Test slot lookup against stored bookings."""
+    tutor = create_tutor(availability_schedule=SCHEDULE)
+    create_booking(tutor, _at(9, 30), _at(10, 0))
+    create_booking(tutor, _at(10, 30), _at(11, 0), status=BookingStatus.CANCELLED)
+
+    response = client.get(
+        f"/api/v1/bookings/slots/{tutor.id}",
+        params={"date_str": MONDAY.isoformat(), "duration": 30},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"slots": ["10:15", "10:30"]}
+
+
+def test_get_available_slots_day_without_schedule(client, create_tutor):
+    """Test that days with no schedule blocks have no slots."""
+    tutor = create_tutor(availability_schedule=SCHEDULE)
+
+    response = client.get(
+        f"/api/v1/bookings/slots/{tutor.id}",
+        params={"date_str": (MONDAY + timedelta(days=1)).isoformat()},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"slots": []}
+
+
+def test_get_available_slots_invalid_duration(client, create_tutor):
+    """Test that unsupported durations are rejected."""
+    tutor = create_tutor(availability_schedule=SCHEDULE)
+
+    response = client.get(
+        f"/api/v1/bookings/slots/{tutor.id}",
+        params={"date_str": MONDAY.isoformat(), "duration": 45},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_booking_service_check_availability(db_session, create_tutor, create_booking):
+    """Test that the service keeps the buffer around existing bookings."""
+    tutor = create_tutor(availability_schedule=SCHEDULE)
+    create_booking(tutor, _at(9, 0), _at(10, 0))
+    service = BookingService(db_session)
+
+    assert not service.check_availability(tutor.id, _at(9, 30), _at(10, 30))
+    assert not service.check_availability(tutor.id, _at(10, 0), _at(10, 30))
+    assert service.check_availability(tutor.id, _at(10, 15), _at(11, 0))
+    assert not service.check_availability(tutor.id, _at(8, 0), _at(9, 0))
+    assert service.check_availability(tutor.id, _at(8, 0), _at(8, 45))
+
+
+def test_iter_available_slots_emits_days_before_later_bookings():
+    """Test that a day is yielded before bookings on later days are consumed."""
+    wednesday = MONDAY + timedelta(days=2)
+    next_monday = MONDAY + timedelta(days=7)
+    consumed = []
+
+    def bookings():
+        for booking in [
+            (_at(9, 0), _at(9, 30)),
+            (_at(9, 0, wednesday), _at(9, 30, wednesday)),
+            (_at(9, 0, next_monday), _at(10, 0, next_monday)),
+        ]:
+            consumed.append(booking)
+            yield booking
+
+    days = iter_available_slots(SCHEDULE, bookings(), MONDAY, next_monday, 60)
+
+    assert next(days) == (MONDAY, ["09:45", "10:00"])
+    assert len(consumed) == 2
+
+    remaining = list(days)
+    assert len(consumed) == 3
+    assert [day for day, _ in remaining] == [
+        MONDAY + timedelta(days=offset) for offset in range(1, 8)
+    ]
+    assert remaining[-1] == (next_monday, [])
+
+
+def test_buffer_before_booking_after_midnight():
+    """Test that a booking early next day blocks the buffer of late sessions."""
+    tuesday = MONDAY + timedelta(days=1)
+    schedule = json.dumps({"monday": [["22:00", "24:00"]]})
+    bookings = [(_at(0, 5, tuesday), _at(1, 0, tuesday))]
+
+    days = list(iter_available_slots(schedule, bookings, MONDAY, tuesday, 60))
+
+    assert days[0] == (MONDAY, ["22:00", "22:15", "22:30", "22:45"])
+
+
+def test_get_available_slots_range_endpoint(client, create_tutor, create_booking):
+    """Test that a range query returns one NDJSON line per day."""
+    tutor = create_tutor(availability_schedule=SCHEDULE)
+    create_booking(tutor, _at(9, 0), _at(10, 0))
+
+    response = client.get(
+        f"/api/v1/bookings/slots/{tutor.id}/range",
+        params={
+            "date_from": MONDAY.isoformat(),
+            "date_to": (MONDAY + timedelta(days=7)).isoformat(),
+            "duration": 30,
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    days = [json.loads(line) for line in response.text.splitlines()]
+    assert [day["date"] for day in days] == [
+        (MONDAY + timedelta(days=offset)).isoformat() for offset in range(8)
+    ]
+    assert days[0]["slots"] == ["10:15", "10:30"]
+    assert days[1]["slots"] == []
+    assert len(days[7]["slots"]) == 7
+
+
+def test_get_available_slots_range_too_long(client, create_tutor):
+    """Test that ranges over the configured cap are rejected."""
+    tutor = create_tutor(availability_schedule=SCHEDULE)
+
+    response = client.get(
+        f"/api/v1/bookings/slots/{tutor.id}/range",
+        params={
+            "date_from": MONDAY.isoformat(),
+            "date_to": (
+                MONDAY + timedelta(days=settings.max_slot_range_days)
+            ).isoformat(),
+        },
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_available_slots_range_reversed(client, create_tutor):
+    """Test that a range ending before it starts is rejected."""
+    tutor = create_tutor(availability_schedule=SCHEDULE)
+
+    response = client.get(
+        f"/api/v1/bookings/slots/{tutor.id}/range",
+        params={
+            "date_from": MONDAY.isoformat(),
+            "date_to": (MONDAY - timedelta(days=1)).isoformat(),
+        },
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
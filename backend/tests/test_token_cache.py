@@ -0,0 +1,109 @@
+"""
+Decoded token cache tests for TutorFlow backend.
+
+This module contains tests for the bounded cache of verified JWT claims
+used by ``get_current_user``.
+"""
+
+from datetime import timedelta
+
+import pytest
+from fastapi import status
+from jose import JWTError
+
+from app.core.auth import create_access_token, decode_access_token
+from app.core.token_cache import DecodedTokenCache, token_cache
+
+
+class FakeClock:
+    """Manually set wall clock."""
+
+    def __init__(self, now=1_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_counts_hits_and_misses():
+    """Test that lookups are counted and served until ``exp``."""
+    clock = FakeClock()
+    cache = DecodedTokenCache(max_size=10, clock=clock)
+    claims = {"sub": "user@example.com", "exp": 1_060}
+
+    assert cache.get("token") is None
+    cache.put("token", claims)
+    assert cache.get("token") is claims
+    clock.now = 1_060
+    assert cache.get("token") is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 2, 0)
+
+
+def test_cache_is_bounded():
+    """Test that the least recently used token is evicted when full."""
+    cache = DecodedTokenCache(max_size=2, clock=FakeClock())
+    for name in ("a", "b"):
+        cache.put(name, {"exp": 2_000})
+    cache.get("a")
+    cache.put("c", {"exp": 2_000})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats().size == 2
+
+
+@pytest.mark.parametrize(
+    "max_size, claims", [(0, {"exp": 2_000}), (10, {"sub": "no-exp"})]
+)
+def test_cache_skips_uncacheable(max_size, claims):
+    """Test that a disabled cache or a token without ``exp`` stores nothing."""
+    cache = DecodedTokenCache(max_size=max_size, clock=FakeClock())
+    cache.put("token", claims)
+
+    assert cache.get("token") is None
+
+
+def test_decode_access_token_reuses_verification():
+    """Test that a token is verified once and then served from the cache."""
+    token_cache.clear()
+    token = create_access_token(data={"sub": "user@example.com"})
+
+    first = decode_access_token(token)
+    second = decode_access_token(token)
+
+    assert first == second
+    assert token_cache.stats().hits == 1
+    token_cache.clear()
+
+
+def test_decode_access_token_rejects_bad_tokens():
+    """Test that invalid and expired tokens raise and are never cached."""
+    token_cache.clear()
+    expired = create_access_token(
+        data={"sub": "user@example.com"}, expires_delta=timedelta(seconds=-1)
+    )
+
+    for token in ("not-a-token", expired):
+        with pytest.raises(JWTError):
+            decode_access_token(token)
+
+    assert token_cache.stats().size == 0
+
+
+def test_repeat_requests_hit_token_cache(client, test_user_data):
+    """Test that a page load's repeated bearer token is decoded once."""
+    token = client.post("/api/v1/auth/register", json=test_user_data).json()[
+        "access_token"
+    ]
+    headers = {"Authorization": f"Bearer {token}"}
+    before = token_cache.stats()
+
+    for _ in range(3):
+        response = client.get("/api/v1/auth/me", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+
+    after = token_cache.stats()
+    assert after.misses - before.misses == 1
+    assert after.hits - before.hits == 2
@@ -0,0 +1,239 @@
+"""
+Full-text tutor search tests for TutorFlow backend.
+
+This module contains tests for the ranked search endpoint, the hooks that
+keep search documents current, and the migration that builds them.
+"""
+
+import importlib.util
+import json
+import uuid
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from fastapi import status
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.core.auth import create_access_token, token_claims
+from app.database import Base
+from app.models.user import Tutor, User, UserProfile, UserRole
+from app.services.tutor_search import fts_match_expression, text_search_query
+
+MIGRATION = (
+    Path(__file__).resolve().parent.parent
+    / "alembic"
+    / "versions"
+    / "d6f1b3a8c2e9_add_tutor_full_text_search.py"
+)
+SEARCH_URL = "/api/v1/users/tutors/search"
+
+
+def _ids(response):
+    return [tutor["id"] for tutor in response.json()["tutors"]]
+
+
+def test_search_ranks_name_and_subject_above_bio(client, create_tutor):
+    """Test that stronger fields rank higher and non-matches are excluded."""
+    in_bio = create_tutor(subjects=["Physics"], bio="I also help with calculus")
+    in_subjects = create_tutor(subjects=["Calculus", "Algebra"])
+    create_tutor(subjects=["History"], bio="Ancient Rome")
+    create_tutor(subjects=["Calculus"], is_verified=False)
+
+    response = client.get(SEARCH_URL, params={"q": "calculus"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert _ids(response) == [str(in_subjects.id), str(in_bio.id)]
+    assert response.json()["total"] == 2
+
+
+def test_search_requires_every_word_and_stems(client, create_tutor):
+    """Test that all words must match and word forms are folded."""
+    match = create_tutor(subjects=["Chemistry"], bio="Teaching organic reactions")
+    create_tutor(subjects=["Chemistry"], bio="Inorganic only")
+
+    response = client.get(SEARCH_URL, params={"q": "chemistry organic teach"})
+
+    assert _ids(response) == [str(match.id)]
+
+
+def test_search_paginates_with_total(client, create_tutor):
+    """Test that pages are disjoint and report the full match count."""
+    expected = {str(create_tutor(subjects=["Biology"]).id) for _ in range(5)}
+
+    pages = [
+        client.get(SEARCH_URL, params={"q": "biology", "limit": 2, "skip": skip})
+        for skip in (0, 2, 4)
+    ]
+
+    seen = [tutor_id for page in pages for tutor_id in _ids(page)]
+    assert len(seen) == 5 and set(seen) == expected
+    assert all(page.json()["total"] == 5 for page in pages)
+
+
+def test_search_past_the_end_keeps_total(client, create_tutor):
+    """Test that a page past the last match still reports the match count."""
+    for _ in range(3):
+        create_tutor(subjects=["Geology"])
+
+    response = client.get(SEARCH_URL, params={"q": "geology", "skip": 10})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"tutors": [], "total": 3}
+    no_match = client.get(SEARCH_URL, params={"q": "zoology", "skip": 10})
+    assert no_match.json() == {"tutors": [], "total": 0}
+
+
+def test_search_ignores_query_syntax(client, create_tutor):
+    """Test that FTS operators in user input are treated as plain words."""
+    create_tutor(subjects=["Math"])
+
+    assert client.get(SEARCH_URL, params={"q": '"*(-'}).json() == {
+        "tutors": [],
+        "total": 0,
+    }
+    assert len(_ids(client.get(SEARCH_URL, params={"q": "math OR"}))) == 0
+    assert fts_match_expression('math" OR x*') == '"math" "OR" "x"'
+
+
+def test_profile_writes_refresh_search_documents(client, db_session):
+    """Test that tutor and profile updates are searchable immediately."""
+    user = User(email="writer@example.com", password_hash="x", role=UserRole.TUTOR)
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserProfile(user_id=user.id, first_name="Grace", last_name="Hopper"))
+    db_session.commit()
+    headers = {
+        "Authorization": f"Bearer {create_access_token(data=token_claims(user))}"
+    }
+
+    response = client.post(
+        "/api/v1/users/tutor/profile",
+        headers=headers,
+        json={"subjects": ["Compilers"], "hourly_rate": 40, "bio": "COBOL veteran"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    db_session.get(Tutor, user.id).is_verified = True
+    db_session.commit()
+    assert _ids(client.get(SEARCH_URL, params={"q": "cobol compilers"})) == [
+        str(user.id)
+    ]
+
+    response = client.put(
+        "/api/v1/users/profile", headers=headers, json={"last_name": "Brewster"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert _ids(client.get(SEARCH_URL, params={"q": "brewster"})) == [str(user.id)]
+    assert _ids(client.get(SEARCH_URL, params={"q": "hopper"})) == []
+
+
+def test_search_survives_rowid_renumbering():
+    """Test that documents follow their tutor when VACUUM renumbers rows."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    tutor_ids = [uuid.uuid4() for _ in range(3)]
+    with Session(engine) as session:
+        for tutor_id, last_name in zip(tutor_ids, ("Babbage", "Lovelace", "Hopper")):
+            session.add(
+                User(
+                    id=tutor_id,
+                    email=f"{last_name}@example.com",
+                    password_hash="x",
+                    role=UserRole.TUTOR,
+                )
+            )
+            session.add(
+                UserProfile(user_id=tutor_id, first_name="Ada", last_name=last_name)
+            )
+            session.add(
+                Tutor(
+                    user_id=tutor_id,
+                    subjects=json.dumps(["Math"]),
+                    hourly_rate=40.0,
+                    is_verified=True,
+                )
+            )
+        session.commit()
+        session.execute(delete(Tutor).where(Tutor.user_id == tutor_ids[0]))
+        session.commit()
+
+    with engine.connect() as connection:
+        # What VACUUM may do to tables without an INTEGER PRIMARY KEY
+        connection.exec_driver_sql("UPDATE tutors SET rowid = rowid + 100")
+        found = connection.execute(text_search_query("sqlite", "hopper", 10)).all()
+
+    assert [row.user_id for row in found] == [tutor_ids[2]]
+
+
+def test_postgres_query_uses_search_vector():
+    """Test that the Postgres statement matches and ranks the tsvector."""
+    sql = str(
+        text_search_query("postgresql", "algebra", 20).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+
+    assert "websearch_to_tsquery('english'::regconfig" in sql
+    assert "tutor_search_documents.search_vector @@" in sql
+    assert "ts_rank_cd" in sql
+    assert "count(*) OVER ()" in sql
+
+
+def test_search_migration_backfills_documents():
+    """Test that the migration indexes tutors that already exist."""
+    spec = importlib.util.spec_from_file_location("fulltext_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    tutor_id = uuid.uuid4()
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP TRIGGER tutor_search_fts_delete")
+        connection.exec_driver_sql("DROP TABLE tutor_search_fts")
+        connection.execute(
+            insert(User).values(
+                id=tutor_id,
+                email="legacy@example.com",
+                password_hash="x",
+                role=UserRole.TUTOR,
+            )
+        )
+        connection.execute(
+            insert(UserProfile).values(
+                user_id=tutor_id, first_name="Ada", last_name="Lovelace"
+            )
+        )
+        connection.execute(
+            insert(Tutor).values(
+                user_id=tutor_id,
+                subjects=json.dumps(["Math"]),
+                hourly_rate=40.0,
+                is_verified=True,
+            )
+        )
+        migration.op = Operations(MigrationContext.configure(connection))
+
+        migration.upgrade()
+        found = connection.execute(text_search_query("sqlite", "lovelace", 10)).all()
+        migration.downgrade()
+        tables = {
+            row[0]
+            for row in connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+
+    assert [row.user_id for row in found] == [tutor_id]
+    assert "tutor_search_fts" not in tables
@@ -0,0 +1,93 @@
+"""
+Tutor search tests for TutorFlow backend.
+
+This module contains tests for the cross-tutor availability search
+endpoint.
+"""
+
+import json
+from datetime import datetime
+
+from fastapi import status
+
+# 2030-01-07 is a Monday
+SCHEDULE = json.dumps({"monday": [["09:00", "17:00"]]})
+SEARCH_URL = "/api/v1/users/tutors/available"
+
+
+def _search(client, **params):
+    params.setdefault("subject", "Math")
+    params.setdefault("start_time", "2030-01-07T10:00:00")
+    params.setdefault("duration", 60)
+    return client.get(SEARCH_URL, params=params)
+
+
+def test_search_returns_free_tutors(client, create_tutor, create_booking):
+    """Test that only tutors free for the session are returned."""
+    free = create_tutor(availability_schedule=SCHEDULE, first_name="Free")
+    busy = create_tutor(availability_schedule=SCHEDULE, first_name="Busy")
+    create_booking(busy, datetime(2030, 1, 7, 10, 30), datetime(2030, 1, 7, 11, 30))
+
+    response = _search(client)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [tutor["id"] for tutor in data["tutors"]] == [str(free.id)]
+    assert data["next_cursor"] is None
+
+
+def test_search_respects_buffer_and_schedule(client, create_tutor, create_booking):
+    """Test that buffers, schedules and exact subjects are honoured."""
+    buffered = create_tutor(availability_schedule=SCHEDULE)
+    create_booking(buffered, datetime(2030, 1, 7, 9, 0), datetime(2030, 1, 7, 9, 50))
+    create_tutor(availability_schedule=json.dumps({"monday": [["12:00", "17:00"]]}))
+    create_tutor(availability_schedule=SCHEDULE, subjects=["Mathematics history"])
+    create_tutor(availability_schedule=SCHEDULE, is_verified=False)
+
+    response = _search(client)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["tutors"] == []
+
+
+def test_search_cancelled_booking_does_not_block(client, create_tutor, create_booking):
+    """Test that cancelled bookings do not make a tutor busy."""
+    tutor = create_tutor(availability_schedule=SCHEDULE)
+    create_booking(
+        tutor,
+        datetime(2030, 1, 7, 10, 0),
+        datetime(2030, 1, 7, 11, 0),
+        status="cancelled",
+    )
+
+    response = _search(client)
+
+    assert [t["id"] for t in response.json()["tutors"]] == [str(tutor.id)]
+
+
+def test_search_cursor_pagination(client, create_tutor):
+    """Test that pages are disjoint, stable and cover every match."""
+    expected = sorted(
+        str(create_tutor(availability_schedule=SCHEDULE).id) for _ in range(5)
+    )
+
+    seen = []
+    cursor = None
+    for _ in range(5):
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        data = _search(client, **params).json()
+        seen.extend(tutor["id"] for tutor in data["tutors"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+
+def test_search_invalid_cursor(client):
+    """Test that a malformed cursor is rejected."""
+    response = _search(client, cursor="not-a-cursor")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,148 @@
+"""
+Tutor subject search tests for TutorFlow backend.
+
+This module contains tests for the normalized ``tutor_subjects`` table, the
+exact and prefix subject filters, and the migration that backfills it.
+"""
+
+import importlib.util
+import json
+import uuid
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from fastapi import status
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.pool import StaticPool
+
+from app.core.auth import create_access_token, token_claims
+from app.database import Base
+from app.models.user import Tutor, TutorSubject, User, UserRole, subject_keys
+
+MIGRATION = (
+    Path(__file__).resolve().parent.parent
+    / "alembic"
+    / "versions"
+    / "9a4c2e7b5d18_add_tutor_subjects_table.py"
+)
+TUTORS_URL = "/api/v1/users/tutors"
+
+
+def _stored_subjects(db_session, tutor_id):
+    db_session.expire_all()
+    return set(
+        db_session.scalars(
+            select(TutorSubject.subject).where(TutorSubject.tutor_id == tutor_id)
+        )
+    )
+
+
+def test_subject_keys_normalize_and_dedupe():
+    """Test that keys are trimmed, lower-cased and unique."""
+    assert subject_keys('[" Math ", "math", "Computer  Science", ""]') == [
+        "math",
+        "computer science",
+    ]
+    assert subject_keys("not json") == []
+    assert subject_keys('{"a": 1}') == []
+
+
+def test_list_tutors_matches_exact_subject(client, create_tutor):
+    """Test that "Math" no longer matches "Mathematics history"."""
+    math = create_tutor(subjects=["Math", "Physics"])
+    create_tutor(subjects=["Mathematics history"])
+
+    response = client.get(TUTORS_URL, params={"subject": "math"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [tutor["id"] for tutor in response.json()] == [str(math.id)]
+
+
+def test_list_tutors_matches_subject_prefix(client, create_tutor):
+    """Test that a prefix search matches every subject starting with it."""
+    ids = {
+        str(create_tutor(subjects=["Math"]).id),
+        str(create_tutor(subjects=["Mathematics history"]).id),
+    }
+    create_tutor(subjects=["Applied math"])
+    create_tutor(subjects=["Mat_h"])
+
+    response = client.get(
+        TUTORS_URL, params={"subject": "Math", "subject_prefix": True}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert {tutor["id"] for tutor in response.json()} == ids
+
+
+def test_subject_rows_follow_profile_updates(client, db_session):
+    """Test that editing a tutor's subjects rewrites their search rows."""
+    user = User(email="subjects@example.com", password_hash="x", role=UserRole.TUTOR)
+    db_session.add(user)
+    db_session.commit()
+    headers = {
+        "Authorization": f"Bearer {create_access_token(data=token_claims(user))}"
+    }
+
+    for subjects in (["Math", "Physics"], ["Chemistry", "math"]):
+        response = client.post(
+            "/api/v1/users/tutor/profile",
+            headers=headers,
+            json={"subjects": subjects, "hourly_rate": 40},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert _stored_subjects(db_session, user.id) == {
+            subject.lower() for subject in subjects
+        }
+
+    tutor = db_session.get(Tutor, user.id)
+    tutor.hourly_rate = 45
+    db_session.commit()
+    assert _stored_subjects(db_session, user.id) == {"chemistry", "math"}
+
+
+def test_subject_migration_backfills_existing_tutors():
+    """Test that the migration creates the table from the JSON lists."""
+    spec = importlib.util.spec_from_file_location("subjects_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    tutor_id = uuid.uuid4()
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP TABLE tutor_subjects")
+        connection.execute(
+            insert(User).values(
+                id=tutor_id,
+                email="legacy@example.com",
+                password_hash="x",
+                role=UserRole.TUTOR,
+            )
+        )
+        connection.execute(
+            insert(Tutor).values(
+                user_id=tutor_id,
+                subjects=json.dumps(["Math", " Physics", "math"]),
+                hourly_rate=40.0,
+            )
+        )
+        migration.op = Operations(MigrationContext.configure(connection))
+
+        migration.upgrade()
+        rows = set(connection.execute(select(TutorSubject.subject)).scalars())
+        migration.downgrade()
+        tables = {
+            row[0]
+            for row in connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+
+    assert rows == {"math", "physics"}
+    assert "tutor_subjects" not in tables
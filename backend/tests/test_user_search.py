@@ -0,0 +1,85 @@
+"""
+Admin user search tests for TutorFlow backend.
+
+This module contains tests for trigram word similarity and for substring
+and fuzzy matching of user emails and profile names in the admin user list.
+"""
+
+import pytest
+from fastapi import status
+
+from app.core.auth import create_access_token, token_claims
+from app.models.user import User, UserProfile, UserRole
+from app.utils.trigrams import trigrams, word_similarity
+from tests.test_response_cache import _admin
+
+USERS_URL = "/api/v1/users/"
+
+
+@pytest.fixture
+def people(db_session):
+    """Users to search, by email local part; one has no profile yet."""
+    users = {}
+    for local, role, names in (
+        ("ada", UserRole.TUTOR, ("Ada", "Lovelace")),
+        ("grace", UserRole.STUDENT, ("Grace", "Hopper")),
+        ("alan", UserRole.STUDENT, ("Alan", "Turing")),
+        ("new_user", UserRole.STUDENT, None),
+    ):
+        user = User(email=f"{local}@example.com", password_hash="x", role=role)
+        db_session.add(user)
+        db_session.flush()
+        if names:
+            db_session.add(
+                UserProfile(user_id=user.id, first_name=names[0], last_name=names[1])
+            )
+        users[local] = user
+    db_session.commit()
+    return users
+
+
+def _search(client, db_session, term, **params):
+    admin = _admin(db_session)
+    headers = {
+        "Authorization": f"Bearer {create_access_token(data=token_claims(admin))}"
+    }
+    response = client.get(USERS_URL, params={"search": term, **params}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    return {item["email"].partition("@")[0] for item in response.json()}
+
+
+def test_word_similarity_matches_pg_trgm():
+    """Test trigram splitting and similarity against pg_trgm's examples."""
+    assert trigrams("Ada") == ["  a", " ad", "ada", "da "]
+    assert word_similarity("word", "two words") == pytest.approx(0.8)
+    assert word_similarity("ada", "ada.lovelace@example.com") == 1.0
+    assert word_similarity("xyz", "Ada Lovelace") == 0.0
+    assert word_similarity("", "Ada") == 0.0
+
+
+@pytest.mark.parametrize(
+    "term, expected",
+    [
+        ("lovelace", {"ada"}),
+        ("ace Hop", {"grace"}),
+        ("GRACE@", {"grace"}),
+        ("new_", {"new_user"}),
+        ("Lovelase", {"ada"}),
+        ("Turinng", {"alan"}),
+        ("zzzz", set()),
+        ("%", set()),
+    ],
+)
+def test_substring_and_fuzzy_matches(client, db_session, people, term, expected):
+    """Test substring matches across name parts and misspelt names."""
+    assert _search(client, db_session, term) == expected
+
+
+def test_search_combines_with_role_filter(client, db_session, people):
+    """Test that search narrows the role-filtered list."""
+    assert _search(client, db_session, "example.com", role="student") == {
+        "grace",
+        "alan",
+        "new_user",
+    }
+    assert _search(client, db_session, "a", role="tutor") == {"ada"}